@@ -1,12 +1,26 @@
 import streamlit as st
 import pandas as pd
+import altair as alt
 import os
-import json
-import requests
-import re
 import time
-from deep_translator import GoogleTranslator
-from bs4 import BeautifulSoup
+
+from scraper import config
+from scraper.config import URL_DB, COUNTRIES_META, BRANDS, MAX_CONCURRENCY, HEDGE_DELAY, MAX_PAGES, SCHEDULER_QUOTAS
+from scraper.enrichment import apply_details, detail_targets, enrich
+from scraper.export import FORMATS, file_name, to_bytes
+from scraper.fanout import build_limiters, fan_out
+from scraper.fx import default_fx
+from scraper.health import default_health
+from scraper.incremental import merge_rows, plan, record_scan, reused_rows
+from scraper.kpi import BASES, KPISet
+from scraper.pipeline import METHODS, build_rows, fetch_rates, make_fetcher, translate_query
+from scraper.price_store import default_price_store
+from scraper.response_cache import default_response_cache
+from scraper.scheduler import default_job_queue
+from scraper.results import ResultTable
+from scraper.telemetry import Trace, activate
+from scraper.translation import default_cache
+from scraper.transport import default_transport
 
 # --- SAYFA YAPILANDIRMASI ---
 st.set_page_config(page_title="LCW Global Intelligence", layout="wide", page_icon="🧿")
@@ -35,224 +49,55 @@ if 'search_results' not in st.session_state:
     st.session_state['search_results'] = None
 
 # --- API KEYS ---
-PERPLEXITY_KEY = os.environ.get("PERPLEXITY_API_KEY") or st.secrets.get("PERPLEXITY_API_KEY", "")
-SCRAPER_API_KEY = os.environ.get("SCRAPER_API_KEY") or st.secrets.get("SCRAPER_API_KEY", "")
-
-# --- URL DATABASE ---
-URL_DB = {
-    "Bulgaristan": { 
-        "Pepco": {"base": "https://pepco.bg/", "search": "bg-bg/search?q={query}"}, 
-        "Sinsay": {"base": "https://www.sinsay.com/bg/bg/", "search": "search?q={query}"}, 
-        "Zara Home": {"base": "https://www.zarahome.com/bg/", "search": "search?searchTerm={query}"}, 
-        "H&M Home": {"base": "https://www2.hm.com/bg_bg/", "search": "search?q={query}"}, 
-        "Jysk": {"base": "https://jysk.bg/", "search": "search?query={query}"}, 
-        "English Home": {"base": "https://englishhome.bg/", "search": "arama?q={query}"}
-    },
-    "Bosna Hersek": { 
-        "Pepco": {"base": "https://pepco.ba/", "search": "ba-ba/search?q={query}"}, 
-        "Sinsay": {"base": "https://www.sinsay.com/ba/bs/", "search": "search?q={query}"}, 
-        "Zara Home": {"base": "https://www.zarahome.com/ba/", "search": "search?searchTerm={query}"}, 
-        "Jysk": {"base": "https://jysk.ba/", "search": "search?query={query}"}, 
-        "English Home": {"base": "https://englishhome.ba/", "search": "arama?q={query}"}
-    },
-    "Sırbistan": { 
-        "Pepco": {"base": "https://pepco.rs/", "search": "rs-sr/search?q={query}"}, 
-        "Sinsay": {"base": "https://www.sinsay.com/rs/sr/", "search": "search?q={query}"}, 
-        "Zara Home": {"base": "https://www.zarahome.com/rs/", "search": "search?searchTerm={query}"}, 
-        "Jysk": {"base": "https://jysk.rs/", "search": "search?query={query}"}, 
-        "English Home": {"base": "https://englishhome.rs/", "search": "arama?q={query}"}
-    },
-}
-
-# --- SITE SELECTORS ---
-SITE_SELECTORS = {
-    "Pepco": {
-        "product": ["div.product-tile", "div[class*='product']"],
-        "name": ["h3.product-tile-name", "a.product-tile-link", "h3", "h2"],
-        "price": ["span.product-tile-price-value", "span[class*='price']", ".price"]
-    },
-    "Sinsay": {
-        "product": ["article.product", "div.product-tile", "div[class*='product']"],
-        "name": ["h2.product-name", "h3.product-title", "a.product-link"],
-        "price": ["span.price", "span[class*='price']", ".price"]
-    },
-    "Zara Home": {
-        "product": ["li.product-grid-item", "div.product-grid-product", "article"],
-        "name": ["a.product-link", "h2.product-detail-info__header-name"],
-        "price": ["span.price-current__amount", "span.money-amount__main"]
-    },
-}
-
-COUNTRIES_META = {
-    "Bulgaristan":  {"curr": "BGN", "lang": "bg"},
-    "Bosna Hersek": {"curr": "BAM", "lang": "bs"},
-    "Sırbistan":    {"curr": "RSD", "lang": "sr"},
-}
-
-BRANDS = ["Pepco", "Sinsay", "Zara Home", "H&M Home", "Jysk", "English Home"]
+PERPLEXITY_KEY = os.environ.get("PERPLEXITY_API_KEY") or config.PERPLEXITY_KEY or st.secrets.get("PERPLEXITY_API_KEY", "")
+SCRAPER_API_KEY = os.environ.get("SCRAPER_API_KEY") or config.SCRAPER_API_KEY or st.secrets.get("SCRAPER_API_KEY", "")
 
 # --- FONKSİYONLAR ---
-@st.cache_data(ttl=3600)
+# Kurlar scraper.fx'te tarihli olarak saklanır ve FX_MAX_AGE boyunca yeniden çekilmez
 def get_rates():
-    try:
-        r = requests.get("https://api.exchangerate-api.com/v4/latest/TRY", timeout=10).json()['rates']
-        rates = {k: 1/v for k, v in r.items() if v > 0}
-        if "EUR" in rates: rates["BAM"] = rates["EUR"] / 1.95583
-        return rates
-    except: return None
-
-def translate_logic(text, mode="to_local", target_lang="en"):
-    if not text: return text
-    try:
-        if mode == "to_local":
-            return GoogleTranslator(source='auto', target=target_lang).translate(text)
-        elif mode == "to_english":
-            return GoogleTranslator(source='auto', target='en').translate(text)
-        else:
-            return GoogleTranslator(source='auto', target='tr').translate(text)
-    except: return text
-
-def clean_price(price_raw, currency_code="USD"):
-    if not price_raw: return 0.0
-    s = str(price_raw).lower()
-    for bad in ["from", "start", "to", "price", "fiyat", "only", "now", "was", "de", "от"]:
-        s = s.replace(bad, "")
-    for code in ["rsd", "din", "km", "bam", "лв", "bgn", "eur", "ron", "lei", "tl", "try", "$", "€", "£", "₺"]:
-        s = s.replace(code, "")
-    s = re.sub(r'[^\d.,]', '', s.strip())
-    if not s: return 0.0
-    numbers = re.findall(r'[\d.,]+', s)
-    if not numbers: return 0.0
-    s = numbers[0]
-    try:
-        if ',' in s and '.' in s:
-            s = s.replace('.', '').replace(',', '.') if s.rfind(',') > s.rfind('.') else s.replace(',', '')
-        elif ',' in s:
-            s = s.replace(',', '.') if len(s.split(',')[-1]) == 2 else s.replace(',', '')
-        return float(s)
-    except: return 0.0
-
-def validate_relevance(product_name, query_english):
-    try:
-        prod_en = GoogleTranslator(source='auto', target='en').translate(product_name).lower()
-        keywords = [k for k in query_english.lower().split() if len(k) > 2]
-        main = keywords[-1] if keywords else ""
-        if main in prod_en: return True
-        return any(k in prod_en for k in keywords)
-    except:
-        return True
+    return fetch_rates()
 
-# --- SCRAPERAPI SCRAPER ---
-def scrape_with_scraperapi(brand, site_config, product_local):
-    """ScraperAPI ile JavaScript render + scraping"""
-    
-    if not SCRAPER_API_KEY or brand not in SITE_SELECTORS:
-        return None
-    
-    base_url = site_config["base"]
-    search_path = site_config["search"].format(query=product_local.replace(" ", "+"))
-    full_url = base_url + search_path
-    
-    api_url = "http://api.scraperapi.com"
-    params = {
-        "api_key": SCRAPER_API_KEY,
-        "url": full_url,
-        "render": "true",
-        "country_code": "bg"
-    }
-    
-    try:
-        response = requests.get(api_url, params=params, timeout=90)
-        
-        if response.status_code != 200:
-            st.warning(f"{brand}: HTTP {response.status_code}")
-            return None
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        selectors = SITE_SELECTORS[brand]
-        products = []
-        
-        # Ürün kartlarını bul (birden fazla selector dene)
-        cards = []
-        for product_selector in selectors["product"]:
-            cards = soup.select(product_selector)
-            if cards:
-                break
-        
-        for card in cards[:20]:
-            try:
-                # İsim bul
-                name = None
-                for name_sel in selectors["name"]:
-                    elem = card.select_one(name_sel)
-                    if elem:
-                        name = elem.get_text(strip=True)
-                        break
-                
-                # Fiyat bul
-                price = None
-                for price_sel in selectors["price"]:
-                    elem = card.select_one(price_sel)
-                    if elem:
-                        price = elem.get_text(strip=True)
-                        break
-                
-                # Link bul
-                link_elem = card.select_one("a")
-                link = link_elem.get("href", "") if link_elem else ""
-                
-                if name and price:
-                    if link and not link.startswith("http"):
-                        link = base_url.rstrip("/") + "/" + link.lstrip("/")
-                    
-                    products.append({"name": name, "price": price, "url": link})
-            except:
-                continue
-        
-        if products:
-            return {"products": products}
-        return None
-        
-    except Exception as e:
-        st.warning(f"{brand} scraping hatası: {str(e)[:80]}")
-        return None
-
-# --- PERPLEXITY (Yedek) ---
-def search_sonar(brand, product_local, product_english, site_config):
-    if not PERPLEXITY_KEY:
-        return None
-    
-    url = "https://api.perplexity.ai/chat/completions"
-    full_url = site_config["base"]
-    
-    payload = {
-        "model": "sonar",
-        "messages": [
-            {"role": "system", "content": "You are a product data scraper. Extract real products with prices."},
-            {"role": "user", "content": f"""
-Search for '{product_english}' (local: '{product_local}') on {full_url}
+KPI_CARD = """
+    <div style='background-color: #161b22; border: 1px solid #30363d; border-radius: 12px; padding: 15px; text-align: center;'>
+        <p style='color: #8b949e; font-size: 14px; margin: 0;'>{label}</p>
+        <p style='color: #ffffff; font-size: 28px; font-weight: bold; margin: 5px 0;'>{tl:,.0f}₺{unit}</p>
+        <p style='color: #8b949e; font-size: 12px; margin: 0;'>${usd:,.2f} | {loc:,.2f} {curr}{unit}</p>
+    </div>
+    """
 
-List 10-15 products with EXACT prices.
+def kpi_cards(kpis, rates, curr, basis="TL"):
+    """Ürün sayısı + ortalama/en düşük/en yüksek kartları (TL, USD, yerel); `basis` birim fiyat sütunu olabilir."""
+    kpi = kpis[basis]
+    cols = st.columns(4)
+    cols[0].metric("Toplam Ürün" if basis == "TL" else f"{basis} Bilinen Ürün", f"{kpi.count} adet")
+    if not kpi.count:
+        cols[1].caption(f"Bu sonuçlarda {basis} hesaplanabilen ürün yok")
+        return
+    usd = kpi.in_currency(rates.get("USD", 1))
+    loc = kpi.in_currency(rates.get(curr, 1))
+    for i, (label, tl) in enumerate([("Ortalama", kpi.avg), ("En Düşük", kpi.min), ("En Yüksek", kpi.max)]):
+        cols[i + 1].markdown(KPI_CARD.format(label=label, tl=tl, usd=usd[i], loc=loc[i], curr=curr, unit=BASES[basis]), unsafe_allow_html=True)
 
-OUTPUT JSON:
-{{"products": [{{"name": "Product 1", "price": "15.99", "url": "link"}}]}}
-"""}
-        ],
-        "temperature": 0.1,
-        "max_tokens": 3000
-    }
-    
-    try:
-        res = requests.post(url, json=payload, headers={"Authorization": f"Bearer {PERPLEXITY_KEY}", "Content-Type": "application/json"}, timeout=60)
-        if res.status_code == 200:
-            raw = res.json()['choices'][0]['message']['content']
-            clean = raw.replace("``````", "").strip()
-            start = clean.find("{")
-            end = clean.rfind("}")
-            if start != -1 and end != -1:
-                return json.loads(clean[start:end+1])
-    except: pass
-    return None
+def result_table(df, curr, height=500):
+    st.dataframe(
+        df,
+        column_config={
+            "Link": st.column_config.LinkColumn("🔗 Link", display_text="Git"),
+            f"Fiyat ({curr})": st.column_config.NumberColumn(f"Fiyat ({curr})", format="%.2f"),
+            "USD": st.column_config.NumberColumn("USD ($)", format="$%.2f"),
+            "TL": st.column_config.NumberColumn("TL (₺)", format="%.2f ₺"),
+            f"Eski Fiyat ({curr})": st.column_config.NumberColumn(f"Eski Fiyat ({curr})", format="%.2f"),
+            "İndirim %": st.column_config.NumberColumn("İndirim %", format="%.0f%%"),
+            "m²": st.column_config.NumberColumn("m²", format="%.2f"),
+            "TL/Adet": st.column_config.NumberColumn("₺/Adet", format="%.2f ₺"),
+            "TL/m²": st.column_config.NumberColumn("₺/m²", format="%.2f ₺"),
+            "TL/L": st.column_config.NumberColumn("₺/L", format="%.2f ₺"),
+            "Birleşen": st.column_config.NumberColumn("Birleşen", help="Bu satırda birleşen kopya sayısı")
+        },
+        use_container_width=True,
+        hide_index=True,
+        height=height
+    )
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -265,13 +110,30 @@ with st.sidebar:
         st.error("⚠️ En az bir API key gerekli!")
         st.stop()
     
-    scrape_method = st.radio("🔧 Scraping Yöntemi", ["Hybrid", "ScraperAPI", "Perplexity"])
+    if config.REPLAY_URL:
+        st.caption(f"🎭 Replay modu: {config.REPLAY_URL}")
+    if config.RECORD_FIXTURES:
+        st.caption(f"⏺️ Yanıtlar kaydediliyor: {config.RECORD_FIXTURES}")
+    
+    scrape_method = st.radio("🔧 Scraping Yöntemi", METHODS)
+    hedge_delay = HEDGE_DELAY
+    if scrape_method == "Hybrid":
+        hedge_delay = st.slider("⏱️ Perplexity Devreye Girme (sn)", 0.0, 60.0, HEDGE_DELAY, 1.0, help="ScraperAPI bu süre içinde yeterli sonuç vermezse Perplexity de yarışa girer; ilk yeterli sonuç kazanır. 0: ikisi aynı anda")
+    max_pages = None
+    if scrape_method != "Perplexity":
+        max_pages = st.slider("📄 Sayfa Derinliği", 1, 10, MAX_PAGES, help="Marka başına en fazla taranacak arama sayfası; yeni ürün getirmeyen sayfada durulur")
     
     st.markdown("---")
     sel_country = st.selectbox("🌍 Ülke", list(URL_DB.keys()))
     available_brands = [b for b in BRANDS if URL_DB.get(sel_country, {}).get(b)]
     sel_brands = st.multiselect("🏪 Markalar", available_brands, default=available_brands[:2] if len(available_brands) >= 2 else available_brands)
     q_tr = st.text_input("🛍️ Ürün (Türkçe)", "Yüz Havlusu")
+    use_cache = st.checkbox("♻️ Önbellekten Getir", value=True, help="Aynı istek TTL içinde tekrar ücretli çağrı yapmaz")
+    enrich_details = st.checkbox("🔎 Detay Zenginleştirme", value=False, disabled=not SCRAPER_API_KEY, help="Ürün sayfalarından ölçü, malzeme, paket adedi ve eski fiyatı ekler (ürün başına ek ScraperAPI çağrısı, önbellekte olanlar hariç)")
+    incremental = st.checkbox("⏩ Artımlı Tarama", value=False, help="Yalnızca eskimiş ya da sık değişen markaları yeniden çeker, diğerlerini geçmişten doldurur")
+    stream = st.checkbox("📡 Canlı Sonuçlar", value=True, help="Her marka bitince ürünleri tabloya ekler ve KPI'ları günceller")
+    relevance_threshold = st.slider("🎯 Alaka Eşiği", 0.0, 1.0, 0.0, 0.05, help="0: herhangi bir anahtar kelime eşleşmesi yeterli")
+    kpi_basis = st.selectbox("📐 KPI Birimi", list(BASES), help="KPI kartları ürün fiyatı yerine adet, m² ya da litre başına fiyat üzerinden hesaplanabilir (ad/detaydan ölçü ve paket adedi okunur)")
     
     st.markdown("---")
     btn = st.button("🚀 FİYATLARI ÇEK", use_container_width=True)
@@ -286,71 +148,127 @@ if rates:
         c1, c2 = st.columns(2)
         c1.metric("USD", f"{rates.get('USD',0):.2f}₺")
         c2.metric(curr, f"{rates.get(curr,0):.2f}₺")
+        if rates.stale:
+            st.warning(f"⚠️ Kur kaynağına ulaşılamadı; {rates.day} tarihli son kurlar kullanılıyor")
+        else:
+            st.caption(f"Kur tarihi: {rates.day}")
+
+with st.sidebar:
+    tstats = default_cache().stats()
+    if tstats["hits"] or tstats["disk_hits"] or tstats["misses"]:
+        st.caption(f"🈯 Çeviri önbelleği: {tstats['hits'] + tstats['disk_hits']} hit / {tstats['misses']} miss · ~{tstats['saved_seconds']:.1f} sn kazanç")
+    rcache = default_response_cache()
+    if rcache:
+        avoided = rcache.stats()["avoided_calls"]
+        if avoided:
+            st.caption("💸 Önlenen ücretli çağrı: " + " · ".join(f"{k}: {v}" for k, v in avoided.items()))
+    for host, h in default_transport().stats().items():
+        st.caption(f"🌐 {host}: {h['requests']} istek · p50 {h['p50_ms']:.0f} ms · p95 {h['p95_ms']:.0f} ms · {h['retries']} tekrar · {h['bytes'] / 1024:.0f} KB")
+    health = default_health()
+    health_rows = health.snapshot(sel_country) if health else []
+    if health_rows:
+        with st.expander("🩺 Sağlayıcı Sağlığı"):
+            hdf = pd.DataFrame(health_rows).drop(columns="country")
+            hdf["open_s"] = (hdf["open_s"] / 60).round()
+            st.dataframe(hdf.rename(columns={"brand": "Marka", "provider": "Sağlayıcı", "calls": "Çağrı", "success_rate": "Başarı", "p50_s": "p50 (sn)", "avg_products": "Ürün", "score": "Skor", "open_s": "Devre Açık (dk)"}), hide_index=True)
+    # Zamanlanmış taramalar ayrı süreçte çalışır (python -m scraper.scheduler run); burada yalnızca durum okunur
+    jobs_queue = default_job_queue(create=False)
+    schedules = jobs_queue.schedules() if jobs_queue else []
+    if schedules:
+        with st.expander("🗓️ Zamanlanmış Taramalar"):
+            to_dt = lambda ts: pd.to_datetime(ts, unit="s", utc=True)
+            sdf = pd.DataFrame([{"Ad": s["name"], "Ülke": ", ".join(s["spec"]["countries"]), "Sorgu": ", ".join(s["spec"]["queries"]), "Periyot (sa)": s["cadence"] / 3600, "Açık": bool(s["enabled"]), "Son Çalışma": to_dt(s["last_run"]), "Son Durum": s["last_status"], "Sonraki": to_dt(s["next_run"])} for s in schedules])
+            st.dataframe(sdf, hide_index=True)
+            jdf = pd.DataFrame(jobs_queue.jobs(limit=20))
+            if len(jdf):
+                jdf["started"] = to_dt(jdf["started"])
+                st.dataframe(jdf[["id", "schedule", "status", "started", "method", "rows", "error"]].rename(columns={"schedule": "Tanım", "status": "Durum", "started": "Başlangıç", "method": "Yöntem", "rows": "Satır", "error": "Not"}), hide_index=True)
+            usage = jobs_queue.usage()
+            if usage:
+                st.caption("📊 Bugünkü kota kullanımı: " + " · ".join(f"{p}: {usage.get(p, 0)}/{q}" for p, q in SCHEDULER_QUOTAS.items()))
 
 # --- ANA İŞLEM ---
 if btn:
     if not rates: st.error("❌ Kur verisi alınamadı"); st.stop()
     if not sel_brands: st.error("❌ En az 1 marka seçin"); st.stop()
     
-    q_local = translate_logic(q_tr, "to_local", conf["lang"])
-    q_english = translate_logic(q_tr, "to_english")
+    q_local, q_english = translate_query(q_tr, conf["lang"])
     
     st.info(f"🔎 Aranıyor: **{q_local}** (Yerel) | **{q_english}** (Global)")
     
-    all_results = []
-    usd_rate = rates.get("USD", 1)
-    loc_rate = rates.get(curr, 1)
+    store = default_price_store()
+    to_fetch, reuse = plan(store, sel_country, q_tr, sel_brands) if incremental and store else (sel_brands, {})
+    if reuse:
+        st.caption(f"⏩ Güncel, geçmişten alınan: {', '.join(reuse)}")
     
-    progress = st.progress(0, text="Başlatılıyor...")
+    progress = st.progress(0, text=f"🔍 {len(to_fetch)} marka paralel taranıyor...")
     
-    for idx, brand in enumerate(sel_brands):
-        site_config = URL_DB.get(sel_country, {}).get(brand)
-        if not site_config: 
-            continue
-        
-        progress.progress((idx + 1) / len(sel_brands), text=f"🔍 {brand} taranıyor...")
-        
-        data = None
-        method = ""
-        
-        if scrape_method == "ScraperAPI":
-            data = scrape_with_scraperapi(brand, site_config, q_local)
-            method = "scraperapi"
-        elif scrape_method == "Perplexity":
-            data = search_sonar(brand, q_local, q_english, site_config)
-            method = "perplexity"
-        else:  # Hybrid
-            data = scrape_with_scraperapi(brand, site_config, q_local) if SCRAPER_API_KEY else None
-            if not data or len(data.get("products", [])) < 3:
-                data = search_sonar(brand, q_local, q_english, site_config)
-                method = "perplexity"
-            else:
-                method = "scraperapi"
-        
-        if data and data.get("products"):
-            for p in data["products"]:
-                name = p.get("name", "")
-                if validate_relevance(name, q_english):
-                    p_raw = clean_price(p.get("price", 0), curr)
-                    if p_raw > 0:
-                        p_tl = p_raw * loc_rate
-                        all_results.append({
-                            "Marka": brand,
-                            "Ürün Yerel": name,
-                            "Ürün Türkçe": translate_logic(name, "to_turkish"),
-                            f"Fiyat ({curr})": p_raw,
-                            "USD": p_tl / usd_rate,
-                            "TL": p_tl,
-                            "Link": p.get("url", ""),
-                            "Kaynak": method.upper()
-                        })
-        
-        time.sleep(2)
+    warnings = []
+    # Canlı modda Perplexity ürünleri yanıt akarken buraya düşer (işçi iş parçacıklarından)
+    streaming = {}
+    on_products = (lambda brand, provider, items: streaming.setdefault(brand, []).extend(items)) if stream else None
+    fetch_brand = make_fetcher(sel_country, scrape_method, q_local, q_english, SCRAPER_API_KEY, PERPLEXITY_KEY,
+                               use_cache=use_cache, warn=warnings.append, hedge_delay=hedge_delay, max_pages=max_pages,
+                               on_products=on_products)
+    
+    reused = reused_rows(store, sel_country, q_tr, reuse, curr, rates) if reuse else []
+    fresh = []
+    kpis = KPISet().add_rows(reused)
+    live = st.empty() if stream else None
+    
+    done = []
+    def render_live(preview=()):
+        if not (kpis["TL"].count or preview):
+            return
+        with live.container():
+            if kpis["TL"].count:
+                kpi_cards(kpis, rates, curr, kpi_basis)
+            if preview:
+                st.caption(f"⏳ {len(preview)} ürün yanıt akarken alındı (önizleme, çevirisiz)")
+            result_table(pd.DataFrame(reused + fresh + list(preview)), curr, height=350)
+
+    def on_brand_done(brand, result, error):
+        done.append(brand)
+        progress.progress(len(done) / len(to_fetch), text=f"✔️ {brand} tamamlandı ({len(done)}/{len(to_fetch)})")
+        if live is None:
+            return
+        # Yalnızca bu markanın satırları işlenir; KPI'lar artımlı güncellenir
+        rows = build_rows([(brand, result, error)], q_english, conf["lang"], curr, rates, relevance_threshold or None, warnings.append)
+        fresh.extend(rows)
+        kpis.add_rows(rows)
+        render_live()
+
+    def on_tick():
+        # Bitmemiş markaların akan ürünleri geçici satır olarak gösterilir
+        flowing = [(b, ({"products": list(items)}, "perplexity"), None) for b, items in list(streaming.items()) if b not in done]
+        if flowing:
+            render_live(build_rows(flowing, q_english, conf["lang"], curr, rates, relevance_threshold or None, preview=True))
+    
+    # Span'ler bu iz üzerinden fan_out iş parçacıklarına da taşınır
+    with activate(Trace()) as trace:
+        scanned = fan_out(to_fetch, fetch_brand, max_workers=MAX_CONCURRENCY, on_done=on_brand_done,
+                          on_tick=on_tick if live is not None else None)
+        if live is None:
+            fresh = build_rows(scanned, q_english, conf["lang"], curr, rates, relevance_threshold or None, warnings.append)
+            kpis.add_rows(fresh)
+    
+    if store:
+        now = time.time()
+        store.record(fresh, sel_country, q_tr, curr, ts=now)
+        record_scan(store, sel_country, q_tr, scanned, now)
+    all_results = merge_rows(fresh, reused, sel_brands)
+    
+    for w in warnings:
+        st.warning(w)
     
     progress.empty()
+    if live is not None:
+        live.empty()
     
     if all_results:
-        st.session_state['search_results'] = {"df": pd.DataFrame(all_results), "curr": curr}
+        st.session_state['search_results'] = {"df": pd.DataFrame(all_results), "curr": curr, "country": sel_country, "query": q_tr, "kpis": kpis,
+                                            "enrich": enrich_details, "use_cache": use_cache,
+                                            "timing": trace.records(), "wall": trace.wall(), "ts": time.time()}
         st.success(f"✅ Toplam {len(all_results)} ürün bulundu!")
     else:
         st.error("⚠️ Hiçbir markada ürün bulunamadı")
@@ -362,40 +280,9 @@ if st.session_state['search_results']:
     df = res["df"]
     curr = res["curr"]
     
-    usd_rate = rates.get("USD", 1)
-    loc_rate = rates.get(curr, 1)
-    
-    cnt = len(df)
-    avg_tl = df["TL"].mean()
-    min_tl = df["TL"].min()
-    max_tl = df["TL"].max()
-    
-    k1, k2, k3, k4 = st.columns(4)
-    k1.metric("Toplam Ürün", f"{cnt} adet")
-    
-    k2.markdown(f"""
-    <div style='background-color: #161b22; border: 1px solid #30363d; border-radius: 12px; padding: 15px; text-align: center;'>
-        <p style='color: #8b949e; font-size: 14px; margin: 0;'>Ortalama</p>
-        <p style='color: #ffffff; font-size: 28px; font-weight: bold; margin: 5px 0;'>{avg_tl:,.0f}₺</p>
-        <p style='color: #8b949e; font-size: 12px; margin: 0;'>${avg_tl/usd_rate:,.2f} | {avg_tl/loc_rate:,.2f} {curr}</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    k3.markdown(f"""
-    <div style='background-color: #161b22; border: 1px solid #30363d; border-radius: 12px; padding: 15px; text-align: center;'>
-        <p style='color: #8b949e; font-size: 14px; margin: 0;'>En Düşük</p>
-        <p style='color: #ffffff; font-size: 28px; font-weight: bold; margin: 5px 0;'>{min_tl:,.0f}₺</p>
-        <p style='color: #8b949e; font-size: 12px; margin: 0;'>${min_tl/usd_rate:,.2f} | {min_tl/loc_rate:,.2f} {curr}</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    k4.markdown(f"""
-    <div style='background-color: #161b22; border: 1px solid #30363d; border-radius: 12px; padding: 15px; text-align: center;'>
-        <p style='color: #8b949e; font-size: 14px; margin: 0;'>En Yüksek</p>
-        <p style='color: #ffffff; font-size: 28px; font-weight: bold; margin: 5px 0;'>{max_tl:,.0f}₺</p>
-        <p style='color: #8b949e; font-size: 12px; margin: 0;'>${max_tl/usd_rate:,.2f} | {max_tl/loc_rate:,.2f} {curr}</p>
-    </div>
-    """, unsafe_allow_html=True)
+    kpi_slot = st.empty()
+    with kpi_slot.container():
+        kpi_cards(res["kpis"], rates, curr, kpi_basis)
     
     st.markdown("---")
     
@@ -408,18 +295,64 @@ if st.session_state['search_results']:
             cols[i].metric(src, f"{cnt} ürün")
         st.markdown("---")
     
-    st.dataframe(
-        df,
-        column_config={
-            "Link": st.column_config.LinkColumn("🔗 Link", display_text="Git"),
-            f"Fiyat ({curr})": st.column_config.NumberColumn(f"Fiyat ({curr})", format="%.2f"),
-            "USD": st.column_config.NumberColumn("USD ($)", format="$%.2f"),
-            "TL": st.column_config.NumberColumn("TL (₺)", format="%.2f ₺")
-        },
-        use_container_width=True,
-        hide_index=True,
-        height=500
-    )
+    table = st.empty()
+    with table.container():
+        result_table(df, curr)
+    
+    # Detay zenginleştirme temel tablo gösterildikten sonra, sonuç başına bir kez çalışır
+    if res.get("enrich") and not res.get("enriched"):
+        rows = df.to_dict("records")
+        targets = detail_targets(rows)
+        bar = st.progress(0, text=f"🔎 {len(targets)} ürün sayfası zenginleştiriliyor...")
+        found, seen = {}, []
+        def on_detail(item, detail, error):
+            seen.append(item)
+            if detail is not None:
+                found[item[1]] = detail
+            bar.progress(len(seen) / len(targets), text=f"🔎 Detaylar: {len(seen)}/{len(targets)}")
+            if len(seen) % 5 == 0 or len(seen) == len(targets):
+                with table.container():
+                    result_table(pd.DataFrame(apply_details(rows, found, curr)), curr)
+        enrich(targets, curr, SCRAPER_API_KEY, res["use_cache"], limiter=build_limiters().get("scraperapi"), on_done=on_detail)
+        bar.empty()
+        rows = apply_details(rows, found, curr)
+        df = pd.DataFrame(rows)
+        # Detaydaki paket/ölçü birim fiyatları değiştirebilir; KPI'lar bir kez yeniden kurulur
+        res.update(df=df, kpis=KPISet().add_rows(rows), enriched=True)
+        with kpi_slot.container():
+            kpi_cards(res["kpis"], rates, curr, kpi_basis)
+    
+    # İçerik yalnızca tıklanınca, ayrı iş parçacığında üretilir
+    ec1, ec2 = st.columns([1, 3])
+    fmt = ec1.selectbox("Biçim", list(FORMATS), label_visibility="collapsed")
+    ec2.download_button(f"💾 {fmt.upper()} İndir", lambda: to_bytes(ResultTable.from_rows(df.to_dict("records"), res["country"], res["query"], curr, res.get("ts", time.time())), fmt),
+                        file_name(res["country"], res["query"], res.get("ts", time.time()), fmt), FORMATS[fmt][1], use_container_width=True)
+    
+    # Fiyat geçmişi
+    store = default_price_store()
+    if store and res.get("query"):
+        trend = store.trend(res["country"], query=res["query"], days=90)
+        if trend["day"].nunique() > 1:
+            st.markdown("### 📈 Fiyat Geçmişi (90 gün, ortalama)")
+            trend_curr = st.radio("Para birimi", ["TRY", "USD", curr], horizontal=True, help="Her gün kendi tarihindeki kurla çevrilir")
+            if trend_curr == "TRY":
+                chart = trend.pivot(index="day", columns="brand", values="avg_tl")
+            else:
+                hist = store.history(res["country"], query=res["query"], days=90)
+                hist["value"] = default_fx().convert_asof(hist["price_local"], hist["currency"], hist["day"], trend_curr)
+                chart = hist.groupby(["day", "brand"])["value"].mean().unstack()
+            st.line_chart(chart)
     
-    csv = df.to_csv(index=False).encode('utf-8-sig')
-    st.download_button("💾 CSV İndir", csv, f"lcw_{sel_country}.csv", "text/csv", use_container_width=True)
+    # Zamanlama (son taramanın span'leri)
+    if res.get("timing"):
+        with st.expander(f"⏱️ Zamanlama — {res['wall']:.1f} sn"):
+            tdf = pd.DataFrame(res["timing"])
+            summary = tdf.groupby("stage")["seconds"].agg(["count", "sum", "max"]).sort_values("sum", ascending=False)
+            st.dataframe(summary.rename(columns={"count": "Adet", "sum": "Toplam (sn)", "max": "En Uzun (sn)"}).rename_axis("Aşama"), use_container_width=True)
+            waterfall = alt.Chart(tdf).mark_bar().encode(
+                x=alt.X("start:Q", title="sn"), x2="end:Q",
+                y=alt.Y("brand:N", title=None, sort=None),
+                color=alt.Color("stage:N", title="Aşama"),
+                tooltip=["stage", "brand", alt.Tooltip("seconds:Q", format=".3f")]
+            )
+            st.altair_chart(waterfall, use_container_width=True)
@@ -3,10 +3,11 @@ import pandas as pd
 import os
 import json
 import requests
-import re
 import time
 from deep_translator import GoogleTranslator
 
+from scraper.pricing import clean_price
+
 # --- SAYFA YAPILANDIRMASI ---
 st.set_page_config(page_title="LCW Global Intelligence", layout="wide", page_icon="🧿")
 
@@ -73,26 +74,6 @@ def translate_logic(text, mode="to_local", target_lang="en"):
             return GoogleTranslator(source='auto', target='tr').translate(text)
     except: return text
 
-def clean_price(price_raw, currency_code="USD"):
-    if not price_raw: return 0.0
-    s = str(price_raw).lower()
-    for bad in ["from", "start", "to", "price", "fiyat", "only"]:
-        s = s.replace(bad, "")
-    for code in ["rsd", "din", "km", "bam", "лв", "bgn", "eur", "ron", "lei", "tl", "try", "huf", "ft", "$", "€", "£"]:
-        s = s.replace(code, "")
-    s = s.strip()
-    s = re.sub(r'[^\d.,]', '', s)
-    if not s: return 0.0
-    try:
-        if ',' in s and '.' in s:
-            if s.rfind(',') > s.rfind('.'): s = s.replace('.', '').replace(',', '.')
-            else: s = s.replace(',', '')
-        elif ',' in s:
-            if len(s.split(',')[-1]) == 2: s = s.replace(',', '.')
-            else: s = s.replace(',', '.')
-        return float(s)
-    except: return 0.0
-
 def validate_relevance(product_name_local, query_english):
     try:
         prod_en = GoogleTranslator(source='auto', target='en').translate(product_name_local).lower()
@@ -0,0 +1 @@
+"""Yerel sahte sunucuya karşı çalışan performans ölçümleri."""
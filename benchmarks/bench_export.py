@@ -0,0 +1,87 @@
+"""Dışa aktarım biçimlerinin dosya boyutu, yazma ve yükleme süresi.
+
+Eski yol (`pd.DataFrame(rows).to_csv(...).encode("utf-8-sig")`) ile
+`scraper.export`'un parça parça CSV, Parquet ve Arrow çıktıları karşılaştırılır.
+
+Çalıştırma (repo kökünden):
+    python -m benchmarks.bench_export --rows 200000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.bench_results import make_rows
+from scraper import export
+from scraper.config import COUNTRIES_META, URL_DB
+from scraper.results import ResultTable
+
+
+def timed(fn):
+    """(süre sn, Python yığınındaki tepe bellek MB); bellek ayrı bir çalıştırmada ölçülür."""
+    t0 = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def load_time(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--cells", type=int, default=60)
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    countries = list(COUNTRIES_META)
+    per_cell = max(1, args.rows // args.cells)
+    cells = []
+    for i in range(args.cells):
+        country = countries[i % len(countries)]
+        curr = COUNTRIES_META[country]["curr"]
+        brands = list(URL_DB[country])
+        rows = [r for b in brands for r in make_rows(b, curr, per_cell // len(brands), rng)]
+        cells.append((country, f"query {i // len(countries)}", curr, rows))
+    table = ResultTable.concat(ResultTable.from_rows(rows, c, q, curr, time.time()) for c, q, curr, rows in cells)
+    # Eski yol tek para birimli tabloyu belleğe tek metin olarak çevirir
+    legacy_rows = [r for *_, rows in cells for r in rows]
+    print(f"rows={len(table):,}")
+    print(f"{'biçim':14s} {'boyut MB':>9s} {'yazma sn':>9s} {'tepe MB':>8s} {'yükleme sn':>11s}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "legacy.csv")
+
+        def legacy():
+            payload = pd.DataFrame(legacy_rows).to_csv(index=False).encode("utf-8-sig")
+            with open(path, "wb") as f:
+                f.write(payload)
+
+        seconds, peak = timed(legacy)
+        load = load_time(lambda: pd.read_csv(path, encoding="utf-8-sig"))
+        print(f"{'csv (eski)':14s} {os.path.getsize(path) / 1e6:9.1f} {seconds:9.2f} {peak:8.0f} {load:11.2f}")
+
+        for fmt in export.FORMATS:
+            out = {}
+            seconds, peak = timed(lambda: out.update(path=export.export(table, fmt, tmp, "bench", fmt)))
+            load = load_time(lambda: export.load(out["path"]))
+            print(f"{fmt:14s} {os.path.getsize(out['path']) / 1e6:9.1f} {seconds:9.2f} {peak:8.0f} {load:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""BeautifulSoup (html.parser) ile lxml çıkarıcının parse süresi ve bellek karşılaştırması.
+
+`--fixtures` dizininde `<Marka>.html` dosyaları varsa onlar kullanılır (ör. kayıt
+modunda toplanan gerçek sayfalar); yoksa render edilmiş sayfaya benzer şişkin
+sentetik sayfalar üretilir. Bellek, her ölçüm ayrı bir alt süreçte ru_maxrss
+artışı olarak okunur (lxml'in C tarafındaki ayırmaları da dahil).
+
+    python -m benchmarks.bench_extraction --repeat 20
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import time
+
+from bs4 import BeautifulSoup
+
+from scraper.config import SITE_SELECTORS
+from scraper.extraction import BrandExtractor
+
+from .fake_server import render_listing
+
+
+def legacy_extract(brand, html, base_url):
+    """providers.scrape_with_scraperapi'deki eski BeautifulSoup yolu."""
+    soup = BeautifulSoup(html, 'html.parser')
+    selectors = SITE_SELECTORS[brand]
+    products = []
+    cards = []
+    for product_selector in selectors["product"]:
+        cards = soup.select(product_selector)
+        if cards:
+            break
+    for card in cards[:20]:
+        name = None
+        for name_sel in selectors["name"]:
+            elem = card.select_one(name_sel)
+            if elem:
+                name = elem.get_text(strip=True)
+                break
+        price = None
+        for price_sel in selectors["price"]:
+            elem = card.select_one(price_sel)
+            if elem:
+                price = elem.get_text(strip=True)
+                break
+        link_elem = card.select_one("a")
+        link = link_elem.get("href", "") if link_elem else ""
+        if name and price:
+            if link and not link.startswith("http"):
+                link = base_url.rstrip("/") + "/" + link.lstrip("/")
+            products.append({"name": name, "price": price, "url": link})
+    return products
+
+
+def synthetic_page(brand, cards=60):
+    """Render çıktısına benzer: büyük inline script, menüler ve ürün ızgarası."""
+    noise = "".join(f'<li class="menu-item"><a href="/c/{i}">Category {i}</a></li>' for i in range(400))
+    script = "<script>window.__STATE__=" + ("{\"k\":1}," * 20000) + "</script>"
+    grid = render_listing(brand, cards)
+    return f"<html><head>{script}</head><body><nav><ul>{noise}</ul></nav>{grid}</body></html>"
+
+
+def _run(method, brand, html, repeat, queue):
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if method == "lxml":
+        extractor = BrandExtractor(brand, SITE_SELECTORS[brand])
+        fn = lambda: extractor.extract(html, "https://example.com/")
+    else:
+        fn = lambda: legacy_extract(brand, html, "https://example.com/")
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        products = fn()
+    elapsed = (time.perf_counter() - t0) / repeat
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base
+    queue.put((elapsed, peak, len(products)))
+
+
+def measure(method, brand, html, repeat):
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(method, brand, html, repeat, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fixtures", default=os.path.join("benchmarks", "fixtures"))
+    ap.add_argument("--repeat", type=int, default=10)
+    args = ap.parse_args()
+
+    print(f"{'brand':<10} {'size':>8} | {'bs4 ms':>8} {'bs4 MB':>7} | {'lxml ms':>8} {'lxml MB':>7} | speedup")
+    for brand in SITE_SELECTORS:
+        path = os.path.join(args.fixtures, f"{brand}.html")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                html = f.read()
+        else:
+            html = synthetic_page(brand)
+        old_t, old_m, old_n = measure("bs4", brand, html, args.repeat)
+        new_t, new_m, new_n = measure("lxml", brand, html, args.repeat)
+        assert old_n == new_n, (brand, old_n, new_n)
+        print(f"{brand:<10} {len(html) / 1024:>6.0f}KB | {old_t * 1000:>8.1f} {old_m / 1024:>7.1f} |"
+              f" {new_t * 1000:>8.1f} {new_m / 1024:>7.1f} | {old_t / new_t:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
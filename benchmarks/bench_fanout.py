@@ -0,0 +1,66 @@
+"""Seri tarama döngüsü ile fan-out motorunun karşılaştırması.
+
+Çalıştırma (repo kökünden):
+    python -m benchmarks.bench_fanout --delay 1.0 --workers 6
+"""
+import argparse
+import time
+
+from scraper import config
+from scraper.fanout import build_limiters, fan_out, throttled
+from scraper.providers import scrape_with_scraperapi, search_sonar
+
+from . import fake_server
+
+
+def make_task(country, query, limiters=None):
+    limiters = limiters or {}
+    scraper_call = throttled(limiters.get("scraperapi"), scrape_with_scraperapi)
+    sonar_call = throttled(limiters.get("perplexity"), search_sonar)
+
+    def task(brand):
+        site = config.URL_DB[country][brand]
+        data = scraper_call(brand, site, query, "bench", use_cache=False)
+        if not data or len(data.get("products", [])) < 3:
+            data = sonar_call(brand, query, query, site, "bench", use_cache=False)
+        return data
+    return task
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--country", default="Bulgaristan")
+    ap.add_argument("--delay", type=float, default=1.0, help="sahte sunucu yanıt gecikmesi (sn)")
+    ap.add_argument("--workers", type=int, default=config.MAX_CONCURRENCY)
+    ap.add_argument("--sleep", type=float, default=2.0, help="eski döngüdeki marka arası bekleme (sn)")
+    args = ap.parse_args()
+
+    server, base = fake_server.start(delay=args.delay)
+    config.SCRAPER_API_URL = base + "/"
+    config.PERPLEXITY_URL = base + "/chat/completions"
+    brands = list(config.URL_DB[args.country])
+
+    # Eski davranış: marka marka, aralarda sabit uyku
+    task = make_task(args.country, "towel")
+    t0 = time.perf_counter()
+    serial = []
+    for brand in brands:
+        serial.append(task(brand))
+        time.sleep(args.sleep)
+    t_serial = time.perf_counter() - t0
+
+    task = make_task(args.country, "towel", build_limiters())
+    t0 = time.perf_counter()
+    parallel = [r for _, r, _ in fan_out(brands, task, max_workers=args.workers)]
+    t_parallel = time.perf_counter() - t0
+    server.shutdown()
+
+    assert [len(r["products"]) for r in serial] == [len(r["products"]) for r in parallel]
+    print(f"brands={len(brands)} delay={args.delay}s workers={args.workers}")
+    print(f"serial   : {t_serial:7.2f} s")
+    print(f"fan-out  : {t_parallel:7.2f} s")
+    print(f"speedup  : {t_serial / t_parallel:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Hybrid modunda seri (ScraperAPI → Perplexity) ile hedged stratejinin marka başı gecikme dağılımı.
+
+Sahte sunucuda ScraperAPI gecikmesi ağır kuyruklu (lognormal), Perplexity daha
+dar dağılımlıdır; bazı markalar 3'ten az ürün döner ve yedeğe düşer. Hız
+limitleyici kapalıdır, yalnızca strateji farkı ölçülür.
+
+Çalıştırma (repo kökünden):
+    python -m benchmarks.bench_hedge --rounds 10 --delays 0,1.5
+"""
+import argparse
+import random
+import threading
+import time
+
+import numpy as np
+
+from scraper import config
+from scraper.fanout import fan_out
+from scraper.pipeline import make_fetcher
+from scraper.transport import default_transport
+
+from . import fake_server
+
+# Az ürün döndüren (yedeğe düşen) markalar
+THIN = {"Zara Home", "H&M Home"}
+
+
+class Latency:
+    """İş parçacığı güvenli, tohumlu gecikme üreteci."""
+
+    def __init__(self, seed, median, sigma, scale):
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.median, self.sigma, self.scale = median, sigma, scale
+
+    def __call__(self, brand):
+        with self.lock:
+            return self.median * self.scale * self.rng.lognormvariate(0, self.sigma)
+
+
+def run(strategy, delay, brands, rounds, country):
+    fetch = make_fetcher(country, "Hybrid", "towel", "towel", "bench", "bench", use_cache=False, limiters={},
+                         hedge_delay=delay, health=False)
+    latencies = {b: [] for b in brands}
+    wins = {}
+
+    def task(brand):
+        t0 = time.perf_counter()
+        data, method = fetch(brand)
+        return time.perf_counter() - t0, method
+
+    transport = default_transport()
+    transport.metrics.clear()
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for brand, result, error in fan_out(brands, task, max_workers=len(brands)):
+            elapsed, method = result
+            latencies[brand].append(elapsed)
+            wins[method] = wins.get(method, 0) + 1
+    wall = time.perf_counter() - t0
+    calls = {"GET": 0, "POST": 0}
+    for m in list(transport.metrics):
+        calls[m["method"]] += 1
+    return strategy, latencies, wins, calls, wall
+
+
+def report(strategy, latencies, wins, calls, wall):
+    allv = np.concatenate([np.array(v) for v in latencies.values()])
+    p = np.percentile(allv, [50, 90, 99])
+    print(f"\n== {strategy}  (duvar {wall:.1f} s)")
+    print(f"   tümü     p50 {p[0]:6.2f}s  p90 {p[1]:6.2f}s  p99 {p[2]:6.2f}s  max {allv.max():6.2f}s")
+    for brand, v in latencies.items():
+        q = np.percentile(v, [50, 90])
+        print(f"   {brand:12s} p50 {q[0]:6.2f}s  p90 {q[1]:6.2f}s  max {max(v):6.2f}s")
+    print(f"   kazanan: {wins}  çağrı: scraperapi={calls['GET']} perplexity={calls['POST']}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--country", default="Bulgaristan")
+    ap.add_argument("--rounds", type=int, default=10)
+    ap.add_argument("--delays", default="0,1.5", help="virgülle ayrılmış hedge gecikmeleri (sn)")
+    ap.add_argument("--scale", type=float, default=1.0, help="tüm gecikmeleri ölçekler")
+    args = ap.parse_args()
+
+    server, base = fake_server.start(
+        scraper_delay=Latency(1, 1.2, 0.9, args.scale),
+        sonar_delay=Latency(2, 2.0, 0.3, args.scale),
+        listing_size=lambda brand: 2 if brand in THIN else 20,
+    )
+    config.SCRAPER_API_URL = base + "/"
+    config.PERPLEXITY_URL = base + "/chat/completions"
+    brands = list(config.URL_DB[args.country])
+
+    runs = [run("seri", None, brands, args.rounds, args.country)]
+    for d in [float(x) for x in args.delays.split(",") if x]:
+        runs.append(run(f"hedged delay={d * args.scale:g}s", d * args.scale, brands, args.rounds, args.country))
+    server.shutdown()
+    for r in runs:
+        report(*r)
+
+
+if __name__ == "__main__":
+    main()
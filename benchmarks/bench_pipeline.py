@@ -0,0 +1,199 @@
+"""Uçtan uca tarama hattı benchmark'ı: ağ → parse → fiyat → alaka → çeviri.
+
+Replay sunucusuna (fixture yoksa sentetik sayfalar) karşı marka listesini tarar
+ve her aşama için duvar süresi, ürün/sn, tracemalloc ile ayrılan bellek ve
+tepe RSS ölçer. Çeviri, çağrı başına sabit gecikmeli bir sahte çevirmenle
+yapılır (soğuk: boş önbellek, sıcak: aynı isimler ikinci kez). Sonuçlar commit
+karşılaştırması için JSON'a yazılır.
+
+Çalıştırma (repo kökünden):
+    python -m benchmarks.bench_pipeline --repeat 5
+    python -m benchmarks.bench_pipeline --fixtures fixtures --compare benchmarks/results/pipeline-abc1234.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from scraper import config, translation
+from scraper.config import SITE_SELECTORS, URL_DB
+from scraper.extraction import extract_products
+from scraper.fanout import fan_out
+from scraper.pipeline import build_rows, make_fetcher
+from scraper.pricing import clean_prices
+from scraper.relevance import filter_relevant
+from scraper.transport import default_transport
+
+from . import replay_server
+
+
+def stub_translator(latency):
+    """GoogleTranslator yerine: her çağrı `latency` sn sürer, metni aynen döner."""
+    class Stub:
+        def __init__(self, source="auto", target="tr"):
+            pass
+
+        def translate(self, text):
+            time.sleep(latency)
+            return text
+    return Stub
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class Stages:
+    """Aşama süreleri; `alloc=True` ise tracemalloc ile tepe/toplam ayrılan bellek."""
+
+    def __init__(self, alloc=False):
+        self.alloc = alloc
+        self.results = {}
+
+    def run(self, name, items, fn, *args, unit="ürün"):
+        if self.alloc:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        out = fn(*args)
+        elapsed = time.perf_counter() - t0
+        entry = {"seconds": elapsed, "items": items, "unit": unit,
+                 "items_per_s": items / elapsed if elapsed else None, "rss_mb": rss_mb()}
+        if self.alloc:
+            current, peak = tracemalloc.get_traced_memory()
+            entry = {"alloc_peak_kb": (peak - before) / 1024, "alloc_retained_kb": (current - before) / 1024}
+        self.results[name] = entry
+        return out
+
+
+def pipeline(stages, brands, country, query_local, query_english, repeat):
+    lang = config.COUNTRIES_META[country]["lang"]
+    curr = config.COUNTRIES_META[country]["curr"]
+    transport = default_transport()
+    jobs = [b for b in brands if b in SITE_SELECTORS] * repeat
+
+    def fetch(brand):
+        site = URL_DB[country][brand]
+        params = {"api_key": "bench", "url": site["base"] + site["search"].format(query=query_local.replace(" ", "+")),
+                  "render": "true", "country_code": "bg"}
+        return brand, site["base"], transport.get(config.SCRAPER_API_URL, params=params, timeout=90).text
+
+    pages = stages.run("network", len(jobs),
+                       lambda: [r for _, r, _ in fan_out(jobs, fetch, max_workers=config.MAX_CONCURRENCY)],
+                       unit="sayfa")
+    products = stages.run("parse", len(pages), lambda: [
+        (brand, p) for brand, base, html in pages for p in extract_products(brand, html, base)
+    ], unit="sayfa")
+    n = len(products)
+    names = [p.get("name", "") for _, p in products]
+    stages.run("clean_price", n, clean_prices, [p.get("price", 0) for _, p in products], curr)
+    stages.run("relevance", n, filter_relevant, names, query_english, lang)
+    stages.run("translate_cold", n, translation.default_cache().translate_batch, names, "tr")
+    stages.run("translate_warm", n, translation.default_cache().translate_batch, names, "tr")
+
+    # Aynı işin uygulamadaki yoldan (make_fetcher + build_rows) toplam süresi; çeviri önbelleği sıcak
+    fetcher = make_fetcher(country, "ScraperAPI", query_local, query_english, "bench", "bench",
+                           use_cache=False, limiters={}, health=False)
+    rates = {"USD": 40.0, curr: 20.0}
+
+    def end_to_end():
+        scanned = fan_out(jobs, fetcher, max_workers=config.MAX_CONCURRENCY)
+        return build_rows(scanned, query_english, lang, curr, rates)
+    stages.run("end_to_end", n, end_to_end)
+    return n
+
+
+def compare(current, previous):
+    print(f"\nkarşılaştırma: {previous.get('commit')} → {current['commit']}")
+    ignore = {"out", "compare"}
+    old_params = {k: v for k, v in previous.get("params", {}).items() if k not in ignore}
+    if old_params != {k: v for k, v in current["params"].items() if k not in ignore}:
+        print("  uyarı: benchmark parametreleri farklı, süreler doğrudan karşılaştırılamaz")
+    for name, stage in current["stages"].items():
+        old = previous.get("stages", {}).get(name)
+        if not old:
+            continue
+        delta = (stage["seconds"] - old["seconds"]) / old["seconds"] * 100 if old["seconds"] else 0.0
+        print(f"  {name:15s} {old['seconds'] * 1000:9.1f} ms → {stage['seconds'] * 1000:9.1f} ms  ({delta:+.1f}%)")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--country", default="Bulgaristan")
+    ap.add_argument("--query-local", default="кърпа")
+    ap.add_argument("--query-english", default="towel")
+    ap.add_argument("--repeat", type=int, default=5, help="marka listesinin kaç kez taranacağı")
+    ap.add_argument("--fixtures", default="fixtures", help="replay fixture dizini (yoksa sentetik sayfalar)")
+    ap.add_argument("--latency", type=float, default=0.05, help="replay sunucusu yanıt gecikmesi (sn)")
+    ap.add_argument("--translate-latency", type=float, default=0.2, help="sahte çevirmen çağrı süresi (sn)")
+    ap.add_argument("--out", help="JSON çıktı yolu (varsayılan benchmarks/results/pipeline-<commit>.json)")
+    ap.add_argument("--compare", help="önceki bir JSON sonucu ile karşılaştır")
+    args = ap.parse_args()
+
+    server, base = replay_server.start(args.fixtures, scraper_faults=replay_server.Faults(latency=args.latency))
+    config.SCRAPER_API_URL = base + "/"
+    os.environ["RESPONSE_CACHE"] = "0"
+    brands = list(URL_DB[args.country])
+
+    results = {}
+    for alloc in (False, True):
+        # Her geçişte boş (yalnızca bellek) çeviri önbelleği
+        translation._default = translation.TranslationCache(
+            path=None, translator_factory=stub_translator(args.translate_latency))
+        stages = Stages(alloc)
+        if alloc:
+            tracemalloc.start()
+        products = pipeline(stages, brands, args.country, args.query_local, args.query_english, args.repeat)
+        if alloc:
+            tracemalloc.stop()
+            for name, entry in stages.results.items():
+                results[name].update(entry)
+        else:
+            results = stages.results
+    server.shutdown()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": vars(args),
+        "products": products,
+        "peak_rss_mb": rss_mb(),
+        "stages": results,
+    }
+
+    print(f"commit={report['commit']} ürün={products} tepe RSS={report['peak_rss_mb']:.0f} MB")
+    print(f"  {'aşama':15s} {'süre':>10s} {'hız':>18s} {'tepe alloc':>12s} {'kalan alloc':>12s}")
+    for name, s in results.items():
+        rate = f"{s['items_per_s']:,.0f} {s['unit']}/sn" if s["items_per_s"] else "-"
+        print(f"  {name:15s} {s['seconds'] * 1000:8.1f}ms {rate:>18s} {s['alloc_peak_kb']:10.0f}KB "
+              f"{s['alloc_retained_kb']:10.0f}KB")
+
+    out = args.out or os.path.join("benchmarks", "results", f"pipeline-{report['commit']}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"→ {out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Fiyat geçmişi deposunun ekleme hızı ve indeksli sorgu gecikmesi.
+
+Çalıştırma (repo kökünden):
+    python -m benchmarks.bench_price_store --rows 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from scraper.config import BRANDS, COUNTRIES_META
+from scraper.price_store import PriceStore
+
+ITEMS = ["Towel", "Bath Mat", "Pillow", "Blanket", "Curtain", "Candle", "Vase", "Mug", "Frame", "Basket"]
+QUERIES = ["Yüz Havlusu", "Banyo Paspası", "Yastık", "Battaniye", "Perde"]
+
+
+def make_rows(brand, n, rng):
+    rows = []
+    for i in range(n):
+        item = rng.choice(ITEMS)
+        price = round(rng.uniform(2, 80), 2)
+        rows.append({
+            "Marka": brand, "Ürün Yerel": f"{brand} {item} {i % 50} {rng.randint(30, 200)}x{rng.randint(30, 200)}",
+            "Fiyat (Yerel)": price, "TL": price * 23, "USD": price * 0.55, "Kaynak": "SCRAPERAPI",
+            "Link": f"https://example.com/{i}",
+        })
+    return rows
+
+
+def timed(fn, repeat=20):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), max(samples), len(out)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--days", type=int, default=365)
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    countries = list(COUNTRIES_META)
+    cells = [(c, b, q) for c in countries for b in BRANDS for q in QUERIES]
+    per_cell = max(1, args.rows // (args.days * len(cells)))
+    start = time.time() - args.days * 86400
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PriceStore(os.path.join(tmp, "prices.sqlite3"))
+        t0 = time.perf_counter()
+        total = 0
+        for d in range(args.days):
+            ts = start + d * 86400
+            for country, brand, query in cells:
+                total += store.record(make_rows(brand, per_cell, rng), country, query,
+                                      COUNTRIES_META[country]["curr"], ts=ts)
+        t_insert = time.perf_counter() - t0
+        size = os.path.getsize(store.path) / 1e6
+        print(f"rows={total:,} insert={t_insert:.1f}s ({total / t_insert:,.0f} rows/s) db={size:.0f} MB")
+
+        country = countries[0]
+        cases = {
+            "trend brand+query 90d": lambda: store.trend(country, "Pepco", query="Yüz Havlusu", days=90),
+            "trend brand+product 90d": lambda: store.trend(country, "Pepco", product="towel", days=90),
+            "history brand+product 90d": lambda: store.history(country, "Pepco", product="towel", days=90),
+            "trend country+query 90d": lambda: store.trend(country, query="Yüz Havlusu", days=90),
+        }
+        for name, fn in cases.items():
+            median, worst, n = timed(fn)
+            print(f"{name:28s}: median {median:7.1f} ms  max {worst:7.1f} ms  ({n} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Toplu fiyat normalizasyonu: üretilmiş fiyat yazımları + hız karşılaştırması.
+
+Rastgele fiyatlar para birimine özgü yazımlarla (binlik ayraç, sembol, aralık,
+eski/yeni çifti) metne çevrilir; `clean_prices` her birini geri okuyabilmeli.
+
+    python -m benchmarks.bench_pricing --rows 100000
+"""
+import argparse
+import random
+import re
+import time
+
+import numpy as np
+
+from scraper.pricing import clean_prices
+
+# Örnek üretiminde virgülü ondalık ayraç olarak yazılan paralar; ayrıştırıcı bunu kullanmaz,
+# ayracı sayının kendisinden çıkarır
+DECIMAL_COMMA = {"BGN", "BAM", "RSD", "EUR", "RON", "TRY", "HUF"}
+SYMBOLS = {"BGN": ["лв", "лв.", "BGN"], "BAM": ["KM", "BAM"], "RSD": ["RSD", "din", "дин."], "EUR": ["€", "EUR"], "USD": ["$", "USD"]}
+
+
+def legacy_clean_price(price_raw, currency_code="USD"):
+    """app.py'deki eski satır bazlı fonksiyon."""
+    if not price_raw: return 0.0
+    s = str(price_raw).lower()
+    for bad in ["from", "start", "to", "price", "fiyat", "only", "now", "was", "de", "от"]:
+        s = s.replace(bad, "")
+    for code in ["rsd", "din", "km", "bam", "лв", "bgn", "eur", "ron", "lei", "tl", "try", "$", "€", "£", "₺"]:
+        s = s.replace(code, "")
+    s = re.sub(r'[^\d.,]', '', s.strip())
+    if not s: return 0.0
+    numbers = re.findall(r'[\d.,]+', s)
+    if not numbers: return 0.0
+    s = numbers[0]
+    try:
+        if ',' in s and '.' in s:
+            s = s.replace('.', '').replace(',', '.') if s.rfind(',') > s.rfind('.') else s.replace(',', '')
+        elif ',' in s:
+            s = s.replace(',', '.') if len(s.split(',')[-1]) == 2 else s.replace(',', '')
+        return float(s)
+    except: return 0.0
+
+
+def format_price(value, currency, rnd):
+    """Bir fiyatı ilgili para biriminin yaygın yazımlarından biriyle metne çevirir."""
+    comma = currency in DECIMAL_COMMA
+    whole, cents = f"{value:.2f}".split(".")
+    groups = f"{int(whole):,}"
+    thousands = rnd.choice([".", " ", " ", ""]) if comma else rnd.choice([",", ""])
+    text = groups.replace(",", thousands) + ("," if comma else ".") + cents
+    if currency == "RSD" and cents == "00" and rnd.random() < 0.5:
+        text = groups.replace(",", thousands or ".")
+    sym = rnd.choice(SYMBOLS[currency])
+    return rnd.choice([f"{text} {sym}", f"{sym} {text}", f"{sym}{text}", text])
+
+
+def generate(rows, seed=11):
+    rnd = random.Random(seed)
+    cases = []
+    for _ in range(rows):
+        currency = rnd.choice(list(SYMBOLS))
+        value = round(rnd.uniform(0.5, 50000), 2)
+        if currency == "RSD" and rnd.random() < 0.5:
+            value = float(round(value))
+        text = format_price(value, currency, rnd)
+        kind = rnd.random()
+        if kind < 0.1:
+            text = f"was {format_price(value * 1.5, currency, rnd)} now {text}"
+        elif kind < 0.2:
+            text = f"{text} - {format_price(value * 2, currency, rnd)}"
+        cases.append((text, currency, value))
+    return cases
+
+
+def check(cases):
+    failures = []
+    for currency in SYMBOLS:
+        subset = [c for c in cases if c[1] == currency]
+        got = clean_prices([c[0] for c in subset], currency)
+        for (text, _, want), value in zip(subset, got):
+            if not np.isclose(value, want):
+                failures.append((text, currency, want, value))
+    return failures
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100000)
+    ap.add_argument("--distinct", type=int, default=500, help="tekrarlı senaryoda farklı fiyat metni sayısı")
+    args = ap.parse_args()
+
+    # Elle doğrulanmış örnekler ve aynı üreteçle doğruluk testi: tests/test_pricing.py
+    failures = check(generate(5000))
+    for f in failures[:20]:
+        print("FAIL", f)
+    print(f"generated: 5000 cases, {len(failures)} failures")
+
+    cases = generate(args.rows)
+    unique = [c[0] for c in cases if c[1] == "BGN"]
+    # Gerçek taramalarda aynı fiyat metni pek çok üründe tekrar eder
+    rnd = random.Random(3)
+    repeated = [rnd.choice(unique[:args.distinct]) for _ in unique]
+    for label, texts in (("unique", unique), (f"{args.distinct} distinct", repeated)):
+        t0 = time.perf_counter()
+        for t in texts:
+            legacy_clean_price(t, "BGN")
+        t_old = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        clean_prices(texts, "BGN")
+        t_new = time.perf_counter() - t0
+        print(f"[{label:>12}] rows={len(texts)}  legacy: {len(texts) / t_old:>10,.0f} rows/s"
+              f"  batch: {len(texts) / t_new:>10,.0f} rows/s  ({t_old / t_new:.1f}x)")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
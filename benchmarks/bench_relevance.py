@@ -0,0 +1,76 @@
+"""Çeviri tabanlı alaka kontrolü ile ağsız skorlayıcının satır/sn karşılaştırması.
+
+Ağ erişimi olmadan ölçülebilmesi için eski yoldaki GoogleTranslator çağrısı
+`--latency` saniye bekleyen sahte bir çevirmenle taklit edilir.
+
+    python -m benchmarks.bench_relevance --rows 20000 --latency 0.15
+"""
+import argparse
+import random
+import time
+
+from scraper.relevance import filter_relevant
+
+LOCAL_NAMES = {
+    "bg": ["Кърпа за лице {n}x{m}", "Хавлиена кърпа {n}x{m}", "Комплект кърпи", "Възглавница {n}x{m}", "Ваза стъклена"],
+    "sr": ["Пешкир за лице {n}x{m}", "Peškir za ruke", "Jastuk {n}x{m}", "Tepih {n}x{m}", "Šolja keramika"],
+    "bs": ["Ručnik za lice {n}x{m}", "Peškir {n}x{m}", "Jastučnica", "Zavjesa {n}x{m}", "Tanjur plitki"],
+}
+
+
+class _SlowTranslator:
+    latency = 0.0
+
+    def __init__(self, source, target):
+        pass
+
+    def translate(self, text):
+        time.sleep(self.latency)
+        return text
+
+
+def legacy_validate_relevance(product_name, query_english):
+    """app.py'deki eski fonksiyon: her satır için bir çeviri isteği."""
+    try:
+        prod_en = _SlowTranslator(source='auto', target='en').translate(product_name).lower()
+        keywords = [k for k in query_english.lower().split() if len(k) > 2]
+        main = keywords[-1] if keywords else ""
+        if main in prod_en: return True
+        return any(k in prod_en for k in keywords)
+    except:
+        return True
+
+
+def make_names(lang, rows, seed=7):
+    rnd = random.Random(seed)
+    return [rnd.choice(LOCAL_NAMES[lang]).format(n=rnd.choice([30, 50, 70]), m=rnd.choice([50, 90, 140])) for _ in range(rows)]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=20000)
+    ap.add_argument("--legacy-rows", type=int, default=40, help="eski yol yavaş olduğu için daha az satırla ölçülür")
+    ap.add_argument("--latency", type=float, default=0.15, help="taklit edilen çeviri gecikmesi (sn)")
+    ap.add_argument("--query", default="Face Towel")
+    args = ap.parse_args()
+    _SlowTranslator.latency = args.latency
+
+    for lang in LOCAL_NAMES:
+        names = make_names(lang, args.rows)
+
+        t0 = time.perf_counter()
+        mask = filter_relevant(names, args.query, lang)
+        t_new = time.perf_counter() - t0
+
+        legacy = names[:args.legacy_rows]
+        t0 = time.perf_counter()
+        for name in legacy:
+            legacy_validate_relevance(name, args.query)
+        t_old = time.perf_counter() - t0
+
+        print(f"[{lang}] offline: {len(names) / t_new:>12,.0f} rows/s  ({mask.mean():.0%} relevant)"
+              f"  | legacy: {len(legacy) / t_old:>8,.1f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Sonuç satırlarının dict listesi ile `ResultTable` hâlindeki bellek ve birleştirme maliyeti.
+
+Çalıştırma (repo kökünden):
+    python -m benchmarks.bench_results --rows 200000 --cells 60
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+import pandas as pd
+
+from scraper.config import COUNTRIES_META, URL_DB
+from scraper.results import ResultTable
+
+ITEMS = ["Towel", "Bath Mat", "Pillow", "Blanket", "Curtain", "Candle", "Vase", "Mug", "Frame", "Basket"]
+
+
+def make_rows(brand, curr, n, rng):
+    rows = []
+    for i in range(n):
+        item = rng.choice(ITEMS)
+        price = round(rng.uniform(2, 80), 2)
+        rows.append({
+            "Marka": brand, "Ürün Yerel": f"{brand} {item} {i % 50} {rng.randint(30, 200)}x{rng.randint(30, 200)}",
+            "Ürün Türkçe": f"{brand} {item} {i % 50} (tr)", f"Fiyat ({curr})": price, "USD": price * 0.55,
+            "TL": price * 23, "Link": f"https://example.com/{brand}/{i}", "Kaynak": "SCRAPERAPI",
+            "Kaynaklar": "SCRAPERAPI", "Birleşen": 1, "Adet": 1, "m²": 0.45, "TL/Adet": price * 23,
+            "TL/m²": price * 51, "TL/L": None,
+        })
+    return rows
+
+
+def traced(fn):
+    """fn() çıktısı ve Python yığınında kapladığı bayt."""
+    tracemalloc.start()
+    out = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return out, size
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--cells", type=int, default=60, help="ayrı taramaların (ülke × sorgu) sayısı")
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    countries = list(COUNTRIES_META)
+    per_cell = max(1, args.rows // args.cells)
+    cells = []
+    for i in range(args.cells):
+        country = countries[i % len(countries)]
+        brands = list(URL_DB[country])
+        curr = COUNTRIES_META[country]["curr"]
+        rows = [r for b in brands for r in make_rows(b, curr, per_cell // len(brands), rng)]
+        cells.append((country, f"query {i // len(countries)}", curr, rows))
+    total = sum(len(c[3]) for c in cells)
+
+    dicts, dict_bytes = traced(lambda: make_rows("Pepco", "BGN", total, random.Random(7)))
+    print(f"rows={total:,}")
+    print(f"list[dict]      : {dict_bytes / total:7.0f} B/row  ({dict_bytes / 1e6:.0f} MB)")
+    del dicts
+
+    t0 = time.perf_counter()
+    tables = [ResultTable.from_rows(rows, country, query, curr, 0.0) for country, query, curr, rows in cells]
+    t_build = time.perf_counter() - t0
+    nbytes = sum(t.nbytes for t in tables)
+    fixed = sum(c.memory_usage(deep=False).sum() for t in tables for c in t.chunks)
+    print(f"ResultTable     : {nbytes / total:7.0f} B/row  ({nbytes / 1e6:.0f} MB; sabit sütunlar {fixed / total:.0f} B/row)"
+          f"  build {t_build:.2f}s")
+
+    t0 = time.perf_counter()
+    merged = ResultTable.concat(tables)
+    t_concat = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    frame = merged.frame()
+    t_frame = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    legacy = pd.concat([pd.DataFrame(rows) for *_, rows in cells], ignore_index=True)
+    t_legacy = time.perf_counter() - t0
+    print(f"concat {len(tables)} tablo: {t_concat * 1e3:.3f} ms (kopyasız)  frame(): {t_frame * 1e3:.0f} ms"
+          f"  dict→DataFrame concat: {t_legacy * 1e3:.0f} ms")
+    print(f"DataFrame bellek: ResultTable {frame.memory_usage(deep=True).sum() / total:.0f} B/row, "
+          f"dict'lerden {legacy.memory_usage(deep=True).sum() / total:.0f} B/row "
+          f"({legacy.shape[1]} sütun, para birimi başına ayrı fiyat sütunu)")
+
+
+if __name__ == "__main__":
+    main()
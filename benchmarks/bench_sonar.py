@@ -0,0 +1,64 @@
+"""Perplexity akışlı istemcisinde ilk ürün ve tam yanıt süresi; kesik yanıtlarda kurtarılan ürün.
+
+Sahte sunucu yanıt gecikmesini SSE olaylarına yayar. Eski yöntem (tam yanıtı
+bekleyip ilk "{" ile son "}" arasını tek `json.loads`) ile `ProductStream`
+aynı kesik metinler üzerinde karşılaştırılır.
+
+Çalıştırma (repo kökünden):
+    python -m benchmarks.bench_sonar --calls 8 --delay 2
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from scraper import config
+from scraper.config import URL_DB
+from scraper.providers import search_sonar
+from scraper.sonar import parse_products
+
+from . import fake_server
+
+
+def legacy_parse(raw):
+    start, end = raw.find("{"), raw.rfind("}")
+    if start == -1 or end == -1:
+        return []
+    try:
+        return json.loads(raw[start:end + 1]).get("products") or []
+    except ValueError:
+        return []
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=8)
+    ap.add_argument("--delay", type=float, default=2.0, help="sahte Perplexity yanıt süresi (sn)")
+    args = ap.parse_args()
+
+    server, base = fake_server.start(sonar_delay=args.delay)
+    config.PERPLEXITY_URL = base + "/chat/completions"
+    site = URL_DB["Bulgaristan"]["Pepco"]
+    first, total = [], []
+    for _ in range(args.calls):
+        seen = []
+        t0 = time.perf_counter()
+        data = search_sonar("Pepco", "кърпа", "towel", site, api_key="bench", use_cache=False,
+                            on_products=lambda items: seen.append(time.perf_counter() - t0))
+        total.append(time.perf_counter() - t0)
+        first.append(seen[0] if seen else np.nan)
+        assert data and len(data["products"]) == 12
+    server.shutdown()
+    print(f"ilk ürün p50 {np.nanmedian(first):.2f}s  tam yanıt p50 {np.median(total):.2f}s  ({args.calls} çağrı)")
+
+    content = fake_server.sonar_content("Pepco", 12)
+    cuts = range(len(content) // 4, len(content), 7)
+    old = [len(legacy_parse(content[:cut])) for cut in cuts]
+    new = [len(parse_products(content[:cut])) for cut in cuts]
+    print(f"kesik yanıt ({len(old)} kesim noktası): eski ortalama {np.mean(old):.1f} ürün "
+          f"(boş {sum(n == 0 for n in old)}), akış ayrıştırıcı {np.mean(new):.1f} ürün (boş {sum(n == 0 for n in new)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Benchmark'lar için yerel sahte ScraperAPI + Perplexity sunucusu.
+
+ScraperAPI isteğinde hedef URL'nin markasına göre SITE_SELECTORS ile uyumlu bir
+ürün listesi HTML'i, Perplexity isteğinde ise ürün JSON'u (`"stream": true` ise
+SSE olayları) döner. Her yanıt `delay` saniye bekletilir (akışta olaylara
+yayılır); böylece gerçek render gecikmesi taklit edilir.
+Gecikme ve liste boyu sabit ya da `fn(marka)` olarak sağlayıcı bazında verilebilir.
+`catalog` verilirse marka o kadar ürünlük bir katalog gibi davranır: hedef
+URL'deki `page` parametresine (`config.PAGINATION` indeksiyle) göre katalogun
+ilgili dilimi döner, katalog bitince boş sayfa gelir. Arama kartlarındaki
+`/p/<n>` linkleri JSON-LD ve eski fiyat içeren bir detay sayfası döner.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from scraper.config import DETAIL_SELECTORS, PAGINATION, SITE_SELECTORS, URL_DB
+
+
+def _tag(selector):
+    tag, _, cls = selector.partition(".")
+    return tag or "div", cls
+
+
+def render_listing(brand, n=20, offset=0):
+    """Markanın ilk seçicilerine uyan `n` ürün kartlı (`offset`'ten başlayan) bir arama sayfası üretir."""
+    sel = SITE_SELECTORS.get(brand) or SITE_SELECTORS["Pepco"]
+    card_tag, card_cls = _tag(sel["product"][0])
+    name_tag, name_cls = _tag(sel["name"][0])
+    price_tag, price_cls = _tag(sel["price"][0])
+    cards = []
+    for i in range(offset, offset + n):
+        cards.append(
+            f'<{card_tag} class="{card_cls}"><a href="/p/{i}">'
+            f'<{name_tag} class="{name_cls}">{brand} Towel {i} 50x90</{name_tag}></a>'
+            f'<{price_tag} class="{price_cls}">{9 + i % 7},99 лв</{price_tag}></{card_tag}>'
+        )
+    return "<html><body><main>" + "".join(cards) + "</main></body></html>"
+
+
+def render_detail(brand, i):
+    """`/p/<i>` kartının detay sayfası: JSON-LD, marka eski fiyat seçicisi ve paket metni."""
+    ld = {"@context": "https://schema.org", "@type": "Product", "name": f"{brand} Towel {i} 50x90",
+          "material": "100% памук" if i % 2 else None}
+    old_sel = DETAIL_SELECTORS.get(brand, {}).get("old_price", ["del"])[0]
+    old_tag, old_cls = _tag(old_sel)
+    return (f'<html><head><script type="application/ld+json">{json.dumps(ld, ensure_ascii=False)}</script></head>'
+            f'<body><main><h1>{brand} Towel {i} 50x90</h1>'
+            f'<{old_tag} class="{old_cls}">{12 + i % 7},99 лв</{old_tag}>'
+            f'<p>Размер: 50 x 90 cm. Комплект {1 + i % 3} бр. Състав: 80% памук 20% полиестер</p></main></body></html>')
+
+
+def detail_index(url):
+    """Detay linkiyse kart numarası, değilse None."""
+    m = re.search(r"/p/(\d+)$", urlparse(url).path)
+    return int(m.group(1)) if m else None
+
+
+def sonar_content(brand, n=12):
+    products = [{"name": f"{brand} Towel {i}", "price": f"{5 + i}.99", "url": f"https://example.com/{i}"} for i in range(n)]
+    return "```json\n" + json.dumps({"products": products}) + "\n```"
+
+
+def render_sonar(brand, n=12):
+    return {"choices": [{"message": {"content": sonar_content(brand, n)}, "finish_reason": "stop"}]}
+
+
+def sonar_events(brand, n=12, parts=16):
+    """Akışlı yanıtın SSE olayları: içerik `parts` eşit parçaya bölünür."""
+    content = sonar_content(brand, n)
+    step = -(-len(content) // parts)
+    for i in range(0, len(content), step):
+        last = i + step >= len(content)
+        choice = {"delta": {"content": content[i:i + step]}, "finish_reason": "stop" if last else None}
+        yield f"data: {json.dumps({'choices': [choice]})}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def brand_for(url):
+    for sites in URL_DB.values():
+        for brand, site in sites.items():
+            if url.startswith(site["base"]):
+                return brand
+    return "Pepco"
+
+
+def _value(v, brand):
+    return v(brand) if callable(v) else v
+
+
+class _Handler(BaseHTTPRequestHandler):
+    scraper_delay = 0.0
+    sonar_delay = 0.0
+    listing_size = 20
+    catalog = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body, ctype):
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = parse_qs(urlparse(self.path).query).get("url", [""])[0]
+        brand = brand_for(url)
+        time.sleep(_value(self.scraper_delay, brand))
+        if detail_index(url) is not None:
+            self._send(render_detail(brand, detail_index(url)), "text/html; charset=utf-8")
+            return
+        size = _value(self.listing_size, brand)
+        offset = 0
+        catalog = _value(self.catalog, brand)
+        if catalog is not None:
+            page = parse_qs(urlparse(url).query).get("page")
+            first = PAGINATION.get(brand, {}).get("first", 1)
+            offset = (int(page[0]) - first) * size if page else 0
+            size = max(0, min(size, catalog - offset))
+        self._send(render_listing(brand, size, offset), "text/html; charset=utf-8")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+        brand = next((b for sites in URL_DB.values() for b, s in sites.items() if s["base"] in prompt), "Pepco")
+        delay = _value(self.sonar_delay, brand)
+        if not payload.get("stream"):
+            time.sleep(delay)
+            self._send(json.dumps(render_sonar(brand)), "application/json")
+            return
+        # Akış: gecikme olaylara yayılır, ilk ürünler yanıt bitmeden gelir
+        events = list(sonar_events(brand))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for event in events:
+            time.sleep(delay / len(events))
+            self.wfile.write(event.encode("utf-8"))
+            self.wfile.flush()
+
+
+def start(delay=0.5, port=0, scraper_delay=None, sonar_delay=None, listing_size=20, catalog=None):
+    """Sunucuyu arka planda başlatır, (server, base_url) döner."""
+    handler = type("Handler", (_Handler,), {
+        "scraper_delay": staticmethod(delay if scraper_delay is None else scraper_delay),
+        "sonar_delay": staticmethod(delay if sonar_delay is None else sonar_delay),
+        "listing_size": staticmethod(listing_size),
+        "catalog": staticmethod(catalog),
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
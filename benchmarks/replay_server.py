@@ -0,0 +1,183 @@
+"""Kaydedilmiş fixture'ları sunan yerel ScraperAPI + Perplexity taklidi.
+
+Kayıt: uygulamayı ya da batch koşucusunu canlı anahtarlarla `RECORD_FIXTURES`
+ayarlı çalıştırın; yanıtlar `scraper.fixtures` biçiminde diske yazılır:
+
+    RECORD_FIXTURES=fixtures python -m scraper.batch matrix.json
+
+Oynatma: sunucuyu başlatıp uygulamayı `REPLAY_URL` ile ona yönlendirin:
+
+    python -m benchmarks.replay_server --fixtures fixtures --port 8765 \\
+        --latency 1.5 --jitter 0.6 --error-rate 0.05
+    REPLAY_URL=http://127.0.0.1:8765 streamlit run app.py
+
+`GET /` ScraperAPI'yi (api_key hariç sorgu parametreleriyle eşleşir),
+`POST /chat/completions` Perplexity'yi (istek gövdesiyle eşleşir) taklit eder.
+Fixture'ı olmayan istekler `--miss synthetic` ile sahte sunucunun sentetik
+sayfasını, `--miss 404` ile 404 alır. `GET /__stats` sayaçları döner.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+from scraper.config import URL_DB
+from scraper.fixtures import FixtureStore
+
+from .fake_server import brand_for, detail_index, render_detail, render_listing, render_sonar
+
+
+class Faults:
+    """Gecikme (lognormal) ve hata enjeksiyonu; iş parçacığı güvenli, tohumlu."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_statuses=(429, 503), hang_rate=0.0,
+                 hang=120.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.hang_rate = hang_rate
+        self.hang = hang
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """(bekleme sn, enjekte edilecek durum kodu ya da None)"""
+        with self._lock:
+            if self.hang_rate and self._rng.random() < self.hang_rate:
+                return self.hang, None
+            delay = self.latency * (self._rng.lognormvariate(0, self.jitter) if self.jitter else 1.0)
+            status = None
+            if self.error_rate and self._rng.random() < self.error_rate:
+                status = self._rng.choice(self.error_statuses)
+            return delay, status
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store = None
+    faults = {}
+    miss = "synthetic"
+    counters = None
+
+    def log_message(self, *args):
+        pass
+
+    def _count(self, name):
+        with self.server.lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def _send(self, status, body, ctype, headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _serve(self, provider, request, synthetic):
+        delay, status = self.faults[provider].draw()
+        time.sleep(delay)
+        if status:
+            self._count(f"{provider}_error_{status}")
+            self._send(status, json.dumps({"error": "injected"}), "application/json",
+                       {"Retry-After": "1"} if status == 429 else None)
+            return
+        fixture = self.store.load(provider, request)
+        if fixture:
+            self._count(f"{provider}_hit")
+            self._send(fixture["status"], fixture["body"], fixture["content_type"])
+        elif self.miss == "synthetic":
+            self._count(f"{provider}_synthetic")
+            self._send(200, *synthetic())
+        else:
+            self._count(f"{provider}_miss")
+            self._send(404, json.dumps({"error": "no fixture"}), "application/json")
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path == "/__stats":
+            with self.server.lock:
+                self._send(200, json.dumps(self.counters), "application/json")
+            return
+        request = {k: v for k, v in parse_qsl(parsed.query) if k != "api_key"}
+        url = request.get("url", "")
+        brand = brand_for(url)
+        index = detail_index(url)
+        self._serve("scraperapi", request,
+                    lambda: (render_listing(brand) if index is None else render_detail(brand, index),
+                             "text/html; charset=utf-8"))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+        brand = next((b for sites in URL_DB.values() for b, s in sites.items() if s["base"] in prompt), "Pepco")
+        # Kayıtlar akış bayrağı olmadan anahtarlanır; yanıt akışsız JSON olarak döner
+        request = {k: v for k, v in payload.items() if k != "stream"}
+        self._serve("perplexity", request, lambda: (json.dumps(render_sonar(brand)), "application/json"))
+
+
+def start(fixtures, host="127.0.0.1", port=0, scraper_faults=None, sonar_faults=None, miss="synthetic"):
+    """Sunucuyu arka planda başlatır, (server, base_url) döner."""
+    handler = type("Handler", (_Handler,), {
+        "store": FixtureStore(fixtures),
+        "faults": {"scraperapi": scraper_faults or Faults(), "perplexity": sonar_faults or Faults()},
+        "miss": miss,
+        "counters": {},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="ScraperAPI/Perplexity replay sunucusu")
+    ap.add_argument("--fixtures", default="fixtures")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="medyan yanıt gecikmesi (sn)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="lognormal sigma; 0 sabit gecikme")
+    ap.add_argument("--scraper-latency", type=float, help="ScraperAPI için --latency'yi geçersiz kılar")
+    ap.add_argument("--sonar-latency", type=float, help="Perplexity için --latency'yi geçersiz kılar")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="hata döndürülecek istek oranı")
+    ap.add_argument("--error-status", default="429,503", help="virgülle ayrılmış enjekte durum kodları")
+    ap.add_argument("--hang-rate", type=float, default=0.0, help="--hang sn asılı kalacak istek oranı")
+    ap.add_argument("--hang", type=float, default=120.0)
+    ap.add_argument("--miss", choices=["synthetic", "404"], default="synthetic")
+    ap.add_argument("--seed", type=int)
+    args = ap.parse_args()
+
+    statuses = [int(s) for s in args.error_status.split(",") if s]
+
+    def faults(latency, seed):
+        return Faults(args.latency if latency is None else latency, args.jitter, args.error_rate, statuses,
+                      args.hang_rate, args.hang, seed)
+
+    seed = args.seed
+    server, base = start(
+        args.fixtures, args.host, args.port,
+        scraper_faults=faults(args.scraper_latency, seed),
+        sonar_faults=faults(args.sonar_latency, None if seed is None else seed + 1),
+        miss=args.miss,
+    )
+    fixtures = FixtureStore(args.fixtures).count()
+    print(f"replay: {base}  fixtures={fixtures}  miss={args.miss}")
+    print(f"        REPLAY_URL={base} streamlit run app.py")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(json.dumps(server.RequestHandlerClass.counters))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""LCW rakip fiyat tarayıcısının Streamlit'ten bağımsız çekirdek modülleri."""
@@ -0,0 +1,259 @@
+"""Başsız toplu tarama: sorgu × ülke × marka matrisini Streamlit olmadan çalıştırır.
+
+Matris dosyası JSON ya da düz metin olabilir:
+
+    {"queries": ["Yüz Havlusu", "Banyo Paspası"],
+     "countries": ["Bulgaristan"],          # yoksa URL_DB'deki tüm ülkeler
+     "brands": ["Pepco", "Jysk"],           # yoksa ülkedeki tüm markalar
+     "method": "Hybrid", "threshold": null,
+     "hedge_delay": 15,                     # null: eski seri Hybrid
+     "max_pages": 3,                        # null: config.PAGINATION / MAX_PAGES
+     "enrich": false}                       # true: detay sayfalarından ek sütunlar
+
+Düz metinde her satır bir sorgudur; tüm ülke ve markalar taranır. Sonuçlar
+satır satır JSONL olarak diske akar. Tamamlanan (ülke, sorgu) hücreleri
+`<çıktı>.done` dosyasına yazılır; aynı komut tekrar çalıştırıldığında bu hücreler
+atlanır ve yarım kalmış hücrelerin satırları temizlenir. Tamamlanan hücreler
+ayrıca fiyat geçmişine (`scraper.price_store`) eklenir; `--incremental` ile
+yalnızca eskimiş ya da değişken markalar yeniden çekilir (`scraper.incremental`).
+Her hücrenin aşama süreleri tek satırlık JSON log olarak yazılır; `--metrics`
+verilirse Prometheus sayaçları her hücreden sonra o dosyaya (node_exporter
+textfile collector biçiminde) yazılır. `--export parquet|arrow|csv` ile her hücre
+ayrıca `--export-dir` altına ülke/sorgu/tarih adlı bir dosyaya yazılır (`scraper.export`).
+
+    python -m scraper.batch matrix.json --out runs/nightly.jsonl --workers 8
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+
+from .config import COUNTRIES_META, EXPORT_DIR, HEDGE_DELAY, MAX_CONCURRENCY, URL_DB
+from .enrichment import apply_details, detail_targets, enrich
+from .export import FORMATS, export
+from .fanout import build_limiters, fan_out
+from .incremental import merge_rows, plan, record_scan, reused_rows
+from .pipeline import METHODS, build_rows, fetch_rates, make_fetcher, translate_query
+from .price_store import default_price_store
+from .results import ResultTable
+from .telemetry import REGISTRY, Trace, activate, log_trace
+
+log = logging.getLogger(__name__)
+
+
+def load_matrix(path):
+    """Matris dosyasını {"queries", "countries", "brands", "method", "threshold"} sözlüğüne çevirir."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".json"):
+        spec = json.loads(text)
+    else:
+        spec = {"queries": [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]}
+    return normalize_spec(spec)
+
+
+def normalize_spec(spec):
+    """Eksik matris anahtarlarını varsayılanlarla doldurur ve doğrular (yerinde)."""
+    spec.setdefault("countries", list(URL_DB))
+    spec.setdefault("brands", None)
+    spec.setdefault("method", "Hybrid")
+    spec.setdefault("threshold", None)
+    spec.setdefault("hedge_delay", HEDGE_DELAY)
+    spec.setdefault("max_pages", None)
+    spec.setdefault("enrich", False)
+    unknown = [c for c in spec["countries"] if c not in URL_DB]
+    if unknown:
+        raise ValueError(f"Bilinmeyen ülke: {', '.join(unknown)}")
+    if spec["method"] not in METHODS:
+        raise ValueError(f"Geçersiz yöntem: {spec['method']}")
+    return spec
+
+
+def expand_cells(spec):
+    """[(ülke, sorgu, [markalar])] listesi; markası olmayan hücreler atlanır."""
+    cells = []
+    for country in spec["countries"]:
+        brands = [b for b in (spec["brands"] or URL_DB[country]) if b in URL_DB[country]]
+        for query in spec["queries"]:
+            if brands:
+                cells.append((country, query, brands))
+    return cells
+
+
+def cell_key(country, query):
+    return json.dumps([country, query], ensure_ascii=False)
+
+
+def load_checkpoint(out_path):
+    """Tamamlanmış hücreleri okur ve çıktıdan yarım kalmış hücre satırlarını temizler."""
+    done_path = out_path + ".done"
+    done = set()
+    if os.path.exists(done_path):
+        with open(done_path, encoding="utf-8") as f:
+            done = {line.strip() for line in f if line.strip()}
+    if os.path.exists(out_path):
+        tmp = out_path + ".tmp"
+        with open(out_path, encoding="utf-8") as src, open(tmp, "w", encoding="utf-8") as dst:
+            for line in src:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # kesilmiş son satır
+                if cell_key(row["Ülke"], row["Sorgu"]) in done:
+                    dst.write(line)
+        os.replace(tmp, out_path)
+    return done
+
+
+class BatchRunner:
+    """Hücreleri marka düzeyinde paralel tarar, her hücre bitince satırları diske yazar."""
+
+    def __init__(self, spec, out_path, workers=MAX_CONCURRENCY, use_cache=True, rates=None, store=None,
+                 incremental=False, metrics_path=None, export_format=None, export_dir=EXPORT_DIR, limiters=None):
+        self.spec = spec
+        self.out_path = out_path
+        self.workers = workers
+        self.use_cache = use_cache
+        self.rates = rates
+        self.store = store
+        self.incremental = incremental and store is not None
+        self.metrics_path = metrics_path
+        self.export_format = export_format
+        self.export_dir = export_dir
+        # Aynı süreçteki birden çok koşucu (zamanlayıcı) limitleyicileri paylaşabilir
+        self.limiters = build_limiters() if limiters is None else limiters
+        self._pending = {}
+        self.rows_written = 0
+        self.cells_done = 0
+
+    def _task(self, job):
+        country, query, brand = job
+        q_local, q_english = translate_query(query, COUNTRIES_META[country]["lang"])
+        fetch = make_fetcher(country, self.spec["method"], q_local, q_english,
+                             use_cache=self.use_cache, limiters=self.limiters,
+                             hedge_delay=self.spec["hedge_delay"], max_pages=self.spec["max_pages"])
+        with activate(self._pending[(country, query)]["trace"]):
+            return q_english, fetch(brand)
+
+    def _on_done(self, job, result, error):
+        country, query, brand = job
+        cell = self._pending[(country, query)]
+        value = None if error else result[1]
+        if result:
+            cell["q_english"] = result[0]
+        cell["results"][brand] = (brand, value, error)
+        if len(cell["results"]) == len(cell["brands"]):
+            self._flush(country, query, self._pending.pop((country, query)))
+
+    def _flush(self, country, query, cell):
+        meta = COUNTRIES_META[country]
+        curr = meta["curr"]
+        scanned = [cell["results"][b] for b in cell["brands"]]
+        with activate(cell["trace"]):
+            rows = build_rows(scanned, cell.get("q_english", query), meta["lang"], curr, self.rates,
+                              self.spec["threshold"], log.warning)
+        now = datetime.now(timezone.utc)
+        fresh = rows
+        if cell["reuse"]:
+            rows = merge_rows(rows, reused_rows(self.store, country, query, cell["reuse"], curr, self.rates),
+                              cell["order"])
+        if self.spec["enrich"]:
+            details = enrich(detail_targets(rows), curr, use_cache=self.use_cache,
+                             limiter=self.limiters.get("scraperapi"))
+            rows = apply_details(rows, details, curr)
+        stamp = now.isoformat(timespec="seconds")
+        # Tablo yalnızca dışa aktarım için, hücre başına kurulur; bellekte birikmez
+        cell_table = ResultTable.from_rows(rows, country, query, curr, now.timestamp()) if self.export_format else None
+        for row in rows:
+            row["Fiyat (Yerel)"] = row.pop(f"Fiyat ({curr})")
+            if f"Eski Fiyat ({curr})" in row:
+                row["Eski Fiyat (Yerel)"] = row.pop(f"Eski Fiyat ({curr})")
+            row.update({"Ülke": country, "Sorgu": query, "Para Birimi": curr, "Tarih": stamp})
+            self._out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._out.flush()
+        os.fsync(self._out.fileno())
+        # Satırlar diske indikten sonra hücre tamamlandı olarak işaretlenir
+        self._done.write(cell_key(country, query) + "\n")
+        self._done.flush()
+        if self.export_format:
+            export(cell_table, self.export_format, self.export_dir, country, query, now.timestamp())
+        if self.store is not None:
+            self.store.record(fresh, country, query, curr, ts=now.timestamp())
+            record_scan(self.store, country, query, scanned, now.timestamp())
+        self.rows_written += len(rows)
+        self.cells_done += 1
+        log.info("%s / %s: %d ürün, %d marka geçmişten (%d/%d hücre)", country, query, len(rows),
+                 len(cell["reuse"]), self.cells_done, self.total)
+        log_trace(log, cell["trace"], country=country, query=query, rows=len(rows), fetched=len(cell["brands"]),
+                  reused=len(cell["reuse"]))
+        REGISTRY.inc("batch_cells_total")
+        REGISTRY.inc("batch_rows_total", len(rows))
+        if self.metrics_path:
+            REGISTRY.write(self.metrics_path)
+
+    def run(self, resume=True):
+        os.makedirs(os.path.dirname(self.out_path) or ".", exist_ok=True)
+        if not resume:
+            for path in (self.out_path, self.out_path + ".done"):
+                if os.path.exists(path):
+                    os.remove(path)
+        done = load_checkpoint(self.out_path)
+        cells = [c for c in expand_cells(self.spec) if cell_key(c[0], c[1]) not in done]
+        self.total = len(cells)
+        log.info("%d hücre taranacak (%d hücre checkpoint'ten atlandı)", len(cells), len(done))
+
+        jobs = []
+        for country, query, brands in cells:
+            stale, reuse = plan(self.store, country, query, brands) if self.incremental else (brands, {})
+            self._pending[(country, query)] = {"order": brands, "brands": stale, "reuse": reuse, "results": {},
+                                               "trace": Trace()}
+            jobs.extend((country, query, brand) for brand in stale)
+
+        with open(self.out_path, "a", encoding="utf-8") as self._out, \
+                open(self.out_path + ".done", "a", encoding="utf-8") as self._done:
+            # Tüm markaları güncel olan hücreler ağa çıkmadan yazılır
+            for key in [k for k, c in self._pending.items() if not c["brands"]]:
+                self._flush(*key, self._pending.pop(key))
+            fan_out(jobs, self._task, max_workers=self.workers, on_done=self._on_done, keep=False)
+        return self.rows_written
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Başsız toplu fiyat taraması")
+    ap.add_argument("matrix", help="JSON matris ya da satır başına bir sorgu içeren metin dosyası")
+    ap.add_argument("--out", default=os.path.join("runs", "results.jsonl"))
+    ap.add_argument("--workers", type=int, default=MAX_CONCURRENCY)
+    ap.add_argument("--method", choices=METHODS, help="matris dosyasındaki yöntemi geçersiz kılar")
+    ap.add_argument("--no-cache", action="store_true", help="yanıt önbelleğini atla")
+    ap.add_argument("--no-store", action="store_true", help="satırları fiyat geçmişine yazma")
+    ap.add_argument("--incremental", action="store_true",
+                    help="yalnızca eskimiş/değişken hücreleri çek, diğerlerini fiyat geçmişinden doldur")
+    ap.add_argument("--fresh", action="store_true", help="checkpoint'i yok say, baştan başla")
+    ap.add_argument("--metrics", help="Prometheus metin dosyası (her hücreden sonra güncellenir)")
+    ap.add_argument("--export", choices=list(FORMATS),
+                    help="her hücreyi ayrıca ülke/sorgu/tarih adlı bir dosyaya yaz (parquet, arrow, csv)")
+    ap.add_argument("--export-dir", default=EXPORT_DIR)
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    spec = load_matrix(args.matrix)
+    if args.method:
+        spec["method"] = args.method
+
+    rates = fetch_rates()
+    if not rates:
+        log.error("Kur verisi alınamadı")
+        return 1
+
+    runner = BatchRunner(spec, args.out, workers=args.workers, use_cache=not args.no_cache, rates=rates,
+                         store=None if args.no_store else default_price_store(), incremental=args.incremental,
+                         metrics_path=args.metrics, export_format=args.export, export_dir=args.export_dir)
+    written = runner.run(resume=not args.fresh)
+    log.info("Toplam %d satır yazıldı: %s", written, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""Streamlit'ten bağımsız ortak ayarlar: site veritabanı, seçiciler ve sağlayıcı uç noktaları."""
+import os
+
+# --- REPLAY / KAYIT ---
+# Ayarlıysa iki sağlayıcı da yerel replay sunucusuna yönlenir (python -m benchmarks.replay_server)
+REPLAY_URL = os.environ.get("REPLAY_URL", "").rstrip("/")
+# Ayarlıysa canlı sağlayıcı yanıtları bu dizine fixture olarak kaydedilir
+RECORD_FIXTURES = os.environ.get("RECORD_FIXTURES", "")
+
+# --- API KEYS ---
+# Replay modunda anahtar gerekmez; sunucu anahtarı yok sayar
+PERPLEXITY_KEY = os.environ.get("PERPLEXITY_API_KEY", "replay" if REPLAY_URL else "")
+SCRAPER_API_KEY = os.environ.get("SCRAPER_API_KEY", "replay" if REPLAY_URL else "")
+
+# --- SAĞLAYICI UÇ NOKTALARI ---
+SCRAPER_API_URL = os.environ.get("SCRAPER_API_URL", REPLAY_URL + "/" if REPLAY_URL else "http://api.scraperapi.com")
+PERPLEXITY_URL = os.environ.get("PERPLEXITY_URL", REPLAY_URL + "/chat/completions" if REPLAY_URL
+                                else "https://api.perplexity.ai/chat/completions")
+
+# --- HTTP KATMANI ---
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "16"))
+# Host başına eşzamanlı istek sınırı; listede olmayan hostlar HTTP_HOST_LIMIT kullanır
+HTTP_HOST_LIMIT = int(os.environ.get("HTTP_HOST_LIMIT", "8"))
+HTTP_HOST_LIMITS = {
+    "api.scraperapi.com": 5,
+    "api.perplexity.ai": 3,
+}
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "3"))
+# İlk yeniden deneme öncesi bekleme (sn); her denemede iki katına çıkar
+HTTP_BACKOFF = float(os.environ.get("HTTP_BACKOFF", "0.5"))
+# Yeniden denemeler dahil tek çağrının toplam süre bütçesi (sn)
+HTTP_TIMEOUT_BUDGET = float(os.environ.get("HTTP_TIMEOUT_BUDGET", "150"))
+
+# --- URL DATABASE ---
+URL_DB = {
+    "Bulgaristan": { 
+        "Pepco": {"base": "https://pepco.bg/", "search": "bg-bg/search?q={query}"}, 
+        "Sinsay": {"base": "https://www.sinsay.com/bg/bg/", "search": "search?q={query}"}, 
+        "Zara Home": {"base": "https://www.zarahome.com/bg/", "search": "search?searchTerm={query}"}, 
+        "H&M Home": {"base": "https://www2.hm.com/bg_bg/", "search": "search?q={query}"}, 
+        "Jysk": {"base": "https://jysk.bg/", "search": "search?query={query}"}, 
+        "English Home": {"base": "https://englishhome.bg/", "search": "arama?q={query}"}
+    },
+    "Bosna Hersek": { 
+        "Pepco": {"base": "https://pepco.ba/", "search": "ba-ba/search?q={query}"}, 
+        "Sinsay": {"base": "https://www.sinsay.com/ba/bs/", "search": "search?q={query}"}, 
+        "Zara Home": {"base": "https://www.zarahome.com/ba/", "search": "search?searchTerm={query}"}, 
+        "Jysk": {"base": "https://jysk.ba/", "search": "search?query={query}"}, 
+        "English Home": {"base": "https://englishhome.ba/", "search": "arama?q={query}"}
+    },
+    "Sırbistan": { 
+        "Pepco": {"base": "https://pepco.rs/", "search": "rs-sr/search?q={query}"}, 
+        "Sinsay": {"base": "https://www.sinsay.com/rs/sr/", "search": "search?q={query}"}, 
+        "Zara Home": {"base": "https://www.zarahome.com/rs/", "search": "search?searchTerm={query}"}, 
+        "Jysk": {"base": "https://jysk.rs/", "search": "search?query={query}"}, 
+        "English Home": {"base": "https://englishhome.rs/", "search": "arama?q={query}"}
+    },
+}
+
+# --- SITE SELECTORS ---
+SITE_SELECTORS = {
+    "Pepco": {
+        "product": ["div.product-tile", "div[class*='product']"],
+        "name": ["h3.product-tile-name", "a.product-tile-link", "h3", "h2"],
+        "price": ["span.product-tile-price-value", "span[class*='price']", ".price"]
+    },
+    "Sinsay": {
+        "product": ["article.product", "div.product-tile", "div[class*='product']"],
+        "name": ["h2.product-name", "h3.product-title", "a.product-link"],
+        "price": ["span.price", "span[class*='price']", ".price"]
+    },
+    "Zara Home": {
+        "product": ["li.product-grid-item", "div.product-grid-product", "article"],
+        "name": ["a.product-link", "h2.product-detail-info__header-name"],
+        "price": ["span.price-current__amount", "span.money-amount__main"]
+    },
+}
+
+# Ürün detay sayfası seçicileri (zenginleştirme); JSON-LD ve metin regex'lerinden sonra denenir
+DETAIL_SELECTORS = {
+    "Pepco": {
+        "old_price": ["span.product-price-old", "s[class*='price']", "del"],
+        "material": ["div.product-composition", "li[class*='material']"],
+        "size": ["div.product-dimensions", "li[class*='size']"],
+    },
+    "Sinsay": {
+        "old_price": ["span.price-old", "s.price", "del"],
+        "material": ["section.composition", "div[class*='composition']"],
+        "size": ["span.size-label", "div[class*='dimension']"],
+    },
+    "Zara Home": {
+        "old_price": ["span.price-old__amount", "del.price-amount"],
+        "material": ["div.product-detail-composition", "ul.structured-component-text-block-list"],
+        "size": ["div.product-detail-size-info", "span.product-size-info__main-label"],
+    },
+}
+# Detay sayfasında ürünün kendi bloğu; paket adedi yalnızca burada aranır (öneri/karusel
+# kartları hariç). Hiçbiri yoksa <h1> başlığının üst öğesi kullanılır.
+PRODUCT_NODE_SELECTORS = ["[itemtype*='schema.org/Product']", "[class*='product-detail']", "[class*='product-info']",
+                          "[class*='product-description']", "[class*='specification']"]
+
+COUNTRIES_META = {
+    "Bulgaristan":  {"curr": "BGN", "lang": "bg"},
+    "Bosna Hersek": {"curr": "BAM", "lang": "bs"},
+    "Sırbistan":    {"curr": "RSD", "lang": "sr"},
+}
+
+BRANDS = ["Pepco", "Sinsay", "Zara Home", "H&M Home", "Jysk", "English Home"]
+
+# --- PARALEL TARAMA ---
+# Aynı anda taranacak marka sayısı
+MAX_CONCURRENCY = int(os.environ.get("SCAN_CONCURRENCY", "4"))
+
+# Sağlayıcı başına saniyedeki istek limiti (eski global time.sleep(2) yerine)
+RATE_LIMITS = {
+    "scraperapi": 2.0,
+    "perplexity": 1.0,
+}
+
+# --- SAYFALAMA ---
+# Arama yoluna eklenecek sayfa parametresi ve ilk sayfanın indeksi ("search" yolu 1. sayfadır).
+# Burada olmayan markalar (ör. sonsuz kaydırmalı Zara Home) tek sayfa taranır.
+PAGINATION = {
+    "Pepco": {"param": "&page={page}", "first": 1},
+    "Sinsay": {"param": "&page={page}", "first": 1},
+    "H&M Home": {"param": "&page={page}", "first": 1},
+    "Jysk": {"param": "&page={page}", "first": 0},
+    "English Home": {"param": "&page={page}", "first": 1},
+}
+# Marka başına en fazla taranacak sayfa; PAGINATION'daki "depth" bunu geçersiz kılar,
+# istenen derinlik (arayüz/batch `max_pages`) ise "depth"i aşamaz
+MAX_PAGES = int(os.environ.get("MAX_PAGES", "5"))
+# Bir markanın aynı anda çekilen sayfa sayısı
+PAGE_WINDOW = int(os.environ.get("PAGE_WINDOW", "3"))
+
+# --- DETAY ZENGİNLEŞTİRME ---
+# Aynı anda çekilen detay sayfası sayısı ve tarama başına en fazla zenginleştirilecek ürün
+ENRICH_CONCURRENCY = int(os.environ.get("ENRICH_CONCURRENCY", "4"))
+ENRICH_MAX_URLS = int(os.environ.get("ENRICH_MAX_URLS", "60"))
+
+# --- TEKİLLEŞTİRME ---
+# Aynı markada farklı kaynaklardan iki adın aynı ürün sayılması için gereken 3-gram Jaccard benzerliği
+DEDUP_THRESHOLD = float(os.environ.get("DEDUP_THRESHOLD", "0.5"))
+
+# --- HYBRID (HEDGED) ---
+# Hybrid'de ScraperAPI başladıktan kaç sn sonra Perplexity de başlatılır (0: aynı anda)
+HEDGE_DELAY = float(os.environ.get("HEDGE_DELAY", "15"))
+# Bir sonucun kazanan sayılması için gereken en az ürün sayısı
+HYBRID_MIN_PRODUCTS = 3
+
+# --- SAĞLAYICI SAĞLIĞI ---
+HEALTH_PATH = os.environ.get("HEALTH_PATH", os.path.join(".cache", "health.sqlite3"))
+# (marka, ülke, sağlayıcı) başına tutulan son sonuç sayısı
+HEALTH_WINDOW = 20
+# Diskteki sonuç kayıtlarının saklanma süresi (sn); daha eskileri silinir
+HEALTH_RETENTION = int(os.environ.get("HEALTH_RETENTION", str(7 * 24 * 3600)))
+# Art arda bu kadar başarısız çağrıda devre açılır ve sağlayıcı bekleme süresince atlanır (sn)
+BREAKER_FAILURES = 3
+BREAKER_COOLDOWN = int(os.environ.get("BREAKER_COOLDOWN", str(30 * 60)))
+
+# --- YANIT ÖNBELLEĞİ ---
+RESPONSE_CACHE_PATH = os.environ.get("RESPONSE_CACHE_PATH", os.path.join(".cache", "responses.sqlite3"))
+RESPONSE_CACHE_MAX_MB = int(os.environ.get("RESPONSE_CACHE_MAX_MB", "200"))
+# Varsayılan TTL (sn); stoğu/fiyatı sık değişen markalar için ayrıca kısaltılabilir
+RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", str(6 * 3600)))
+RESPONSE_CACHE_TTL_BY_BRAND = {
+    "Sinsay": 3 * 3600,
+    "Zara Home": 12 * 3600,
+}
+
+# --- KUR ---
+FX_URL = os.environ.get("FX_URL", "https://api.exchangerate-api.com/v4/latest/TRY")
+FX_PATH = os.environ.get("FX_PATH", os.path.join("data", "fx.sqlite3"))
+# Son kaydedilen set bundan yeniyse (sn) kaynağa gidilmez
+FX_MAX_AGE = int(os.environ.get("FX_MAX_AGE", "3600"))
+# Sabit kurlu paralar: para → (bağlı olduğu para, 1 bağlı para kaç birim)
+FX_PEGS = {
+    "BAM": ("EUR", 1.95583),
+}
+
+# --- FİYAT GEÇMİŞİ ---
+PRICE_STORE_PATH = os.environ.get("PRICE_STORE_PATH", os.path.join("data", "prices.sqlite3"))
+
+# --- DIŞA AKTARIM ---
+EXPORT_DIR = os.environ.get("EXPORT_DIR", "exports")
+# Parça parça CSV yazımında bir blokta çevrilen satır sayısı
+CSV_CHUNK_ROWS = int(os.environ.get("CSV_CHUNK_ROWS", "50000"))
+
+# --- ZAMANLANMIŞ TARAMA ---
+SCHEDULER_PATH = os.environ.get("SCHEDULER_PATH", os.path.join("data", "scheduler.sqlite3"))
+SCHEDULER_RUNS_DIR = os.environ.get("SCHEDULER_RUNS_DIR", os.path.join("runs", "scheduled"))
+# Aynı anda çalışan iş sayısı (her iş kendi içinde MAX_CONCURRENCY marka tarar)
+SCHEDULER_WORKERS = int(os.environ.get("SCHEDULER_WORKERS", "2"))
+# Vadesi gelen tanımların kontrol aralığı (sn)
+SCHEDULER_POLL = float(os.environ.get("SCHEDULER_POLL", "30"))
+# Sağlayıcı başına günlük (UTC) ücretli istek kotası; detay sayfaları ScraperAPI kotasından düşer
+SCHEDULER_QUOTAS = {
+    "scraperapi": int(os.environ.get("SCRAPERAPI_DAILY_QUOTA", "3000")),
+    "perplexity": int(os.environ.get("PERPLEXITY_DAILY_QUOTA", "300")),
+}
+
+# --- ARTIMLI TARAMA ---
+# Son başarılı taraması bundan eski (sn) hücreler yeniden çekilir
+INCREMENTAL_MAX_AGE = int(os.environ.get("INCREMENTAL_MAX_AGE", str(12 * 3600)))
+# Fiyatı/stoğu sık değiştiği bilinen, her taramada yeniden çekilen markalar
+VOLATILE_BRANDS = {"Sinsay"}
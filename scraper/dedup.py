@@ -0,0 +1,175 @@
+"""Kaynaklar arası ürün tekilleştirme: kanonik URL + MinHash/LSH ile yakın kopya kümeleri.
+
+Aynı ürün ScraperAPI ve Perplexity'den, farklı sayfalardan ya da izleme
+parametreli linklerle birden çok kez gelebilir. Marka içinde:
+
+1. Kanonik URL'si (şema/host küçük harf, "www." ve izleme parametreleri atılmış,
+   sondaki "/" kırpılmış) aynı olan satırlar birleşir.
+2. Normalize adların (Kiril → Latin, aksansız) karakter 3-gram'larından MinHash
+   imzası çıkarılır; LSH bantlarında çakışan farklı kaynaklı adaylar gerçek
+   Jaccard benzerliği `DEDUP_THRESHOLD` üstündeyse ve adlardaki sayılar (ölçü,
+   adet) aynıysa bire bir eşlenir.
+
+Bant gruplama ile karşılaştırma yalnızca aday çiftlerde yapılır; maliyet satır
+sayısında yaklaşık doğrusaldır. Her kümeden kaynak önceliği en yüksek satır kalır,
+"Kaynaklar" ve "Birleşen" sütunları kümenin kökenini taşır.
+"""
+import re
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+import pandas as pd
+
+from .config import DEDUP_THRESHOLD
+from .relevance import _normalize_series
+
+# Kanonik satır seçiminde kaynak önceliği (küçük önce)
+SOURCE_PRIORITY = {"SCRAPERAPI": 0, "PERPLEXITY": 1}
+
+_TRACKING = re.compile(r"^(utm_\w+|gclid|fbclid|yclid|srsltid|ref|referrer|source|_ga|mc_\w+)$", re.IGNORECASE)
+_DIGITS = re.compile(r"\d+")
+_SPACE = re.compile(r"[\W_]+")
+
+_PRIME = np.uint64((1 << 61) - 1)
+_NUM_PERM = 32
+_BANDS = 8
+_rng = np.random.default_rng(20240611)
+_A = _rng.integers(1, 1 << 31, size=_NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 31, size=_NUM_PERM, dtype=np.uint64)
+
+
+def canonical_url(url):
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not _TRACKING.match(k)))
+    return urlunsplit((parts.scheme.lower() or "https", host, parts.path.rstrip("/"), query, ""))
+
+
+def fingerprints(names):
+    """Her ad için (3-gram kümesi, sayı anahtarı)."""
+    out = []
+    for norm in _normalize_series(names):
+        compact = _SPACE.sub(" ", norm).strip()
+        grams = {compact[i:i + 3] for i in range(max(1, len(compact) - 2))}
+        out.append((grams, tuple(sorted(_DIGITS.findall(norm)))))
+    return out
+
+
+def minhash(shingle_sets, chunk=4096):
+    """(n, _NUM_PERM) MinHash imza matrisi.
+
+    Her benzersiz 3-gram bir kez hashlenip permüte edilir; satır minimumları
+    `chunk` satırlık bloklarda alınır ki ara matris bellekte büyümesin.
+    """
+    n = len(shingle_sets)
+    sig = np.zeros((n, _NUM_PERM), dtype=np.uint64)
+    if not n:
+        return sig
+    lengths = np.array([len(s) for s in shingle_sets])
+    codes, uniques = pd.factorize(pd.Series([g for s in shingle_sets for g in s], dtype="object"))
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in uniques), dtype=np.uint64, count=len(uniques))
+    permuted = (hashes[:, None] * _A + _B) % _PRIME
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    for lo in range(0, n, chunk):
+        hi = min(n, lo + chunk)
+        block = permuted[codes[starts[lo]:ends[hi - 1]]]
+        sig[lo:hi] = np.minimum.reduceat(block, starts[lo:hi] - starts[lo], axis=0)
+    return sig
+
+
+def cluster(brands, names, urls, sources, threshold=DEDUP_THRESHOLD):
+    """Her satır için küme kökünün indeksi (numpy dizisi).
+
+    Ad benzerliği yalnızca farklı kaynaklardan gelen satırları birleştirir ve
+    eşleşme bire birdir: en benzer çiftten başlanır, bir küme aynı kaynaktan
+    ikinci bir satır alamaz. Böylece aynı sitedeki renk/desen varyantları
+    birbirine karışmaz; aynı kaynaktaki kopyalar yalnızca kanonik URL ile birleşir.
+    """
+    n = len(names)
+    parent = np.arange(n)
+    members_of = [{s} for s in sources]
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            keep, drop = min(ri, rj), max(ri, rj)
+            parent[drop] = keep
+            members_of[keep] |= members_of[drop]
+
+    seen = {}
+    for i, (brand, url) in enumerate(zip(brands, urls)):
+        key = canonical_url(url)
+        if key:
+            if (brand, key) in seen:
+                union(seen[(brand, key)], i)
+            else:
+                seen[(brand, key)] = i
+
+    prints = fingerprints(names)
+    sig = minhash([grams for grams, _ in prints])
+    rows_per_band = _NUM_PERM // _BANDS
+    candidates = {}
+    for band in range(_BANDS):
+        buckets = {}
+        block = np.ascontiguousarray(sig[:, band * rows_per_band:(band + 1) * rows_per_band])
+        for i, key in enumerate(block.view(f"V{block.dtype.itemsize * rows_per_band}").ravel()):
+            # Sayıları (ölçü, adet) farklı adlar birleşmez; aynı kovaya da girmezler
+            buckets.setdefault((brands[i], prints[i][1], key.tobytes()), []).append(i)
+        for members in buckets.values():
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    i, j = members[a], members[b]
+                    if sources[i] == sources[j] or (i, j) in candidates:
+                        continue
+                    gi, gj = prints[i][0], prints[j][0]
+                    candidates[(i, j)] = len(gi & gj) / len(gi | gj)
+
+    for (i, j), sim in sorted(candidates.items(), key=lambda kv: -kv[1]):
+        if sim < threshold:
+            break
+        ri, rj = find(i), find(j)
+        if ri != rj and not members_of[ri] & members_of[rj]:
+            union(ri, rj)
+    return np.array([find(i) for i in range(n)])
+
+
+def _origins(row):
+    return row.get("Kaynaklar") or row["Kaynak"]
+
+
+def dedupe_rows(rows, threshold=DEDUP_THRESHOLD):
+    """Sonuç satırlarını (dict) tekilleştirir; ilk görülme sırası korunur.
+
+    Daha önce tekilleştirilmiş satırlar da verilebilir (ör. taze + geçmiş
+    satırlar): "Kaynaklar" birleştirilir, "Birleşen" toplanır.
+    """
+    if len(rows) < 2:
+        for row in rows:
+            row.update({"Kaynaklar": _origins(row), "Birleşen": row.get("Birleşen") or 1})
+        return rows
+    roots = cluster([r["Marka"] for r in rows], [r["Ürün Yerel"] for r in rows], [r.get("Link") for r in rows],
+                    [r["Kaynak"] for r in rows], threshold)
+    groups = {}
+    for i, root in enumerate(roots):
+        groups.setdefault(root, []).append(i)
+    out = []
+    for root in sorted(groups):
+        members = groups[root]
+        best = min(members, key=lambda i: (SOURCE_PRIORITY.get(rows[i]["Kaynak"], 9), not rows[i].get("Link"), i))
+        row = rows[best]
+        row["Kaynaklar"] = ", ".join(dict.fromkeys(s for i in members for s in _origins(rows[i]).split(", ")))
+        row["Birleşen"] = sum(rows[i].get("Birleşen") or 1 for i in members)
+        out.append(row)
+    return out
@@ -0,0 +1,185 @@
+"""Ürün detay sayfalarından ek alanlar: ölçü, malzeme, paket adedi ve eski fiyat.
+
+Arama kartları yalnızca isim/fiyat/link verir. Bu aşama, sonuç satırlarındaki
+linkleri ScraperAPI ile sınırlı sayıda iş parçacığında çeker ve sırasıyla
+JSON-LD (`schema.org/Product`), marka bazlı `DETAIL_SELECTORS` ve sayfa metni
+üzerindeki regex'lerle alanları doldurur. Ayrıştırılmış sonuç yanıt önbelleğine
+"detail" sağlayıcısı olarak yazılır; TTL içinde aynı link yeniden çekilmez.
+"""
+import json
+import logging
+import re
+
+import lxml.html
+
+from . import config
+from .config import DETAIL_SELECTORS, ENRICH_CONCURRENCY, ENRICH_MAX_URLS, PRODUCT_NODE_SELECTORS
+from .extraction import _VISIBLE_TEXT, _compile, _text, parse_html
+from .fanout import fan_out
+from .fixtures import default_recorder
+from .pricing import clean_price
+from .response_cache import default_response_cache
+from .telemetry import REGISTRY, span
+from .transport import default_transport
+from .units import add_unit_columns
+
+log = logging.getLogger(__name__)
+
+FIELDS = ("size", "material", "pack", "old_price")
+
+# Sınırlı: "SKU1234x5" ya da "50x90cmx" gibi daha uzun bir sözcüğün parçası eşleşmez
+_SIZE = re.compile(r"(?<![\w.,])(\d+(?:[.,]\d+)?)\s*[x×хX]\s*(\d+(?:[.,]\d+)?)(?:\s*[x×хX]\s*(\d+(?:[.,]\d+)?))?"
+                   r"\s*(cm|см|mm|мм)?(?!\w)")
+_PACK = re.compile(r"(\d+)\s*(?:-\s*)?(?:бр\b\.?|броя|pcs\b|pc\b|kom\b\.?|komada|kos\b|шт\b|pack\b|adet\b|parça\b)",
+                   re.IGNORECASE)
+_MATERIAL = re.compile(r"\d{1,3}\s*%\s*[^\W\d_]+(?:\s+[^\W\d_]+)?")
+_PRODUCT_NODE = [_compile(s, "descendant::") for s in PRODUCT_NODE_SELECTORS]
+
+_selectors = {
+    brand: {field: [_compile(s, "descendant::") for s in chain] for field, chain in fields.items()}
+    for brand, fields in DETAIL_SELECTORS.items()
+}
+
+
+def _json_ld(root):
+    """Sayfadaki ilk schema.org Product nesnesinden alanlar."""
+    for script in root.xpath('//script[@type="application/ld+json"]/text()'):
+        try:
+            data = json.loads(script)
+        except ValueError:
+            continue
+        for node in data if isinstance(data, list) else data.get("@graph", [data]):
+            if isinstance(node, dict) and node.get("@type") == "Product":
+                out = {"material": node.get("material"), "size": node.get("size")}
+                for prop in node.get("additionalProperty") or []:
+                    name = str(prop.get("name", "")).lower()
+                    if re.search(r"materi|матери|sastav|състав", name):
+                        out["material"] = out["material"] or prop.get("value")
+                    elif re.search(r"size|dimen|размер|veli[cč]in", name):
+                        out["size"] = out["size"] or prop.get("value")
+                return {k: str(v) for k, v in out.items() if v}
+    return {}
+
+
+def _product_node(root):
+    """Ürünün kendi bloğu: `PRODUCT_NODE_SELECTORS`, yoksa <h1>'in üst öğesi; hiçbiri yoksa boş öğe."""
+    for xpath in _PRODUCT_NODE:
+        found = xpath(root)
+        if found:
+            return found[0]
+    title = root.xpath("//h1")
+    if title and title[0].getparent() is not None:
+        return title[0].getparent()
+    return lxml.html.Element("div")
+
+
+def parse_detail(brand, html, currency_code):
+    """Detay HTML'inden {size, material, pack, old_price}; bulunamayan alanlar None."""
+    out = dict.fromkeys(FIELDS)
+    root = parse_html(html)
+    if root is None:
+        return out
+    out.update(_json_ld(root))
+    raw_old = None
+    for field, chain in _selectors.get(brand, {}).items():
+        for xpath in chain:
+            found = xpath(root)
+            if found:
+                value = _text(found[0])
+                if field == "old_price":
+                    raw_old = value
+                elif not out.get(field):
+                    out[field] = value
+                break
+    if raw_old:
+        out["old_price"] = clean_price(raw_old, currency_code) or None
+
+    main = root.xpath("//main") or root.xpath("//body") or [root]
+    text = " ".join(_VISIBLE_TEXT(main[0]))
+    if not out["size"]:
+        m = _SIZE.search(text)
+        if m:
+            out["size"] = "x".join(g for g in m.groups()[:3] if g) + (f" {m.group(4)}" if m.group(4) else "")
+    if not out["material"]:
+        found = _MATERIAL.findall(text)
+        if found:
+            out["material"] = ", ".join(dict.fromkeys(" ".join(f.split()) for f in found))
+    # Paket adedi sayfanın tamamında değil yalnızca ürün bloğunda aranır
+    m = _PACK.search(" ".join(_VISIBLE_TEXT(_product_node(root))))
+    if m:
+        out["pack"] = int(m.group(1))
+    return out
+
+
+def fetch_detail(brand, url, currency_code, api_key=None, use_cache=True, limiter=None, cancel=None):
+    """Tek ürünün detayları; önbellekte varsa ağa çıkmaz. Hata durumunda None."""
+    api_key = api_key or config.SCRAPER_API_KEY
+    cache = default_response_cache() if use_cache else None
+    request = {"url": url, "render": "true", "country_code": "bg"}
+    cached = cache.get("detail", brand, request) if cache else None
+    if cached is not None:
+        return json.loads(cached)
+    if limiter is not None:
+        with span("rate_limit", brand):
+            limiter.acquire()
+    with span("network.detail", brand):
+        response = default_transport().get(config.SCRAPER_API_URL, params={"api_key": api_key, **request},
+                                           timeout=90, cancel=cancel)
+    REGISTRY.inc("provider_requests_total", provider="detail", status=response.status_code)
+    if response.status_code != 200:
+        log.warning("%s detay HTTP %s: %s", brand, response.status_code, url)
+        return None
+    recorder = default_recorder()
+    if recorder:
+        recorder.save("scraperapi", request, response.text,
+                      content_type=response.headers.get("Content-Type", "text/html"))
+    with span("parse", brand, provider="detail"):
+        detail = parse_detail(brand, response.text, currency_code)
+    if cache:
+        cache.put("detail", brand, request, json.dumps(detail, ensure_ascii=False))
+    return detail
+
+
+def detail_targets(rows, max_urls=ENRICH_MAX_URLS):
+    """Zenginleştirilecek [(marka, link)]; tekil ve satır sırasıyla, en fazla `max_urls`."""
+    seen = {}
+    for row in rows:
+        url = row.get("Link") or ""
+        if url.startswith("http") and url not in seen:
+            seen[url] = row["Marka"]
+    return [(brand, url) for url, brand in seen.items()][:max_urls]
+
+
+def enrich(targets, currency_code, api_key=None, use_cache=True, limiter=None, workers=ENRICH_CONCURRENCY,
+           on_done=None):
+    """{link: detay} döner. `on_done((marka, link), detay, hata)` her sayfadan sonra çağıran iş parçacığında çağrılır."""
+    details = {}
+
+    def done(item, detail, error):
+        if detail is not None:
+            details[item[1]] = detail
+        elif error is not None:
+            log.warning("%s detay hatası: %s", item[0], str(error)[:80])
+        if on_done:
+            on_done(item, detail, error)
+
+    fan_out(targets, lambda item: fetch_detail(item[0], item[1], currency_code, api_key, use_cache, limiter),
+            max_workers=workers, on_done=done, keep=False)
+    return details
+
+
+def apply_details(rows, details, currency_code):
+    """Satırlara ek sütunları ekler (detayı olmayanlarda None); yeni liste döner."""
+    old_col = f"Eski Fiyat ({currency_code})"
+    out = []
+    for row in rows:
+        d = details.get(row.get("Link")) or {}
+        price = row.get(f"Fiyat ({currency_code})")
+        old = d.get("old_price")
+        discount = None
+        if old and price and old > price:
+            discount = round((old - price) / old * 100, 1)
+        out.append({**row, "Ölçü": d.get("size"), "Malzeme": d.get("material"), "Paket": d.get("pack"),
+                    old_col: old, "İndirim %": discount})
+    # Detaydaki paket adedi/ölçü birim fiyatları düzeltebilir
+    return add_unit_columns(out)
@@ -0,0 +1,131 @@
+"""Sonuç tablolarının dışa aktarımı: Parquet, Arrow IPC ve parça parça CSV.
+
+`ResultTable` parçaları sırayla yazılır; tüm tablo tek DataFrame'e ya da
+belleğe tek CSV metni olarak çevrilmez:
+
+- Parquet: her parça bir row group; kategorik sütunlar (ülke, marka, para
+  birimi, kaynak) sözlük kodlu, metin ve sayılar zstd sıkıştırmalı
+- Arrow IPC (Feather v2): her parça bir record batch; `load` bellek eşlemesiyle
+  (memory map) okur
+- CSV: `CSV_CHUNK_ROWS` satırlık bloklar hâlinde UTF-8 BOM'lu (Excel uyumlu);
+  başlıklar arayüzdeki Türkçe başlıklardır
+
+Dosya adları ülke, sorgu ve tarihten üretilir (`file_name`). Boyut ve yükleme
+süresi karşılaştırması: `python -m benchmarks.bench_export`.
+"""
+import codecs
+import io
+import os
+import re
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from .config import CSV_CHUNK_ROWS
+from .relevance import normalize
+from .results import SCHEMA, ResultTable, unified_chunks
+
+FORMATS = {
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "arrow": ("arrow", "application/vnd.apache.arrow.file"),
+    "csv": ("csv", "text/csv"),
+}
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", normalize(str(text).replace("ı", "i"))).strip("-") or "x"
+
+
+def file_name(country, query, ts, fmt):
+    """"lcw_<ülke>_<sorgu>_<YYYY-MM-DD>.<uzantı>"; ülke/sorgu None ise "tum"."""
+    day = datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+    parts = [_slug(country) if country else "tum", _slug(query) if query else "tum", day]
+    return "lcw_" + "_".join(parts) + "." + FORMATS[fmt][0]
+
+
+def arrow_schema():
+    """SCHEMA'nın Arrow karşılığı (kategoriler sözlük kodlu)."""
+    empty = ResultTable().frame()
+    return pa.Schema.from_pandas(empty, preserve_index=False).remove_metadata()
+
+
+def _batches(table, schema):
+    for chunk in unified_chunks(table.chunks):
+        yield pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+
+def write_parquet(table, sink):
+    schema = arrow_schema()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in _batches(table, schema):
+            writer.write_table(batch)
+
+
+def write_arrow(table, sink):
+    # Sıkıştırmasız: okurken bellek eşlemesi kopyasız kalır
+    schema = arrow_schema()
+    with pa.ipc.new_file(sink, schema) as writer:
+        for batch in _batches(table, schema):
+            writer.write_table(batch)
+
+
+def _csv_labels(table):
+    currencies = {c for chunk in table.chunks for c in chunk["currency"].dropna().unique()}
+    curr = currencies.pop() if len(currencies) == 1 else "Yerel"
+    return {column: label.format(curr=curr) for column, (_, label) in SCHEMA.items()}
+
+
+def iter_csv(table, chunk_rows=CSV_CHUNK_ROWS):
+    """CSV'yi bayt blokları olarak üretir; ilk blok BOM ve başlık satırını içerir."""
+    labels = _csv_labels(table)
+    header = True
+    yield codecs.BOM_UTF8
+    for chunk in table.chunks or [table.frame()]:
+        for start in range(0, max(len(chunk), 1), chunk_rows):
+            part = chunk.iloc[start:start + chunk_rows]
+            if "ts" in part:
+                part = part.assign(ts=pd.to_datetime(part["ts"], unit="s", utc=True).dt.strftime("%Y-%m-%dT%H:%M:%S"))
+            yield part.rename(columns=labels).to_csv(index=False, header=header).encode("utf-8")
+            header = False
+
+
+def write_csv(table, sink, chunk_rows=CSV_CHUNK_ROWS):
+    for block in iter_csv(table, chunk_rows):
+        sink.write(block)
+
+
+_WRITERS = {"parquet": write_parquet, "arrow": write_arrow, "csv": write_csv}
+
+
+def export(table, fmt, directory, country=None, query=None, ts=None):
+    """Tabloyu `directory` altına ülke/sorgu/tarih adlı dosyaya yazar; dosya yolunu döner.
+
+    Dosya önce geçici adla yazılır, tamamlanınca yerine taşınır.
+    """
+    ts = datetime.now(timezone.utc).timestamp() if ts is None else ts
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, file_name(country, query, ts, fmt))
+    tmp = path + ".part"
+    with open(tmp, "wb") as f:
+        _WRITERS[fmt](table, f)
+    os.replace(tmp, path)
+    return path
+
+
+def to_bytes(table, fmt):
+    """İndirme düğmesi için dosya içeriği."""
+    buf = io.BytesIO()
+    _WRITERS[fmt](table, buf)
+    return buf.getvalue()
+
+
+def load(path):
+    """Dışa aktarılmış dosyayı okur; Parquet/Arrow SCHEMA tiplerini, CSV Türkçe başlıkları korur."""
+    if path.endswith(".parquet"):
+        return pq.read_table(path).to_pandas()
+    if path.endswith(".arrow"):
+        return feather.read_table(path, memory_map=True).to_pandas()
+    return pd.read_csv(path, encoding="utf-8-sig")
@@ -0,0 +1,131 @@
+"""lxml tabanlı ürün kartı çıkarıcı.
+
+Her markanın SITE_SELECTORS zincirleri bir kez XPath'e derlenir; sayfa lxml ile
+ayrıştırılır ve tüm kartlardan isim/fiyat/link tek geçişte okunur. Bir alan için
+hangi yedek seçicinin kazandığı marka bazında hatırlanır ve sonraki denemede
+önce o seçici denenir.
+"""
+import re
+import threading
+
+import lxml.html
+from cssselect import HTMLTranslator
+from lxml import etree
+
+from .config import SITE_SELECTORS
+
+_translator = HTMLTranslator()
+
+
+def _compile(selector, prefix):
+    return etree.XPath(_translator.css_to_xpath(selector, prefix=prefix))
+
+
+# BeautifulSoup get_text'in atladığı metinler: script/style/template içeriği, ruby okunuşu, yorumlar
+_VISIBLE_TEXT = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template"
+                            " or ancestor::rt or ancestor::rp)]")
+
+
+# lxml, kodlama bildirimi içeren str girdiyi reddeder (BeautifulSoup kabul ediyordu)
+_XML_DECL = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+def parse_html(html):
+    """HTML (str ya da bytes) → lxml kökü; boş/ayrıştırılamayan belgede None."""
+    if isinstance(html, str):
+        html = _XML_DECL.sub("", html, count=1)
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.fromstring(html)
+    except etree.ParserError:
+        return None
+
+
+def _text(elem):
+    # BeautifulSoup get_text(strip=True) ile aynı: her parça kırpılıp birleştirilir
+    return "".join(t.strip() for t in _VISIBLE_TEXT(elem))
+
+
+class BrandExtractor:
+    """Bir markanın derlenmiş seçici zincirleri ve kazanan seçici hafızası."""
+
+    def __init__(self, brand, selectors):
+        self.brand = brand
+        self._lock = threading.Lock()
+        self.chains = {
+            "product": [(s, _compile(s, "descendant-or-self::")) for s in selectors["product"]],
+            "name": [(s, _compile(s, "descendant::")) for s in selectors["name"]],
+            "price": [(s, _compile(s, "descendant::")) for s in selectors["price"]],
+        }
+        self._link = _compile("a", "descendant::")
+
+    def winners(self):
+        """Her alan için şu an ilk denenen seçici."""
+        return {field: chain[0][0] for field, chain in self.chains.items()}
+
+    def _promote(self, field, selector):
+        with self._lock:
+            chain = self.chains[field]
+            index = next((i for i, (s, _) in enumerate(chain) if s == selector), 0)
+            if index:
+                chain.insert(0, chain.pop(index))
+
+    @staticmethod
+    def _first(node, chain):
+        for selector, xpath in chain:
+            found = xpath(node)
+            if found:
+                return found, selector
+        return None, None
+
+    def extract(self, html, base_url="", limit=20):
+        """HTML'den [{"name", "price", "url"}] listesi döner."""
+        root = parse_html(html)
+        if root is None:
+            return []
+        chains = {field: list(chain) for field, chain in self.chains.items()}
+
+        cards, won = self._first(root, chains["product"])
+        if not cards:
+            return []
+        self._promote("product", won)
+
+        products = []
+        name_wins, price_wins = {}, {}
+        for card in cards[:limit]:
+            names, i = self._first(card, chains["name"])
+            prices, j = self._first(card, chains["price"])
+            name = _text(names[0]) if names else None
+            price = _text(prices[0]) if prices else None
+            if not (name and price):
+                continue
+            name_wins[i] = name_wins.get(i, 0) + 1
+            price_wins[j] = price_wins.get(j, 0) + 1
+
+            links = self._link(card)
+            link = links[0].get("href", "") if links else ""
+            if link and not link.startswith("http"):
+                link = base_url.rstrip("/") + "/" + link.lstrip("/")
+            products.append({"name": name, "price": price, "url": link})
+
+        # En çok kazanan yedek seçici bir sonraki sayfada ilk sıraya geçer
+        if name_wins:
+            self._promote("name", max(name_wins, key=name_wins.get))
+        if price_wins:
+            self._promote("price", max(price_wins, key=price_wins.get))
+        return products
+
+
+# Seçiciler modül yüklenirken bir kez derlenir
+_extractors = {brand: BrandExtractor(brand, sel) for brand, sel in SITE_SELECTORS.items()}
+
+
+def get_extractor(brand):
+    """Marka için süreç boyunca paylaşılan çıkarıcı."""
+    return _extractors.get(brand)
+
+
+def extract_products(brand, html, base_url="", limit=20):
+    extractor = get_extractor(brand)
+    return extractor.extract(html, base_url, limit) if extractor else []
@@ -0,0 +1,89 @@
+"""Markaları paralel tarayan fan-out motoru ve sağlayıcı bazlı hız limitleyici."""
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .config import MAX_CONCURRENCY, RATE_LIMITS
+from .telemetry import span
+
+
+class RateLimiter:
+    """Token bucket: saniyede `rate` istek, en fazla `burst` kadar anlık patlama."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def build_limiters(limits=None):
+    """{sağlayıcı: istek/sn} sözlüğünden limitleyiciler üretir."""
+    limits = RATE_LIMITS if limits is None else limits
+    return {name: RateLimiter(rate) for name, rate in limits.items()}
+
+
+def throttled(limiter, fn):
+    """`fn` çağrısını limitleyiciden token alarak yapan sarmalayıcı."""
+    if limiter is None:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        with span("rate_limit", args[0] if args else None):
+            limiter.acquire()
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def fan_out(items, task, max_workers=MAX_CONCURRENCY, on_done=None, keep=True, on_tick=None, tick=0.5):
+    """`task(item)` çağrılarını en fazla `max_workers` eşzamanlı iş parçacığında çalıştırır.
+
+    Sonuçlar `items` sırasıyla (item, sonuç, hata) üçlüleri olarak döner; böylece
+    tamamlanma sırası ne olursa olsun birleştirme deterministiktir. `on_done`
+    verilirse her iş bittiğinde çağıran iş parçacığında (item, sonuç, hata) ile
+    çağrılır — Streamlit ilerleme çubuğu gibi UI güncellemeleri için güvenlidir.
+    `keep=False` ile sonuçlar bellekte tutulmaz (sonuçları `on_done` ile diske
+    akıtan uzun koşular için); dönüş değeri boş liste olur. Her iş çağıranın
+    `contextvars` bağlamının bir kopyasında çalışır (etkin telemetri izi taşınır).
+    `on_tick` verilirse işler sürerken en çok `tick` saniyede bir, yine çağıran
+    iş parçacığında argümansız çağrılır (akan ara sonuçları göstermek için).
+    """
+    items = list(items)
+    if not items:
+        return []
+    results = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+        futures = {pool.submit(contextvars.copy_context().run, task, item): i for i, item in enumerate(items)}
+        last_tick = time.monotonic()
+        while futures:
+            done, _ = wait(futures, timeout=tick if on_tick else None, return_when=FIRST_COMPLETED)
+            for fut in done:
+                i = futures.pop(fut)
+                try:
+                    value, error = fut.result(), None
+                except Exception as e:
+                    value, error = None, e
+                if on_done:
+                    on_done(items[i], value, error)
+                if keep:
+                    results[i] = (items[i], value, error)
+            if on_tick and futures and time.monotonic() - last_tick >= tick:
+                on_tick()
+                last_tick = time.monotonic()
+    return results if keep else []
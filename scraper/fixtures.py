@@ -0,0 +1,62 @@
+"""Sağlayıcı yanıtlarını tekrar oynatılabilir fixture dosyalarına kaydeder.
+
+`RECORD_FIXTURES` bir dizine ayarlanınca canlı ScraperAPI HTML'leri ve Perplexity
+chat completion yanıtları `<dizin>/<sağlayıcı>/<anahtar>.json` olarak yazılır.
+Anahtar, yanıt önbelleğiyle aynı şekilde API anahtarı hariç istekten türetilir;
+`benchmarks.replay_server` aynı anahtarla eşleyip yanıtları yerelden sunar.
+"""
+import json
+import os
+import threading
+import time
+
+from . import config
+from .response_cache import cache_key
+
+
+class FixtureStore:
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, provider, request):
+        return os.path.join(self.root, provider, cache_key(provider, request) + ".json")
+
+    def save(self, provider, request, body, status=200, content_type="text/html; charset=utf-8"):
+        path = self.path(provider, request)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fixture = {"provider": provider, "request": request, "status": status, "content_type": content_type,
+                   "recorded": time.time(), "body": body}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def load(self, provider, request):
+        """Kayıtlı fixture sözlüğü ya da None."""
+        try:
+            with open(self.path(provider, request), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def count(self):
+        return {
+            provider: len([n for n in os.listdir(os.path.join(self.root, provider)) if n.endswith(".json")])
+            for provider in ("scraperapi", "perplexity")
+            if os.path.isdir(os.path.join(self.root, provider))
+        }
+
+
+_recorders = {}
+_recorders_lock = threading.Lock()
+
+
+def default_recorder():
+    """`config.RECORD_FIXTURES` ayarlıysa o dizine yazan kayıtçı, değilse None."""
+    root = config.RECORD_FIXTURES
+    if not root:
+        return None
+    with _recorders_lock:
+        if root not in _recorders:
+            _recorders[root] = FixtureStore(root)
+        return _recorders[root]
@@ -0,0 +1,191 @@
+"""Kur motoru: günlük kur anlık görüntüleri, çevrimdışı yedek ve vektörel çevrim.
+
+Kurlar "1 birim para = x TL" olarak tutulur (TRY her zaman 1). Kaynaktan
+alınan her kur seti SQLite'a gününe göre yazılır (gün başına son set kalır);
+son set `FX_MAX_AGE`'den yeniyse ağa çıkılmaz, kaynak hatalıysa son bilinen
+kurlar `stale=True` ile döner. Sabit kurlu paralar (`FX_PEGS`, ör. BAM = EUR /
+1.95583) her set için bağlı oldukları paradan türetilir.
+
+Geçmiş satırlar `convert_asof` ile kendi günlerinin (o gün ya da öncesindeki
+son) kuruyla tek seferde yeniden fiyatlanır.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from .config import FX_MAX_AGE, FX_PATH, FX_PEGS, FX_URL
+from .transport import default_transport
+
+log = logging.getLogger(__name__)
+
+BASE = "TRY"
+
+
+def _day(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+
+
+class Rates(dict):
+    """{para: TL} sözlüğü; `ts` set zamanı, `stale` son bilinen kura düşüldüğünü gösterir."""
+
+    def __init__(self, values, ts, stale=False):
+        super().__init__(values)
+        self.ts = ts
+        self.stale = stale
+
+    @property
+    def day(self):
+        return _day(self.ts)
+
+
+def apply_pegs(rates):
+    """Sabit kurlu paraları bağlı oldukları paradan türetir (yerinde)."""
+    for code, (anchor, ratio) in FX_PEGS.items():
+        if anchor in rates:
+            rates[code] = rates[anchor] / ratio
+    return rates
+
+
+def rate(rates, code):
+    """1 birim `code`'un TL karşılığı."""
+    return 1.0 if code == BASE else rates[code]
+
+
+def convert(amounts, src, dst, rates):
+    """`amounts` dizisini `src`'den `dst`'ye çevirir (numpy dizisi döner)."""
+    return np.asarray(amounts, dtype=float) * (rate(rates, src) / rate(rates, dst))
+
+
+class FxStore:
+    def __init__(self, path=FX_PATH):
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS rates ("
+            "day TEXT, currency TEXT, tl REAL, ts REAL, PRIMARY KEY (day, currency))"
+        )
+        self._db.commit()
+
+    def save(self, rates, ts):
+        day = _day(ts)
+        with self._lock:
+            self._db.execute("DELETE FROM rates WHERE day = ?", (day,))
+            self._db.executemany("INSERT INTO rates VALUES (?, ?, ?, ?)",
+                                 [(day, code, tl, ts) for code, tl in rates.items()])
+            self._db.commit()
+
+    def as_of(self, day=None):
+        """`day` (YYYY-MM-DD, None: bugün, UTC) ya da öncesindeki son set; hiç yoksa None."""
+        day = day or datetime.now(timezone.utc).date().isoformat()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT currency, tl, ts FROM rates WHERE day = (SELECT MAX(day) FROM rates WHERE day <= ?)", (day,)
+            ).fetchall()
+        if not rows:
+            return None
+        return Rates({code: tl for code, tl, _ in rows}, rows[0][2])
+
+    def latest(self):
+        return self.as_of("9999-12-31")
+
+    def table(self):
+        """Uzun biçimde (day, currency, tl) tüm setler; gün sırasıyla."""
+        with self._lock:
+            return pd.read_sql_query("SELECT day, currency, tl FROM rates ORDER BY day", self._db)
+
+
+class FxEngine:
+    # Kaynak hatasından sonra bu kadar sn yeniden denenmez; son bilinen kur döner
+    RETRY_AFTER = 60
+
+    def __init__(self, store=None, url=FX_URL, max_age=FX_MAX_AGE):
+        self.store = store
+        self.url = url
+        self.max_age = max_age
+        self._memo = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def _fetch(self):
+        r = default_transport().get(self.url, timeout=10, budget=30).json()["rates"]
+        return apply_pegs({k: 1 / v for k, v in r.items() if v > 0})
+
+    def current(self):
+        """Güncel kurlar; kaynak hatalıysa son bilinen set (`stale`), o da yoksa None."""
+        now = time.time()
+        with self._lock:
+            last = self._memo or (self.store.latest() if self.store else None)
+            if last is not None and now - last.ts < self.max_age:
+                return last
+            if last is not None and now < self._retry_at:
+                return Rates(last, last.ts, stale=True)
+            try:
+                fresh = Rates(self._fetch(), now)
+            except Exception as e:
+                log.warning("Kur verisi alınamadı: %s", str(e)[:80])
+                self._retry_at = now + self.RETRY_AFTER
+                if last is None:
+                    return None
+                log.warning("%s tarihli son bilinen kurlar kullanılıyor", last.day)
+                return Rates(last, last.ts, stale=True)
+            if self.store:
+                self.store.save(fresh, now)
+            self._memo = fresh
+            return fresh
+
+    def as_of(self, day):
+        """`day` günündeki (ya da öncesindeki son) kurlar; kayıt yoksa None."""
+        return self.store.as_of(day) if self.store else None
+
+    def convert_asof(self, amounts, currencies, days, dst=BASE):
+        """Her tutarı kendi gününün kuruyla `dst`'ye çevirir.
+
+        Gün için kayıt yoksa öncesindeki son set, o da yoksa sonraki ilk set
+        kullanılır; hiç kaydı olmayan paralar NaN olur.
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        if not len(amounts):
+            return amounts
+        # Kur yalnızca benzersiz (gün, para) çiftleri için aranır, sonra satırlara dağıtılır
+        day_codes, day_values = pd.factorize(pd.Series(days, dtype="str"))
+        cur_codes, cur_values = pd.factorize(pd.Series(currencies, dtype="str"))
+        pairs, codes = np.unique(day_codes * len(cur_values) + cur_codes, return_inverse=True)
+        pair_days = pd.to_datetime(day_values[pairs // len(cur_values)]).astype("datetime64[s]")
+        pair_currencies = cur_values[pairs % len(cur_values)]
+        table = self.store.table() if self.store else pd.DataFrame({"day": [], "currency": [], "tl": []})
+        table = table.astype({"currency": "str", "tl": float})
+        table["day"] = pd.to_datetime(table["day"]).astype("datetime64[s]")
+
+        def lookup(currency_codes):
+            left = pd.DataFrame({"day": pair_days, "currency": pd.Series(currency_codes, dtype="str"),
+                                 "pos": np.arange(len(pairs))})
+            left = left.sort_values("day", kind="stable")
+            back = pd.merge_asof(left, table, on="day", by="currency", direction="backward")
+            ahead = pd.merge_asof(left, table, on="day", by="currency", direction="forward")
+            out = np.empty(len(pairs))
+            out[back["pos"].to_numpy()] = back["tl"].fillna(ahead["tl"]).to_numpy()
+            return np.where(np.asarray(currency_codes) == BASE, 1.0, out)
+
+        factor = lookup(pair_currencies) / lookup(np.full(len(pairs), dst, dtype=object))
+        return amounts * factor[codes]
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_fx():
+    """Süreç başına paylaşılan kur motoru; FX_STORE=0 ise setler diske yazılmaz."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = FxEngine(FxStore() if os.environ.get("FX_STORE", "1") != "0" else None)
+        return _default
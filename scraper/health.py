@@ -0,0 +1,194 @@
+"""(marka, ülke, sağlayıcı) bazında sağlık takibi, devre kesici ve uyarlanabilir yönlendirme.
+
+Her çağrının başarısı, gecikmesi ve dönen ürün sayısı son `HEALTH_WINDOW`
+sonuçluk pencerede tutulur ve SQLite'a yazılır; süreç yeniden başladığında
+pencereler diskten yüklenir. Diskte `HEALTH_RETENTION` saniyeden eski kayıtlar
+silinir. Önbellekten dönen sonuçlar sağlayıcı hakkında bilgi taşımadığı için
+sayılmaz. Art arda `BREAKER_FAILURES` başarısızlıkta devre
+açılır ve sağlayıcı `BREAKER_COOLDOWN` saniye atlanır; süre dolunca tek bir
+deneme çağrısına izin verilir (yarı açık), başarılıysa devre kapanır.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from .config import BREAKER_COOLDOWN, BREAKER_FAILURES, HEALTH_PATH, HEALTH_RETENTION, HEALTH_WINDOW
+
+# Yönlendirme skoru için bu kadar sonuç birikmeden sıralama değişmez
+_MIN_SAMPLES = 3
+_RICH = 20
+# Eski kayıtlar bu kadar yazmada bir silinir
+_PRUNE_EVERY = 200
+
+
+class HealthTracker:
+    def __init__(self, path=HEALTH_PATH, window=HEALTH_WINDOW, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN,
+                 retention=HEALTH_RETENTION):
+        self.window = window
+        self.failures = failures
+        self.cooldown = cooldown
+        self.retention = retention
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._outcomes = {}
+        self._open_until = {}
+        self._probing = {}
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS outcomes ("
+                "ts REAL, country TEXT, brand TEXT, provider TEXT, ok INTEGER, latency REAL, products INTEGER)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS outcomes_key ON outcomes (country, brand, provider, ts)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS outcomes_ts ON outcomes (ts)")
+            self._prune(time.time())
+            self._db.commit()
+            self._load()
+
+    def _prune(self, now):
+        self._db.execute("DELETE FROM outcomes WHERE ts < ?", (now - self.retention,))
+
+    def _load(self):
+        rows = self._db.execute(
+            "SELECT country, brand, provider, ts, ok, latency, products FROM ("
+            "SELECT *, ROW_NUMBER() OVER (PARTITION BY country, brand, provider ORDER BY ts DESC) AS rn "
+            "FROM outcomes) WHERE rn <= ? ORDER BY ts",
+            (self.window,),
+        ).fetchall()
+        for country, brand, provider, ts, ok, latency, products in rows:
+            self._window((country, brand, provider)).append((ts, bool(ok), latency, products))
+        for key in self._outcomes:
+            self._update_breaker(key)
+
+    def _window(self, key):
+        if key not in self._outcomes:
+            self._outcomes[key] = deque(maxlen=self.window)
+        return self._outcomes[key]
+
+    def _update_breaker(self, key):
+        recent = list(self._outcomes[key])[-self.failures:]
+        if len(recent) == self.failures and not any(ok for _, ok, _, _ in recent):
+            self._open_until[key] = recent[-1][0] + self.cooldown
+        else:
+            self._open_until.pop(key, None)
+
+    def record(self, country, brand, provider, ok, latency, products):
+        key = (country, brand, provider)
+        now = time.time()
+        with self._lock:
+            self._window(key).append((now, ok, latency, products))
+            self._probing.pop(key, None)
+            self._update_breaker(key)
+            if self._db is not None:
+                self._db.execute("INSERT INTO outcomes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                 (now, country, brand, provider, int(ok), latency, products))
+                self._writes += 1
+                if self._writes % _PRUNE_EVERY == 0:
+                    self._prune(now)
+                self._db.commit()
+
+    def allow(self, country, brand, provider):
+        """Devre kapalıysa ya da bekleme bitti ve deneme hakkı alındıysa True.
+
+        Sonucu hiç kaydedilmeyen (ör. başlatılmadan kazananı belli olan) deneme
+        hakkı bir bekleme süresi sonra yeniden verilir.
+        """
+        key = (country, brand, provider)
+        now = time.time()
+        with self._lock:
+            until = self._open_until.get(key)
+            if until is None:
+                return True
+            if now < until or now - self._probing.get(key, 0) < self.cooldown:
+                return False
+            self._probing[key] = now
+            return True
+
+    def open_for(self, country, brand, provider):
+        """Devre açıksa kalan bekleme (sn), değilse 0."""
+        until = self._open_until.get((country, brand, provider))
+        return max(0.0, until - time.time()) if until else 0.0
+
+    def score(self, country, brand, provider):
+        """Başarı oranı × ürün zenginliği / medyan gecikme; az örnekte None."""
+        with self._lock:
+            items = list(self._outcomes.get((country, brand, provider), ()))
+        if len(items) < _MIN_SAMPLES:
+            return None
+        ok = np.array([o for _, o, _, _ in items], dtype=bool)
+        rate = ok.mean()
+        if not ok.any():
+            return 0.0
+        products = np.array([p for _, _, _, p in items])[ok]
+        latency = np.array([lat for _, _, lat, _ in items])[ok]
+        return float(rate * min(products.mean(), _RICH) / _RICH / max(np.median(latency), 0.5))
+
+    def route(self, country, brand, providers):
+        """Devresi açık olmayan sağlayıcılar; yeterli geçmiş varsa skora göre sıralı.
+
+        Geçmişi az olan sağlayıcılar verilen sıradaki yerini korur.
+        """
+        allowed = [p for p in providers if self.allow(country, brand, p)]
+        scores = {p: self.score(country, brand, p) for p in allowed}
+        if any(s is None for s in scores.values()):
+            return allowed
+        return sorted(allowed, key=lambda p: -scores[p])
+
+    def track(self, country, brand, provider, fn):
+        """`fn` sonucunu sağlık penceresine işleyen sarmalayıcı.
+
+        İptal edilen ve önbellekten dönen (`"cached": True`) çağrılar sayılmaz.
+        """
+        def wrapper(*args, cancel=None, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                data = fn(*args, cancel=cancel, **kwargs)
+            except Exception:
+                self.record(country, brand, provider, False, time.perf_counter() - t0, 0)
+                raise
+            if (cancel is not None and cancel.is_set() and not data) or (data or {}).get("cached"):
+                with self._lock:
+                    self._probing.pop((country, brand, provider), None)
+                return data
+            products = len((data or {}).get("products") or [])
+            self.record(country, brand, provider, products > 0, time.perf_counter() - t0, products)
+            return data
+        return wrapper
+
+    def snapshot(self, country=None):
+        """Anahtar başına başarı oranı, medyan gecikme, ortalama ürün ve devre durumu."""
+        with self._lock:
+            keys = [k for k in self._outcomes if country is None or k[0] == country]
+            windows = {k: list(self._outcomes[k]) for k in keys}
+        rows = []
+        for (c, brand, provider), items in sorted(windows.items()):
+            rows.append({
+                "country": c, "brand": brand, "provider": provider, "calls": len(items),
+                "success_rate": float(np.mean([o for _, o, _, _ in items])),
+                "p50_s": float(np.median([lat for _, _, lat, _ in items])),
+                "avg_products": float(np.mean([p for _, _, _, p in items])),
+                "score": self.score(c, brand, provider),
+                "open_s": self.open_for(c, brand, provider),
+            })
+        return rows
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_health():
+    """Süreç başına paylaşılan sağlık takibi; HEALTH=0 ile kapalıysa None."""
+    global _default
+    if os.environ.get("HEALTH", "1") == "0":
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = HealthTracker()
+        return _default
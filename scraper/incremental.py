@@ -0,0 +1,96 @@
+"""Artımlı tarama: yalnızca eskimiş ya da değişken (marka, ülke, sorgu) hücrelerini yeniden çeker.
+
+Her başarılı taramada hücrenin ham ürün listesinin özeti fiyat geçmişindeki
+`cells` tablosuna yazılır. Sonraki taramada son başarılı taraması
+`INCREMENTAL_MAX_AGE` saniyeden yeni, markası `VOLATILE_BRANDS` dışında ve
+geçmişte sık değişmemiş hücreler ağa çıkmadan geçmişteki satırlarla doldurulur.
+"""
+import hashlib
+import json
+import time
+
+from .config import INCREMENTAL_MAX_AGE, VOLATILE_BRANDS
+from .dedup import dedupe_rows
+from .fx import convert
+from .units import add_unit_columns
+
+# En az bu kadar taranmış ve taramaların bu oranından fazlasında içeriği değişmiş hücre değişkendir
+_MIN_SCANS = 3
+_VOLATILE_RATIO = 0.5
+
+
+def content_hash(data):
+    """Sağlayıcı çıktısındaki ürünlerin sıradan bağımsız özeti."""
+    products = (data or {}).get("products") or []
+    items = sorted(
+        (str(p.get("name", "")), str(p.get("price", "")), str(p.get("url", ""))) for p in products
+    )
+    return hashlib.sha256(json.dumps(items, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def is_volatile(brand, scans, changes):
+    return brand in VOLATILE_BRANDS or (scans >= _MIN_SCANS and changes / scans > _VOLATILE_RATIO)
+
+
+def plan(store, country, query, brands, max_age=INCREMENTAL_MAX_AGE, now=None):
+    """(yeniden çekilecek markalar, {marka: son başarılı tarama zamanı}) döner."""
+    now = time.time() if now is None else now
+    states = store.cell_states(country, query, brands)
+    stale, reuse = [], {}
+    for brand in brands:
+        state = states.get(brand)
+        if state is None:
+            stale.append(brand)
+            continue
+        last_ok, _, scans, changes = state
+        if now - last_ok > max_age or is_volatile(brand, scans, changes):
+            stale.append(brand)
+        else:
+            reuse[brand] = last_ok
+    return stale, reuse
+
+
+def reused_rows(store, country, query, reuse, curr, rates):
+    """Geçmişten alınan hücre satırları; TL/USD güncel kurla yeniden hesaplanır."""
+    rows = []
+    for brand, ts in reuse.items():
+        cell = store.cell_rows(country, brand, query, ts)
+        tl = convert(cell["price_local"], curr, "TRY", rates)
+        usd = convert(cell["price_local"], curr, "USD", rates)
+        for r, p_tl, p_usd in zip(cell.itertuples(index=False), tl.tolist(), usd.tolist()):
+            rows.append({
+                "Marka": r.brand,
+                "Ürün Yerel": r.product,
+                "Ürün Türkçe": r.product_tr or r.product,
+                f"Fiyat ({curr})": r.price_local,
+                "USD": p_usd,
+                "TL": p_tl,
+                "Link": r.url,
+                "Kaynak": r.source,
+            })
+    return add_unit_columns(dedupe_rows(rows))
+
+
+def record_scan(store, country, query, scanned, ts):
+    """fan_out çıktısındaki başarılı taramaları hücre durumuna işler.
+
+    Yanıt önbelleğinden dönen sonuçlar (`"cached": True`) gerçek bir tarama
+    değildir; hücrenin son tarama zamanı değişmez.
+    """
+    for brand, result, error in scanned:
+        if error or not result:
+            continue
+        data, _ = result
+        if data and data.get("products") and not data.get("cached"):
+            store.mark_cell(country, brand, query, content_hash(data), ts)
+
+
+def merge_rows(fresh, reused, brands):
+    """Taze ve geçmişten gelen satırları tekilleştirip seçili marka sırasıyla birleştirir.
+
+    Tekilleştirme birleşik küme üzerinde yapılır; böylece bir markanın farklı
+    kaynaklardan ya da farklı taramalardan gelen kopyaları da tek satıra iner
+    (taze satırlar önce geldiğinden eşitlikte taze satır kalır).
+    """
+    order = {b: i for i, b in enumerate(brands)}
+    return sorted(dedupe_rows(fresh + reused), key=lambda r: order.get(r["Marka"], len(order)))
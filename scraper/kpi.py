@@ -0,0 +1,61 @@
+"""Artımlı KPI: ürün sayısı ile ortalama, en düşük ve en yüksek TL fiyatı.
+
+Akışlı gösterimde her marka bitince yalnızca o markanın fiyatları eklenir;
+toplam ve uç değerler tutulduğundan tablo baştan taranmaz. USD ve yerel para
+karşılıkları, tarama boyunca sabit olan kurla TL değerlerinden türetilir.
+KPI'lar ürün fiyatı ya da birim fiyat sütunları (`scraper.units`) üzerinden
+tutulabilir; birim fiyatı bilinmeyen satırlar o sütunun KPI'ına girmez.
+"""
+import math
+
+# KPI tabanı olabilecek sütunlar → kart etiketindeki birim eki
+BASES = {"TL": "", "TL/Adet": "/adet", "TL/m²": "/m²", "TL/L": "/L"}
+
+
+class RunningKPI:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values):
+        """TL değerlerini ekler (None/NaN atlanır); zincirlenebilir."""
+        for v in values:
+            if v is None:
+                continue
+            v = float(v)
+            if math.isnan(v):
+                continue
+            self.count += 1
+            self.total += v
+            if v < self.min:
+                self.min = v
+            if v > self.max:
+                self.max = v
+        return self
+
+    @property
+    def avg(self):
+        return self.total / self.count if self.count else math.nan
+
+    def in_currency(self, rate):
+        """(ortalama, en düşük, en yüksek) — TL / `rate` cinsinden; boşsa NaN."""
+        if not self.count:
+            return math.nan, math.nan, math.nan
+        return self.avg / rate, self.min / rate, self.max / rate
+
+
+class KPISet:
+    """BASES'teki her sütun için ayrı RunningKPI."""
+
+    def __init__(self):
+        self.by_basis = {basis: RunningKPI() for basis in BASES}
+
+    def add_rows(self, rows):
+        for basis, kpi in self.by_basis.items():
+            kpi.add(r.get(basis) for r in rows)
+        return self
+
+    def __getitem__(self, basis):
+        return self.by_basis[basis]
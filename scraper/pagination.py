@@ -0,0 +1,119 @@
+"""Arama sonuçlarının sayfalı taranması: sayfa URL'leri, eşzamanlı pencere ve erken durma.
+
+İlk sayfa tek başına çekilir (ürün yoksa diğer sayfalar denenmez). Sonraki
+sayfalar marka başına `PAGE_WINDOW` genişliğinde kayan bir pencereyle paralel
+istenir ama sayfa sırasıyla işlenir; yeni ürün getirmeyen (boş, hatalı ya da
+sitenin parametreyi yok sayıp ilk sayfayı tekrarladığı) ilk sayfada durulur ve
+kuyruktaki sayfalar iptal edilir. Daha önceki sayfalarda görülen ürünler atlanır.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import MAX_CONCURRENCY, MAX_PAGES, PAGE_WINDOW, PAGINATION
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+def _pool():
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ThreadPoolExecutor(max_workers=max(8, PAGE_WINDOW * MAX_CONCURRENCY),
+                                            thread_name_prefix="page")
+        return _page_pool
+
+
+def page_urls(brand, site_config, query, max_pages=None):
+    """Markanın arama URL'leri; ilk eleman sayfa parametresiz arama yoludur.
+
+    `max_pages` verilirse `PAGINATION`'daki "depth" ile küçük olanı alınır.
+    """
+    search = site_config["base"] + site_config["search"].format(query=query.replace(" ", "+"))
+    paging = PAGINATION.get(brand)
+    if not paging:
+        return [search]
+    # Markaya özgü derinlik üst sınırdır; istenen derinlik onu aşamaz
+    depth = paging.get("depth") or max_pages or MAX_PAGES
+    if max_pages:
+        depth = min(depth, max_pages)
+    return [search] + [search + paging["param"].format(page=paging["first"] + i) for i in range(1, depth)]
+
+
+class _AnyEvent:
+    """Verilen olaylardan biri set edilince set sayılan, `threading.Event` benzeri görünüm."""
+
+    def __init__(self, *events):
+        self.events = [e for e in events if e is not None]
+
+    def is_set(self):
+        return any(e.is_set() for e in self.events)
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_set():
+            left = 0.05 if deadline is None else min(0.05, deadline - time.monotonic())
+            if left <= 0:
+                return False
+            self.events[0].wait(left)
+        return True
+
+
+def product_key(product):
+    return product.get("url") or (product.get("name"), product.get("price"))
+
+
+def crawl(urls, fetch, window=PAGE_WINDOW, cancel=None):
+    """`fetch(url, cancel)` ile sayfaları tarar, tekilleştirilmiş ürün listesi döner.
+
+    `fetch` ürün listesi ya da hata için None döner. İlk sayfa None ise None
+    döner (sağlayıcı hatası olarak kalır).
+    """
+    first = fetch(urls[0], cancel)
+    if not first:
+        return first
+    seen, products = set(), []
+
+    def add(page):
+        new = 0
+        for p in page or ():
+            key = product_key(p)
+            if key not in seen:
+                seen.add(key)
+                products.append(p)
+                new += 1
+        return new
+
+    add(first)
+    if len(urls) == 1:
+        return products
+
+    # Erken durmada ya da dış iptalde kuyruktaki sayfalar iptal edilir, uçuştakiler yeni deneme yapmaz
+    stop = threading.Event()
+    page_cancel = _AnyEvent(stop, cancel)
+    rest = iter(urls[1:])
+    pending = deque()
+
+    def submit():
+        url = next(rest, None)
+        if url is not None:
+            pending.append(_pool().submit(contextvars.copy_context().run, fetch, url, page_cancel))
+
+    for _ in range(max(1, window)):
+        submit()
+    while pending:
+        fut = pending.popleft()
+        try:
+            page = fut.result()
+        except Exception:
+            page = None
+        if not add(page) or (cancel is not None and cancel.is_set()):
+            stop.set()
+            for other in pending:
+                other.cancel()
+            break
+        submit()
+    return products
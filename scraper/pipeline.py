@@ -0,0 +1,223 @@
+"""Tarama hattı: sağlayıcı seçimi → ürün çıkarma → alaka → fiyat → çeviri.
+
+Streamlit arayüzü ile başsız koşucular (batch CLI vb.) aynı fonksiyonları kullanır.
+"""
+import contextvars
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from . import config
+from .config import HEDGE_DELAY, HYBRID_MIN_PRODUCTS, MAX_CONCURRENCY, URL_DB
+from .dedup import dedupe_rows
+from .fanout import build_limiters, throttled
+from .fx import convert, default_fx
+from .health import default_health
+from .pricing import clean_prices
+from .providers import scrape_with_scraperapi, search_sonar
+from .relevance import filter_relevant
+from .telemetry import REGISTRY, span
+from .translation import default_cache
+from .units import add_unit_columns
+
+log = logging.getLogger(__name__)
+
+METHODS = ["Hybrid", "ScraperAPI", "Perplexity"]
+
+
+def fetch_rates():
+    """1 birim yabancı paranın TL karşılığı (`fx.Rates`); kaynak hatalıysa son kaydedilen kurlar, o da yoksa None."""
+    return default_fx().current()
+
+
+def translate_query(q_tr, lang):
+    """Türkçe sorgudan (yerel, İngilizce) sorgu çifti."""
+    cache = default_cache()
+    return cache.translate(q_tr, lang), cache.translate(q_tr, "en")
+
+
+_hedge_pool = None
+_hedge_pool_lock = threading.Lock()
+
+
+def _pool():
+    global _hedge_pool
+    with _hedge_pool_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=max(32, 4 * MAX_CONCURRENCY), thread_name_prefix="hedge")
+        return _hedge_pool
+
+
+def product_count(data):
+    return len((data or {}).get("products") or [])
+
+
+def hedged(calls, delay, min_products=HYBRID_MIN_PRODUCTS):
+    """Hedged istek: `calls` [(yöntem, fn(cancel))] öncelik sırasıyla yarışır.
+
+    İlk çağrı hemen, sonraki `delay` saniye sonra (ya da öncekiler yetersiz
+    biterse hemen) başlar. En az `min_products` ürün dönen ilk sonuç kazanır,
+    diğerlerine iptal sinyali gider. Hiçbiri eşiği geçemezse en çok ürün dönen
+    sonuç, eşitlikte sonraki (yedek) yöntem seçilir. `(data, yöntem)` döner.
+    """
+    cancel = threading.Event()
+    queue = list(calls)
+    pending, finished = {}, []
+
+    def launch():
+        method, fn = queue.pop(0)
+        pending[_pool().submit(contextvars.copy_context().run, fn, cancel=cancel)] = method
+
+    launch()
+    while pending or queue:
+        if not pending:
+            launch()
+        done, _ = wait(pending, timeout=delay if queue else None, return_when=FIRST_COMPLETED)
+        if not done:
+            launch()
+            continue
+        for fut in done:
+            method = pending.pop(fut)
+            try:
+                data = fut.result()
+            except Exception as e:
+                log.warning("%s hatası: %s", method, str(e)[:80])
+                data = None
+            if product_count(data) >= min_products:
+                cancel.set()
+                for other in pending:
+                    other.cancel()
+                return data, method
+            finished.append((data, method))
+    order = {method: i for i, (method, _) in enumerate(calls)}
+    return max(finished, key=lambda r: (product_count(r[0]), order[r[1]]))
+
+
+def make_fetcher(country, scrape_method, q_local, q_english, scraper_key=None, perplexity_key=None,
+                 use_cache=True, limiters=None, warn=log.warning, hedge_delay=HEDGE_DELAY, health=None,
+                 max_pages=None, on_products=None):
+    """Tek markayı seçilen yöntemle tarayan `fetch(brand) -> (data, method)` fonksiyonu üretir.
+
+    Hybrid'de `hedge_delay` saniye sonra ikinci sağlayıcı da yarışa girer (`hedged`);
+    `hedge_delay=None` eski seri davranıştır: önce birinci, yetersizse ikinci.
+    Sağlık takibi açıksa devresi açık sağlayıcılar atlanır ve Hybrid sırası
+    marka için son dönemde en hızlı/zengin sonucu veren sağlayıcıya göre belirlenir.
+    `max_pages` ScraperAPI sayfa derinliğidir (None: `PAGINATION`/`MAX_PAGES`).
+    `on_products(brand, provider, ürünler)` Perplexity yanıtı akarken ayrıştırılan
+    ürünlerle işçi iş parçacığından çağrılır (marka bitmeden önizleme için).
+    """
+    scraper_key = scraper_key if scraper_key is not None else config.SCRAPER_API_KEY
+    perplexity_key = perplexity_key if perplexity_key is not None else config.PERPLEXITY_KEY
+    limiters = build_limiters() if limiters is None else limiters
+    health = default_health() if health is None else health
+    scraper_call = throttled(limiters.get("scraperapi"), scrape_with_scraperapi)
+    sonar_call = throttled(limiters.get("perplexity"), search_sonar)
+
+    def provider_call(brand, provider, site_config):
+        if provider == "scraperapi":
+            def fn(cancel=None):
+                return scraper_call(brand, site_config, q_local, scraper_key, warn, use_cache, cancel=cancel,
+                                    limiter=limiters.get("scraperapi"), max_pages=max_pages)
+        else:
+            def fn(cancel=None):
+                return sonar_call(brand, q_local, q_english, site_config, perplexity_key, use_cache, cancel=cancel,
+                                  on_products=on_products and (lambda items: on_products(brand, provider, items)))
+        return health.track(country, brand, provider, fn) if health else fn
+
+    def fetch_brand(brand):
+        with span("fetch", brand):
+            data, method = _fetch(brand)
+        REGISTRY.inc("brand_fetches_total", provider=method or "none", empty=product_count(data) == 0)
+        return data, method
+
+    def _fetch(brand):
+        site_config = URL_DB.get(country, {}).get(brand)
+        if not site_config:
+            return None, ""
+
+        if scrape_method == "ScraperAPI":
+            providers = ["scraperapi"]
+        elif scrape_method == "Perplexity":
+            providers = ["perplexity"]
+        else:
+            providers = ["scraperapi", "perplexity"] if scraper_key else ["perplexity"]
+        if health:
+            routed = health.route(country, brand, providers)
+            for p in providers:
+                if p not in routed:
+                    log.info("%s/%s: %s devresi açık, %.0f dk atlanıyor", country, brand, p,
+                             health.open_for(country, brand, p) / 60)
+            providers = routed
+        if not providers:
+            return None, ""
+        calls = [(p, provider_call(brand, p, site_config)) for p in providers]
+        if len(calls) == 1:
+            method, fn = calls[0]
+            return fn(), method
+        if hedge_delay is not None:
+            return hedged(calls, hedge_delay)
+        (first, first_fn), (second, second_fn) = calls
+        data = first_fn()
+        if product_count(data) < HYBRID_MIN_PRODUCTS:
+            return second_fn(), second
+        return data, first
+    return fetch_brand
+
+
+def build_rows(scanned, q_english, lang, curr, rates, threshold=None, warn=log.warning, preview=False):
+    """fan_out çıktısını (marka, sonuç, hata) marka sırasıyla sonuç satırlarına çevirir.
+
+    `preview=True` akan ara sonuçlar içindir: çeviri yapılmaz, sayaçlar artmaz.
+    """
+    rows = []
+    for brand, result, error in scanned:
+        if error:
+            warn(f"{brand} scraping hatası: {str(error)[:80]}")
+            continue
+        data, method = result
+        if data and data.get("products"):
+            rows.extend((brand, method, p) for p in data["products"])
+
+    # Alaka kontrolü ağsız, tüm parti için tek seferde
+    names = [p.get("name", "") for _, _, p in rows]
+    with span("relevance", items=len(names)):
+        relevant = filter_relevant(names, q_english, lang, threshold=threshold)
+
+    with span("clean_price", items=len(rows)):
+        prices = clean_prices([p.get("price", 0) for _, _, p in rows], curr)
+    kept = [
+        (brand, method, p, name, float(p_raw))
+        for (brand, method, p), name, ok, p_raw in zip(rows, names, relevant, prices)
+        if ok and p_raw > 0
+    ]
+
+    local = [k[4] for k in kept]
+    tl = convert(local, curr, "TRY", rates)
+    usd = convert(local, curr, "USD", rates)
+    results = []
+    for (brand, method, p, name, p_raw), p_tl, p_usd in zip(kept, tl.tolist(), usd.tolist()):
+        results.append({
+            "Marka": brand,
+            "Ürün Yerel": name,
+            "Ürün Türkçe": None,
+            f"Fiyat ({curr})": p_raw,
+            "USD": p_usd,
+            "TL": p_tl,
+            "Link": p.get("url", ""),
+            "Kaynak": method.upper()
+        })
+    # Kopyalar çeviriden önce atılır; kalan satır kümenin kökenini taşır
+    with span("dedup", items=len(results)):
+        results = dedupe_rows(results)
+    if preview:
+        return add_unit_columns(results)
+    REGISTRY.inc("dedup_merged_total", len(kept) - len(results))
+    with span("translate", items=len(results)):
+        names_tr = default_cache().translate_batch([r["Ürün Yerel"] for r in results], "tr")
+    for row, name_tr in zip(results, names_tr):
+        row["Ürün Türkçe"] = name_tr
+    with span("units", items=len(results)):
+        add_unit_columns(results)
+    for source in {r["Kaynak"] for r in results}:
+        REGISTRY.inc("rows_total", sum(r["Kaynak"] == source for r in results), source=source)
+    return results
@@ -0,0 +1,160 @@
+"""Taranan satırların kalıcı fiyat geçmişi (SQLite).
+
+Her satır ülke, marka, sorgu, normalize ürün adı ve gün ile saklanır.
+(ülke, marka, normalize ad, gün) ve (ülke, sorgu, marka, gün) indeksleri
+sayesinde "Pepco BG havlu fiyatı son 90 gün" gibi sorgular milyonlarca satırda
+da yalnızca ilgili indeks aralığını okur.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from .config import PRICE_STORE_PATH
+from .relevance import _normalize_series, normalize
+
+_COLUMNS = ("ts", "day", "country", "brand", "query", "product", "product_norm",
+            "currency", "price_local", "tl", "usd", "source", "url", "product_tr")
+
+
+def _day(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+
+
+class PriceStore:
+    def __init__(self, path=PRICE_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS prices ("
+            "ts REAL, day TEXT, country TEXT, brand TEXT, query TEXT, product TEXT, "
+            "product_norm TEXT, currency TEXT, price_local REAL, tl REAL, usd REAL, "
+            "source TEXT, url TEXT, product_tr TEXT)"
+        )
+        cols = {row[1] for row in self._db.execute("PRAGMA table_info(prices)")}
+        if "product_tr" not in cols:
+            self._db.execute("ALTER TABLE prices ADD COLUMN product_tr TEXT")
+        # (ülke, marka, sorgu) hücresinin son başarılı taraması; artımlı tarama için
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cells ("
+            "country TEXT, brand TEXT, query TEXT, last_ok REAL, content_hash TEXT, "
+            "scans INTEGER, changes INTEGER, PRIMARY KEY (country, brand, query))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS prices_product ON prices (country, brand, product_norm, day)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS prices_query ON prices (country, query, brand, day)")
+        self._db.commit()
+
+    def record(self, rows, country, query, curr, ts=None):
+        """`build_rows` çıktısını tek işlemde ekler; eklenen satır sayısını döner."""
+        if not rows:
+            return 0
+        ts = time.time() if ts is None else ts
+        day = _day(ts)
+        names = [r["Ürün Yerel"] for r in rows]
+        norms = _normalize_series(names).tolist()
+        records = [
+            (ts, day, country, r["Marka"], query, name, norm, curr,
+             r.get("Fiyat (Yerel)", r.get(f"Fiyat ({curr})")), r["TL"], r["USD"], r["Kaynak"], r.get("Link", ""),
+             r.get("Ürün Türkçe"))
+            for r, name, norm in zip(rows, names, norms)
+        ]
+        with self._lock:
+            self._db.executemany(f"INSERT INTO prices VALUES ({', '.join('?' * len(_COLUMNS))})", records)
+            self._db.commit()
+        return len(records)
+
+    def _where(self, country, brand, product, query, days, since):
+        clauses, params = ["country = ?"], [country]
+        if brand is not None:
+            clauses.append("brand = ?")
+            params.append(brand)
+        if query is not None:
+            clauses.append("query = ?")
+            params.append(query)
+        if product is not None:
+            # Normalize ad alt dizesi; ülke+marka indeks aralığı içinde taranır
+            clauses.append("product_norm LIKE ?")
+            params.append(f"%{normalize(product)}%")
+        if since is None and days is not None:
+            since = datetime.now(timezone.utc) - timedelta(days=days)
+        if since is not None:
+            clauses.append("day >= ?")
+            params.append(since.strftime("%Y-%m-%d"))
+        return " AND ".join(clauses), params
+
+    def history(self, country, brand=None, product=None, query=None, days=90, since=None):
+        """Filtreye uyan ham satırlar (en yeni en sonda)."""
+        where, params = self._where(country, brand, product, query, days, since)
+        with self._lock:
+            return pd.read_sql_query(
+                f"SELECT {', '.join(_COLUMNS)} FROM prices WHERE {where} ORDER BY ts", self._db, params=params
+            )
+
+    def trend(self, country, brand=None, product=None, query=None, days=90, since=None):
+        """Gün ve marka bazında ürün sayısı ile ortalama/en düşük/en yüksek TL fiyatı."""
+        where, params = self._where(country, brand, product, query, days, since)
+        with self._lock:
+            return pd.read_sql_query(
+                "SELECT day, brand, COUNT(*) AS n, AVG(tl) AS avg_tl, MIN(tl) AS min_tl, MAX(tl) AS max_tl, "
+                f"AVG(price_local) AS avg_local FROM prices WHERE {where} GROUP BY day, brand ORDER BY day, brand",
+                self._db, params=params,
+            )
+
+    def cell_states(self, country, query, brands):
+        """{marka: (son başarılı tarama, içerik özeti, tarama sayısı, değişim sayısı)}"""
+        marks = ", ".join("?" * len(brands))
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT brand, last_ok, content_hash, scans, changes FROM cells "
+                f"WHERE country = ? AND query = ? AND brand IN ({marks})",
+                (country, query, *brands),
+            ).fetchall()
+        return {brand: rest for brand, *rest in rows}
+
+    def mark_cell(self, country, brand, query, content_hash, ts):
+        """Başarılı taramayı kaydeder; özet önceki taramadan farklıysa değişim sayılır."""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO cells VALUES (?, ?, ?, ?, ?, 1, 0) "
+                "ON CONFLICT (country, brand, query) DO UPDATE SET "
+                "changes = changes + (content_hash != excluded.content_hash), scans = scans + 1, "
+                "last_ok = excluded.last_ok, content_hash = excluded.content_hash",
+                (country, brand, query, ts, content_hash),
+            )
+            self._db.commit()
+
+    def cell_rows(self, country, brand, query, ts):
+        """Hücrenin `ts` anındaki taramasında kaydedilen satırlar."""
+        with self._lock:
+            return pd.read_sql_query(
+                f"SELECT {', '.join(_COLUMNS)} FROM prices "
+                "WHERE country = ? AND query = ? AND brand = ? AND day = ? AND ts = ?",
+                self._db, params=(country, query, brand, _day(ts), ts),
+            )
+
+    def stats(self):
+        with self._lock:
+            rows, first, last = self._db.execute("SELECT COUNT(*), MIN(day), MAX(day) FROM prices").fetchone()
+        return {"rows": rows, "first_day": first, "last_day": last}
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_price_store():
+    """Süreç başına paylaşılan fiyat geçmişi; PRICE_STORE=0 ile kapalıysa None."""
+    global _default
+    if os.environ.get("PRICE_STORE", "1") == "0":
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = PriceStore()
+        return _default
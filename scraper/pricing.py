@@ -0,0 +1,121 @@
+"""Toplu fiyat normalizasyonu: ham fiyat metinlerinden float dizisi.
+
+Tek tek `clean_price` yerine bütün sonuç partisi işlenir: her benzersiz metin
+bir kez, Arrow string çekirdekleriyle (RE2) tek geçişte okunur. Aralıklar ("10,99 - 19,99")
+ve eski/yeni fiyat çiftleri ("was 19.99 now 12.99") desteklenir.
+
+Ondalık ayraç para biriminden değil sayının kendisinden çıkarılır: iki ayraç
+türü birlikte geçiyorsa sondaki ondalıktır ("1.299,50", "1,299.50"); aynı ayraç
+birden çok kez geçiyorsa binliktir ("1.299.000"). Tek ayraçta ardından 3 rakam
+gelmiyorsa ondalıktır; tam 3 rakamda virgül binlik ("$1,299"), nokta ondalıktır
+("19.999") — yalnızca kuruşsuz fiyatlanan paralarda (`INTEGER_PRICED`, ör.
+"1.299 din") nokta da binlik sayılır.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Fiyatları pratikte kuruşsuz yazılan paralar: "1.299" bin iki yüz doksan dokuzdur
+INTEGER_PRICED = {"RSD", "HUF"}
+
+# Binlik grup ayracı olarak görülen boşluklar (normal, NBSP, dar NBSP)
+_SPACES = r" \x{00a0}\x{202f}"
+# "now/сега/sada" işaretinden sonraki kısım güncel fiyattır
+_NOW_WORDS = ["now", "sale", "сега", "sada", "akcija", "şimdi"]
+# "was/преди/bilo X" parçası eski fiyattır; atlanır
+_WAS_WORDS = ["was", "before", "преди", "bilo", "stara", "regular", "eski"]
+# Ucuz ön filtre: işaret kelimesi geçmeyen satırlar basit regex ile okunur
+_MARKERS = "|".join(_NOW_WORDS + _WAS_WORDS)
+
+# Ayraçlar yorumlanmadan yakalanan sayı: boşluklu binlik gruplar ve [.,] parçaları.
+# Basit desen Arrow (RE2) ile tüm partide bir kerede çalışır; RE2 `\b`'yi yalnızca
+# ASCII'de tanıdığından Kiril işaret kelimeli az sayıdaki satır Python `re` ile okunur.
+_NUMBER = r"\d+(?:[" + _SPACES + r"]\d{3})*(?:[.,]\d+)*"
+_PRICE = (
+    r"(?P<num>" + _NUMBER + r")"
+    r"(?:[^\d\-–—]{0,8}[-–—]\D{0,8}(?P<num2>" + _NUMBER + r"))?"
+)
+_SIMPLE = r"^\D*" + _PRICE
+_NOW = "|".join(r"\b" + w + r"\b" for w in _NOW_WORDS)
+_WAS = "|".join(r"\b" + w + r"\b" for w in _WAS_WORDS)
+_MARKED = re.compile(
+    (r"^(?:.*(?:" + _NOW + r"))?"
+     r"(?:\D*?(?:" + _WAS + r")\D{0,12}" + _NUMBER + r")?"
+     r"\D*?" + _PRICE).replace(r"\x{00a0}", r"\u00a0").replace(r"\x{202f}", r"\u202f"),
+    re.DOTALL,
+)
+
+
+def _numbers(tokens, integer_priced):
+    """Yakalanan sayı metinlerini (Arrow dizisi, eksikler boş/null) ayraçlarına göre float'a çevirir.
+
+    Tüm rakamlar tek tam sayı olarak okunur; son ayraç ondalıksa ardındaki rakam
+    sayısı kadar 10'a bölünür. Yalnızca düz metin çekirdekleri kullanılır.
+    """
+    digits = tokens
+    for ch in (",", ".", " ", "\u00a0", "\u202f"):
+        digits = pc.replace_substring(digits, ch, "")
+    digits = pc.if_else(pc.equal(digits, ""), pa.scalar(None, pa.string()), digits)
+    whole = pc.cast(digits, pa.float64()).to_numpy(zero_copy_only=False)
+
+    def count(ch):
+        return pc.count_substring(tokens, ch).to_numpy(zero_copy_only=False)
+
+    def from_end(ch):
+        # Sondaki ayracın ardındaki karakter sayısı; ayraç yoksa sonsuz
+        pos = pc.find_substring(pc.utf8_reverse(tokens), ch).to_numpy(zero_copy_only=False).astype(float)
+        return np.where(pos < 0, np.inf, pos)
+
+    commas, dots = count(","), count(".")
+    after_comma, after_dot = from_end(","), from_end(".")
+    comma = after_comma < after_dot
+    tail_len = np.minimum(after_comma, after_dot)
+    other = np.where(comma, dots > 0, commas > 0)
+    same = np.where(comma, commas > 1, dots > 1)
+    single_decimal = (tail_len != 3) | (~comma & (not integer_priced))
+    decimal = np.isfinite(tail_len) & (other | (~same & single_decimal))
+    return whole / np.power(10.0, np.where(decimal, tail_len, 0))
+
+
+def clean_prices(values, currency_code="USD", range_mode="low"):
+    """Ham fiyat metinlerini (Series ya da liste) float dizisine çevirir.
+
+    Okunamayan değerler 0.0 olur (eski `clean_price` ile aynı sözleşme).
+    `range_mode`: aralıklarda "low" alt sınırı, "high" üst sınırı, "mid" ortalamayı verir.
+    """
+    s = pd.Series(values, dtype="object") if not isinstance(values, pd.Series) else values.astype("object")
+    s = s.where(s.notna(), "").astype(str)
+    # Aynı fiyat metni bir partide çok kez geçer; her benzersiz değer bir kez işlenir
+    codes, uniques = pd.factorize(s)
+    if not len(codes):
+        return np.zeros(0)
+    lowered = pc.utf8_lower(pa.array(uniques.tolist(), pa.string()))
+    parts = pc.extract_regex(lowered, _SIMPLE)
+    num, num2 = parts.field("num"), parts.field("num2")
+    has_marker = pc.match_substring_regex(lowered, _MARKERS).to_numpy(zero_copy_only=False)
+    if has_marker.any():
+        num, num2 = num.to_pylist(), num2.to_pylist()
+        marked = np.flatnonzero(has_marker)
+        for i, text in zip(marked, lowered.take(marked).to_pylist()):
+            m = _MARKED.match(text)
+            num[i], num2[i] = (m.group("num"), m.group("num2") or "") if m else (None, None)
+        num, num2 = pa.array(num, pa.string()), pa.array(num2, pa.string())
+    integer_priced = currency_code.upper() in INTEGER_PRICED
+    low = _numbers(num, integer_priced)
+    high = _numbers(num2, integer_priced)
+    if range_mode == "high":
+        out = np.where(np.isnan(high), low, high)
+    elif range_mode == "mid":
+        out = np.where(np.isnan(high), low, (low + high) / 2)
+    else:
+        out = low
+    return np.nan_to_num(out, nan=0.0)[codes]
+
+
+def clean_price(price_raw, currency_code="USD"):
+    """Tek değer için kısayol; toplu kullanımda `clean_prices` tercih edilmeli."""
+    if not price_raw: return 0.0
+    return float(clean_prices([price_raw], currency_code)[0])
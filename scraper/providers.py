@@ -0,0 +1,186 @@
+"""Sağlayıcı istemcileri: ScraperAPI (render + HTML parse) ve Perplexity Sonar."""
+import json
+import logging
+import time
+
+from . import config
+from .config import SITE_SELECTORS
+from .extraction import extract_products
+from .fixtures import default_recorder
+from .pagination import crawl, page_urls
+from .response_cache import default_response_cache
+from .sonar import ProductStream, iter_completion
+from .telemetry import REGISTRY, span
+from .transport import Cancelled, default_transport
+
+log = logging.getLogger(__name__)
+
+
+# --- SCRAPERAPI SCRAPER ---
+def _scraperapi_page(brand, url, base_url, api_key, warn, cache, cancel=None, network=None):
+    """Tek arama sayfası: önbellek → ScraperAPI render → parse. Hata/iptalde None.
+
+    Sayfa ağdan istenirse URL'si `network` listesine eklenir.
+    """
+    params = {
+        "api_key": api_key,
+        "url": url,
+        "render": "true",
+        "country_code": "bg"
+    }
+    cache_request = {k: v for k, v in params.items() if k != "api_key"}
+
+    with span("cache", brand, provider="scraperapi"):
+        html = cache.get("scraperapi", brand, cache_request) if cache else None
+    if html is None:
+        if network is not None:
+            network.append(url)
+        try:
+            with span("network.scraperapi", brand):
+                response = default_transport().get(config.SCRAPER_API_URL, params=params, timeout=90, cancel=cancel)
+        except Cancelled:
+            return None
+        REGISTRY.inc("provider_requests_total", provider="scraperapi", status=response.status_code)
+
+        if response.status_code != 200:
+            warn(f"{brand}: HTTP {response.status_code}")
+            return None
+
+        html = response.text
+        if cache:
+            cache.put("scraperapi", brand, cache_request, html)
+        recorder = default_recorder()
+        if recorder:
+            recorder.save("scraperapi", cache_request, html, content_type=response.headers.get("Content-Type", "text/html"))
+
+    with span("parse", brand, provider="scraperapi"):
+        return extract_products(brand, html, base_url, limit=None)
+
+
+def scrape_with_scraperapi(brand, site_config, product_local, api_key=None, warn=log.warning, use_cache=True,
+                           cancel=None, limiter=None, max_pages=None):
+    """ScraperAPI ile JavaScript render + scraping; PAGINATION'daki markalar sayfalı taranır.
+
+    İlk sayfanın hız limiti çağıranda (`throttled`) alınır; sonraki sayfalar
+    `limiter`'dan ayrıca token alır. Tüm sayfalar önbellekten geldiyse sonuçta
+    `"cached": True` olur.
+    """
+    api_key = api_key or config.SCRAPER_API_KEY
+
+    if not api_key or brand not in SITE_SELECTORS:
+        return None
+
+    base_url = site_config["base"]
+    cache = default_response_cache() if use_cache else None
+    urls = page_urls(brand, site_config, product_local, max_pages)
+    network = []
+
+    def fetch(url, page_cancel):
+        if limiter is not None and url != urls[0]:
+            with span("rate_limit", brand):
+                limiter.acquire()
+        return _scraperapi_page(brand, url, base_url, api_key, warn, cache, page_cancel, network)
+
+    try:
+        products = crawl(urls, fetch, cancel=cancel)
+        if products:
+            return {"products": products, "cached": not network}
+        return None
+
+    except Exception as e:
+        warn(f"{brand} scraping hatası: {str(e)[:80]}")
+        return None
+
+# --- PERPLEXITY (Yedek) ---
+def search_sonar(brand, product_local, product_english, site_config, api_key=None, use_cache=True, cancel=None,
+                 on_products=None):
+    """Perplexity Sonar'dan akışlı ürün listesi; `{"products": [...]}` ya da None.
+
+    Ürünler yanıt akarken ayrıştırılıp doğrulanır (`scraper.sonar`); `on_products`
+    verilirse her yeni geçerli ürün partisiyle, yanıt bitmeden çağrılır.
+    """
+    api_key = api_key or config.PERPLEXITY_KEY
+    if not api_key:
+        return None
+
+    full_url = site_config["base"]
+
+    payload = {
+        "model": "sonar",
+        "messages": [
+            {"role": "system", "content": "You are a product data scraper. Extract real products with prices."},
+            {"role": "user", "content": f"""
+Search for '{product_english}' (local: '{product_local}') on {full_url}
+
+List 10-15 products with EXACT prices.
+
+OUTPUT JSON:
+{{"products": [{{"name": "Product 1", "price": "15.99", "url": "link"}}]}}
+"""}
+        ],
+        "temperature": 0.1,
+        "max_tokens": 3000
+    }
+    # Önbellek/fixture anahtarı akış bayrağından bağımsızdır
+    request = dict(payload)
+    payload["stream"] = True
+
+    cache = default_response_cache() if use_cache else None
+    stream = ProductStream()
+    products = []
+
+    def take(items):
+        if items:
+            products.extend(items)
+            if on_products:
+                on_products(items)
+
+    try:
+        with span("cache", brand, provider="perplexity"):
+            raw = cache.get("perplexity", brand, request) if cache else None
+        fresh = raw is None
+        if fresh:
+            with span("network.perplexity", brand):
+                started = time.perf_counter()
+                res = default_transport().post(config.PERPLEXITY_URL, json=payload, headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}, timeout=60, cancel=cancel, stream=True)
+                REGISTRY.inc("provider_requests_total", provider="perplexity", status=res.status_code)
+                if res.status_code != 200:
+                    res.close()
+                    log.warning("%s: Perplexity HTTP %s", brand, res.status_code)
+                    return None
+                parts, finish = [], None
+                for delta, reason in iter_completion(res, cancel):
+                    parts.append(delta)
+                    finish = reason or finish
+                    was_empty = not products
+                    take(stream.feed(delta))
+                    if was_empty and products:
+                        REGISTRY.observe("sonar_first_product", time.perf_counter() - started)
+            raw = "".join(parts)
+            recorder = default_recorder()
+            if recorder:
+                body = {"choices": [{"message": {"role": "assistant", "content": raw}, "finish_reason": finish}]}
+                recorder.save("perplexity", request, json.dumps(body, ensure_ascii=False), content_type="application/json")
+            if finish == "length":
+                log.info("%s: Perplexity yanıtı max_tokens sınırında kesildi", brand)
+        else:
+            with span("parse", brand, provider="perplexity"):
+                take(stream.feed(raw))
+        take(stream.close())
+        REGISTRY.inc("sonar_items_total", stream.valid, status="valid")
+        REGISTRY.inc("sonar_items_total", stream.invalid, status="invalid")
+        REGISTRY.inc("sonar_items_total", stream.salvaged, status="salvaged")
+        if stream.invalid or stream.salvaged:
+            log.info("%s: Perplexity %d geçersiz öğe atlandı, %d kesik öğe kurtarıldı", brand, stream.invalid,
+                     stream.salvaged)
+        if products:
+            # Yalnızca ürün çıkarılabilen yanıtlar önbelleğe yazılır
+            if cache and fresh:
+                cache.put("perplexity", brand, request, raw)
+            return {"products": products, "cached": not fresh}
+        log.warning("%s: Perplexity yanıtında geçerli ürün yok", brand)
+    except Cancelled:
+        pass
+    except Exception as e:
+        log.warning("%s: Perplexity hatası: %s", brand, str(e)[:80])
+    return None
@@ -0,0 +1,172 @@
+"""Ağsız alaka skoru: yerel anahtar kelime sözlükleri + Kiril/Latin harf çevirisi.
+
+Ürün adları çeviri yapılmadan normalize edilir (Kiril → Latin, aksanlar atılır) ve
+sorgunun önceden hesaplanmış token indeksine karşı tüm parti tek seferde skorlanır.
+"""
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from .translation import default_cache
+
+# Bulgarca ve Sırpça Kiril harfleri tek bir ASCII şemaya indirgenir
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ж": "z", "з": "z",
+    "и": "i", "й": "j", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p",
+    "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "h", "ц": "c", "ч": "c",
+    "ш": "s", "щ": "st", "ъ": "a", "ь": "", "ю": "ju", "я": "ja", "ђ": "dj", "ј": "j",
+    "љ": "lj", "њ": "nj", "ћ": "c", "џ": "dz",
+}
+_LATIN = {"đ": "dj", "ß": "ss"}
+_TRANSLIT = str.maketrans({**_CYRILLIC, **_LATIN})
+
+# İngilizce sorgu kelimesi → dile göre kök listesi (normalize edilmiş yazımla)
+KEYWORDS = {
+    "towel":      {"bg": ["karp", "havlij"], "bs": ["peskir", "rucnik"], "sr": ["peskir", "rucnik"]},
+    "bath":       {"bg": ["banj"], "bs": ["kupaon", "kupatil"], "sr": ["kupatil", "kupaon"]},
+    "face":       {"bg": ["lice"], "bs": ["lice"], "sr": ["lice"]},
+    "hand":       {"bg": ["race", "racn"], "bs": ["ruke", "ruku", "rucn"], "sr": ["ruke", "ruku", "rucn"]},
+    "beach":      {"bg": ["plaz"], "bs": ["plaz"], "sr": ["plaz"]},
+    "bathrobe":   {"bg": ["halat"], "bs": ["bademantil", "ogrtac"], "sr": ["bademantil", "ogrtac"]},
+    "robe":       {"bg": ["halat"], "bs": ["bademantil", "ogrtac"], "sr": ["bademantil", "ogrtac"]},
+    "mat":        {"bg": ["postelk", "izterval"], "bs": ["prostirk", "otirac"], "sr": ["prostirk", "otirac"]},
+    "pillow":     {"bg": ["vazglavnic"], "bs": ["jastuk"], "sr": ["jastuk"]},
+    "cushion":    {"bg": ["vazglavnic"], "bs": ["jastuk", "jastuc"], "sr": ["jastuk", "jastuc"]},
+    "pillowcase": {"bg": ["kalafk"], "bs": ["jastucnic"], "sr": ["jastucnic"]},
+    "duvet":      {"bg": ["zavivk", "olekotk"], "bs": ["jorgan", "pokrivac"], "sr": ["jorgan", "pokrivac"]},
+    "quilt":      {"bg": ["zavivk", "olekotk"], "bs": ["jorgan", "pokrivac"], "sr": ["jorgan", "pokrivac"]},
+    "blanket":    {"bg": ["odejal"], "bs": ["deka", "cebe"], "sr": ["cebe", "deka"]},
+    "throw":      {"bg": ["odejal", "pled"], "bs": ["deka", "pled"], "sr": ["cebe", "pled"]},
+    "sheet":      {"bg": ["carsaf"], "bs": ["plaht", "carsav"], "sr": ["carsav", "plaht"]},
+    "bedding":    {"bg": ["spalno"], "bs": ["posteljin"], "sr": ["posteljin"]},
+    "bed":        {"bg": ["spal", "legl"], "bs": ["krevet", "posteljin"], "sr": ["krevet", "posteljin"]},
+    "cover":      {"bg": ["plik", "kalaf"], "bs": ["navlak", "presvlak"], "sr": ["navlak", "presvlak"]},
+    "curtain":    {"bg": ["zaves", "perd"], "bs": ["zavjes", "zastor"], "sr": ["zaves", "zastor"]},
+    "rug":        {"bg": ["kilim", "pateck"], "bs": ["tepih", "cilim"], "sr": ["tepih", "cilim"]},
+    "carpet":     {"bg": ["kilim"], "bs": ["tepih", "cilim"], "sr": ["tepih", "cilim"]},
+    "tablecloth": {"bg": ["pokrivk"], "bs": ["stolnjak"], "sr": ["stolnjak"]},
+    "napkin":     {"bg": ["salfetk"], "bs": ["salvet"], "sr": ["salvet"]},
+    "mug":        {"bg": ["casa", "casi"], "bs": ["salic", "solj"], "sr": ["solj", "salic"]},
+    "cup":        {"bg": ["casa", "casi"], "bs": ["salic", "solj"], "sr": ["solj", "salic"]},
+    "glass":      {"bg": ["casa", "casi"], "bs": ["casa", "case"], "sr": ["casa", "case"]},
+    "plate":      {"bg": ["cinij"], "bs": ["tanjur", "tanjir"], "sr": ["tanjir", "tanjur"]},
+    "candle":     {"bg": ["svest"], "bs": ["svijec", "svjec"], "sr": ["svec"]},
+    "vase":       {"bg": ["vaza", "vazi"], "bs": ["vaza", "vaze"], "sr": ["vaza", "vaze"]},
+    "basket":     {"bg": ["kosnic", "kos"], "bs": ["korp", "kosar"], "sr": ["korp", "kotaric"]},
+    "mirror":     {"bg": ["ogledal"], "bs": ["ogledal"], "sr": ["ogledal"]},
+    "lamp":       {"bg": ["lamp"], "bs": ["lamp"], "sr": ["lamp"]},
+    "frame":      {"bg": ["ramk"], "bs": ["okvir"], "sr": ["ram", "okvir"]},
+    "kitchen":    {"bg": ["kuhn"], "bs": ["kuhinj"], "sr": ["kuhinj"]},
+    "box":        {"bg": ["kutij"], "bs": ["kutij"], "sr": ["kutij"]},
+}
+
+_TOKEN = re.compile(r"[^\W\d_]+")
+# Kökler sözcük başına bağlıdır ve en fazla `_MAX_SUFFIX` harflik çekim ekiyle eşleşir
+# ("karpa" → "karpata" evet, "karpacco" hayır); `_MIN_STEM`'den kısa kökler tam sözcüktür
+_MIN_STEM = 4
+_MAX_SUFFIX = 3
+
+
+def normalize(text):
+    """Küçük harf, Kiril → Latin, aksanları at (č → c, é → e)."""
+    s = str(text or "").lower().translate(_TRANSLIT)
+    return unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
+
+
+def _normalize_series(names):
+    s = pd.Series(list(names), dtype="object").fillna("").astype(str)
+    s = s.str.lower().str.translate(_TRANSLIT).str.normalize("NFKD")
+    return s.str.encode("ascii", "ignore").str.decode("ascii")
+
+
+def _stem(word):
+    # İngilizce çoğul eklerini kırp (towels → towel)
+    for suffix in ("es", "s"):
+        if len(word) > 4 and word.endswith(suffix) and word[:-len(suffix)] in KEYWORDS:
+            return word[:-len(suffix)]
+    return word
+
+
+class QueryIndex:
+    """Bir sorgu + dil için önceden derlenmiş token → regex indeksi."""
+
+    def __init__(self, query_english, lang="en"):
+        words = [_stem(w) for w in _TOKEN.findall(normalize(query_english)) if len(w) > 2]
+        self.lang = lang
+        self.tokens = []
+        for word in dict.fromkeys(words):
+            entry = KEYWORDS.get(word, {})
+            # Yerel sitede komşu dilde isimlendirme de görülebiliyor; yerel kökler önek olarak eşleşir
+            stems = set(entry.get(lang, []))
+            for forms in entry.values():
+                stems.update(forms)
+            alternatives = [re.escape(word) + r"(?:e?s)?"] + [
+                re.escape(st) + (r"[a-z]{0,%d}" % _MAX_SUFFIX if len(st) >= _MIN_STEM else "")
+                for st in sorted(stems, key=len, reverse=True)]
+            pattern = re.compile(r"\b(?:" + "|".join(alternatives) + r")\b")
+            weight = 2.0 if word == words[-1] else 1.0  # eski mantıktaki "ana kelime"
+            self.tokens.append((word, pattern, weight, bool(entry)))
+        self.total = sum(w for _, _, w, _ in self.tokens)
+        # Sözlükte hiç karşılığı olmayan sorgularda yerel isimler eşleşemez
+        self.covered = lang == "en" or any(known for *_, known in self.tokens)
+
+    def score(self, names):
+        """Her isim için 0-1 arası ağırlıklı eşleşme skoru (numpy dizisi)."""
+        if not self.tokens:
+            return np.ones(len(names))
+        norm = _normalize_series(names)
+        score = np.zeros(len(norm))
+        for _, pattern, weight, _ in self.tokens:
+            score += norm.str.contains(pattern, regex=True).to_numpy(dtype=float) * weight
+        return score / self.total
+
+
+def score_batch(names, query_english, lang="en"):
+    return QueryIndex(query_english, lang).score(names)
+
+
+def filter_relevant(names, query_english, lang="en", threshold=None):
+    """Parti için alaka maskesi.
+
+    `threshold` None ise eski davranış korunur: herhangi bir anahtar kelime
+    eşleşmesi yeterli. Verilirse skor >= threshold olan satırlar geçer. Sorgu
+    sözlükte yoksa çeviri tabanlı kontrole (önbellekli) düşülür; eşik orada da
+    aynı ağırlıklarla uygulanır. Çevrilemeyen adlar elenmez.
+    """
+    names = list(names)
+    index = QueryIndex(query_english, lang)
+    if not index.covered:
+        names_en = default_cache().translate_batch(names, "en", fallback=False)
+        if threshold is None:
+            return np.array([en is None or validate_relevance(n, query_english, en) for n, en in zip(names, names_en)])
+        return np.array([en is None or translated_score(en, query_english) >= threshold for en in names_en])
+    scores = index.score(names)
+    if threshold is None:
+        return scores > 0
+    return scores >= threshold
+
+
+def translated_score(prod_en, query_english):
+    """İngilizce ad için `QueryIndex.score` ile aynı ağırlıklı skor (son kelime 2 kat), alt dize araması."""
+    keywords = list(dict.fromkeys(k for k in query_english.lower().split() if len(k) > 2))
+    if not keywords:
+        return 1.0
+    prod_en = prod_en.lower()
+    weights = [2.0 if k == keywords[-1] else 1.0 for k in keywords]
+    return sum(w for k, w in zip(keywords, weights) if k in prod_en) / sum(weights)
+
+
+def validate_relevance(product_name, query_english, prod_en=None):
+    """Çeviri tabanlı eski kontrol: ürün adını İngilizceye çevirip alt dize arar."""
+    try:
+        if prod_en is None:
+            prod_en = default_cache().translate(product_name, "en", fallback=False)
+        prod_en = prod_en.lower()
+        keywords = [k for k in query_english.lower().split() if len(k) > 2]
+        main = keywords[-1] if keywords else ""
+        if main in prod_en: return True
+        return any(k in prod_en for k in keywords)
+    except:
+        return True
@@ -0,0 +1,114 @@
+"""ScraperAPI ve Perplexity yanıtları için içerik adresli disk önbelleği.
+
+Anahtar; sağlayıcı, URL/prompt ve parametrelerin SHA-256 özetidir (API anahtarı
+hariç). Yanıtlar SQLite'ta sıkıştırılmış saklanır, marka bazında TTL uygulanır ve
+toplam boyut sınırı aşılınca en uzun süredir kullanılmayan kayıtlar silinir.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from .config import RESPONSE_CACHE_MAX_MB, RESPONSE_CACHE_PATH, RESPONSE_CACHE_TTL, RESPONSE_CACHE_TTL_BY_BRAND
+
+
+def cache_key(provider, request):
+    """Sağlayıcı + istek içeriğinden deterministik anahtar."""
+    blob = json.dumps({"provider": provider, "request": request}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path=RESPONSE_CACHE_PATH, max_bytes=RESPONSE_CACHE_MAX_MB * 1024 * 1024,
+                 ttl=RESPONSE_CACHE_TTL, ttl_by_brand=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttl_by_brand = dict(RESPONSE_CACHE_TTL_BY_BRAND if ttl_by_brand is None else ttl_by_brand)
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, provider TEXT, brand TEXT, created REAL, "
+            "last_access REAL, size INTEGER, body BLOB)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_access ON responses (last_access)")
+        self._db.commit()
+
+    def ttl_for(self, brand):
+        return self.ttl_by_brand.get(brand, self.ttl)
+
+    def get(self, provider, brand, request):
+        """TTL içindeyse saklanan yanıt metnini, değilse None döner."""
+        key = cache_key(provider, request)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT created, body FROM responses WHERE key=?", (key,)).fetchone()
+            if row and now - row[0] <= self.ttl_for(brand):
+                self._db.execute("UPDATE responses SET last_access=? WHERE key=?", (now, key))
+                self._db.commit()
+                self.hits[provider] = self.hits.get(provider, 0) + 1
+                return zlib.decompress(row[1]).decode("utf-8")
+            self.misses[provider] = self.misses.get(provider, 0) + 1
+            return None
+
+    def put(self, provider, brand, request, body):
+        key = cache_key(provider, request)
+        data = zlib.compress(body.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, brand, now, now, len(data), data),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            victims.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        self._db.executemany("DELETE FROM responses WHERE key=?", victims)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def stats(self):
+        """Sağlayıcı bazında önlenen ücretli çağrı (hit) ve miss sayıları."""
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {
+            "avoided_calls": dict(self.hits),
+            "misses": dict(self.misses),
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_response_cache():
+    """Süreç başına paylaşılan önbellek; RESPONSE_CACHE=0 ile kapalıysa None."""
+    global _default
+    if os.environ.get("RESPONSE_CACHE", "1") == "0":
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = ResponseCache()
+        return _default
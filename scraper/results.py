@@ -0,0 +1,184 @@
+"""Sabit şemalı, sütunlu sonuç tablosu.
+
+Tarama satırları arayüzde Türkçe başlıklı dict'ler olarak kalır (tek tarama
+birkaç yüz satırdır); toplu taramalarda ve dışa aktarımda ise satırlar
+`ResultTable`'da tutulur:
+
+- sütun adları ve tipleri sabittir (`SCHEMA`); fiyat sütunu para birimine göre
+  adlanmaz, `currency` sütunu taşınır;
+- ülke, marka, para birimi ve kaynak önceden bilinen kategorilerle
+  `category` tipindedir (satır başına 1 bayt kod); listede olmayan değerler
+  parçanın kategorilerine eklenir, birleştirmede parçaların kategorileri birleştirilir;
+- tablo parça (chunk) listesi olarak tutulur; `concat` veri kopyalamaz, yalnızca
+  parça listelerini birleştirir. Tek DataFrame gerektiğinde `frame()` bir kez kopyalar.
+
+Satır başına bellek: sayısal ve kategorik sütunlar 68 B (kategori kodu 4 × 1 B,
+ float64 × 4, float32 × 7, int16 × 2); 7 metin sütununun her biri
+4 B ofset + UTF-8 bayt (pandas "str", pyarrow varsa Arrow tamponu). 200 bin
+satırlık ölçümde tablo ~220 B/satır, aynı satırların dict listesi ~870 B/satır
+(`python -m benchmarks.bench_results`).
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from .config import BRANDS, COUNTRIES_META
+from .units import UNIT_COLUMNS
+
+CURRENCIES = sorted({m["curr"] for m in COUNTRIES_META.values()} | {"TRY", "USD", "EUR"})
+SOURCES = ["SCRAPERAPI", "PERPLEXITY"]
+
+# Sütun → (dtype, arayüzdeki başlık). "{curr}" görünen adda para birimiyle doldurulur.
+SCHEMA = {
+    "ts": ("float64", "Tarih"),
+    "country": (pd.CategoricalDtype(list(COUNTRIES_META)), "Ülke"),
+    "query": ("str", "Sorgu"),
+    "brand": (pd.CategoricalDtype(BRANDS), "Marka"),
+    "product": ("str", "Ürün Yerel"),
+    "product_tr": ("str", "Ürün Türkçe"),
+    "currency": (pd.CategoricalDtype(CURRENCIES), "Para Birimi"),
+    "price_local": ("float64", "Fiyat ({curr})"),
+    "usd": ("float32", "USD"),
+    "tl": ("float64", "TL"),
+    "url": ("str", "Link"),
+    "source": (pd.CategoricalDtype(SOURCES), "Kaynak"),
+    "sources": ("str", "Kaynaklar"),
+    "merged": ("int16", "Birleşen"),
+    "pieces": ("int16", "Adet"),
+    "area_m2": ("float32", "m²"),
+    "tl_per_piece": ("float32", "TL/Adet"),
+    "tl_per_m2": ("float32", "TL/m²"),
+    "tl_per_l": ("float32", "TL/L"),
+    "size": ("str", "Ölçü"),
+    "material": ("str", "Malzeme"),
+    "pack": ("float32", "Paket"),
+    "old_price_local": ("float64", "Eski Fiyat ({curr})"),
+    "discount_pct": ("float32", "İndirim %"),
+}
+# Satırda bulunmayabilen (zenginleştirme) sütunlar; tabloda NaN/None olur
+_CATEGORICAL = [c for c, (dtype, _) in SCHEMA.items() if isinstance(dtype, pd.CategoricalDtype)]
+_OPTIONAL = {"sources", "merged", "pieces", "size", "material", "pack", "old_price_local", "discount_pct",
+             *(c for c, (_, label) in SCHEMA.items() if label in UNIT_COLUMNS)}
+
+
+def _label(column, curr):
+    return SCHEMA[column][1].format(curr=curr)
+
+
+def _typed(columns):
+    frame = pd.DataFrame(columns)
+    for column, (dtype, _) in SCHEMA.items():
+        if dtype == "int16":
+            frame[column] = frame[column].fillna(1 if column in ("merged", "pieces") else 0).astype("int16")
+        elif isinstance(dtype, pd.CategoricalDtype):
+            # Bilinmeyen ülke/marka NaN'a dönmesin: kategorilere eklenir
+            extra = sorted(set(frame[column].dropna()) - set(dtype.categories))
+            frame[column] = frame[column].astype(pd.CategoricalDtype([*dtype.categories, *extra]) if extra else dtype)
+        else:
+            frame[column] = frame[column].astype(dtype)
+    return frame
+
+
+def unified_chunks(chunks):
+    """Kategorik sütunları tüm parçalarda aynı kategorilere getirir (şema kategorileri önde).
+
+    Böylece `pd.concat` kategorik tipi korur, Arrow'a yazılan her parçanın sözlüğü aynı olur.
+    """
+    union = {}
+    for column in _CATEGORICAL:
+        categories = list(SCHEMA[column][0].categories)
+        seen = set(categories)
+        for chunk in chunks:
+            for value in chunk[column].cat.categories:
+                if value not in seen:
+                    seen.add(value)
+                    categories.append(value)
+        union[column] = pd.CategoricalDtype(categories)
+    for chunk in chunks:
+        changes = {column: chunk[column].astype(dtype) for column, dtype in union.items()
+                   if chunk[column].dtype != dtype}
+        yield chunk.assign(**changes) if changes else chunk
+
+
+def _currency(chunk, default):
+    currencies = chunk["currency"].dropna().unique()
+    return currencies[0] if len(currencies) == 1 else default
+
+
+class ResultTable:
+    """`SCHEMA` tipli DataFrame parçalarının listesi."""
+
+    def __init__(self, chunks=()):
+        self.chunks = [c for c in chunks if len(c)]
+
+    @classmethod
+    def from_rows(cls, rows, country, query, curr, ts):
+        """`build_rows`/`apply_details` satırlarından (Türkçe başlıklı dict) tek parçalık tablo."""
+        if not rows:
+            return cls()
+        n = len(rows)
+        columns = {"ts": np.full(n, ts, dtype=float), "country": [country] * n, "query": [query] * n,
+                   "currency": [curr] * n}
+        for column in SCHEMA:
+            if column in columns:
+                continue
+            label = _label(column, curr)
+            if column == "price_local":
+                columns[column] = [r.get(label, r.get("Fiyat (Yerel)")) for r in rows]
+            elif column == "old_price_local":
+                columns[column] = [r.get(label, r.get("Eski Fiyat (Yerel)")) for r in rows]
+            elif column in _OPTIONAL:
+                columns[column] = [r.get(label) for r in rows]
+            else:
+                columns[column] = [r[label] for r in rows]
+        return cls([_typed(columns)])
+
+    @classmethod
+    def concat(cls, tables):
+        """Parça listelerini birleştirir; veri kopyalanmaz."""
+        return cls([chunk for table in tables for chunk in table.chunks])
+
+    def __len__(self):
+        return sum(len(c) for c in self.chunks)
+
+    @property
+    def nbytes(self):
+        """Metinler dahil toplam bellek (bayt)."""
+        return int(sum(c.memory_usage(deep=True).sum() for c in self.chunks))
+
+    def frame(self):
+        """Tek DataFrame (kategoriler korunur); boşsa şemaya uygun boş tablo."""
+        if not self.chunks:
+            return _typed({column: [] for column in SCHEMA})
+        if len(self.chunks) == 1:
+            return self.chunks[0]
+        return pd.concat(unified_chunks(self.chunks), ignore_index=True)
+
+    def display(self, curr="Yerel"):
+        """Arayüz başlıklı DataFrame; her parçanın fiyat sütunları kendi para birimiyle adlanır.
+
+        Farklı para birimli parçalar ayrı `Fiyat (BGN)`, `Fiyat (RSD)`... sütunlarına
+        düşer. `curr` boş tabloda ve karışık para birimli parçada kullanılır.
+        """
+        if not self.chunks:
+            return self.frame().rename(columns={column: _label(column, curr) for column in SCHEMA})
+        parts = [chunk.rename(columns={column: _label(column, _currency(chunk, curr)) for column in SCHEMA})
+                 for chunk in unified_chunks(self.chunks)]
+        return parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+
+
+def read_jsonl(path):
+    """`scraper.batch` JSONL çıktısından tablo; her (ülke, sorgu, tarih) bir parça olur."""
+    groups = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue  # kesilmiş son satır
+            groups.setdefault((row["Ülke"], row["Sorgu"], row["Para Birimi"], row["Tarih"]), []).append(row)
+    return ResultTable.concat(
+        ResultTable.from_rows(rows, country, query, curr, pd.Timestamp(stamp).timestamp())
+        for (country, query, curr, stamp), rows in groups.items()
+    )
@@ -0,0 +1,442 @@
+"""Zamanlanmış taramalar: SQLite iş kuyruğu ve arayüzden bağımsız çalışan daemon.
+
+Tekrarlayan tarama tanımları (ad, `scraper.batch` matrisi, periyot) `schedules`
+tablosunda tutulur. Daemon her `SCHEDULER_POLL` saniyede vadesi gelen
+tanımlar için `jobs` tablosuna iş ekler (tanımın bekleyen/çalışan işi varsa
+yenisi eklenmez; kaçırılan periyotlar birikmez) ve `SCHEDULER_WORKERS` iş
+parçacığı işleri sırayla alıp `BatchRunner` ile çalıştırır. Sonuçlar fiyat
+geçmişine ve `SCHEDULER_RUNS_DIR/<ad>/<iş>.jsonl`'e yazılır; yarıda kalan iş
+(daemon yeniden başlatılırsa) aynı dosyanın checkpoint'inden devam eder.
+
+Kotalar: ücretli sağlayıcı çağrıları (`provider_requests_total`) gün (UTC) ve
+sağlayıcı bazında `usage` tablosuna işlenir. İş başlamadan önce en kötü durum
+maliyeti (marka × sayfa, zenginleştirme linkleri) kalan kotayla karşılaştırılır;
+Hybrid iş sığmıyorsa kotası yeten tek sağlayıcıyla çalışır, hiçbiri yetmiyorsa
+ertesi güne ertelenir. Hız limitleyicileri tüm işler arasında paylaşılır.
+
+    python -m scraper.scheduler add bg-havlu --country Bulgaristan --query "Yüz Havlusu" --every 6h
+    python -m scraper.scheduler run
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from .batch import BatchRunner, expand_cells, normalize_spec
+from .config import (ENRICH_MAX_URLS, MAX_CONCURRENCY, MAX_PAGES, SCHEDULER_PATH, SCHEDULER_POLL, SCHEDULER_QUOTAS,
+                     SCHEDULER_RUNS_DIR, SCHEDULER_WORKERS)
+from .export import FORMATS
+from .fanout import build_limiters
+from .pipeline import METHODS, fetch_rates
+from .price_store import default_price_store
+from .telemetry import REGISTRY
+
+log = logging.getLogger(__name__)
+
+# Kota → sayılan `provider_requests_total` sağlayıcı etiketleri
+QUOTA_PROVIDERS = {"scraperapi": ("scraperapi", "detail"), "perplexity": ("perplexity",)}
+
+_NAME = re.compile(r"^[\w.-]+$")
+_CADENCE = re.compile(r"^(\d+(?:\.\d+)?)([smhd]?)$")
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_cadence(text):
+    """"90", "30m", "6h", "1d" → saniye."""
+    m = _CADENCE.match(str(text).strip().lower())
+    if not m or float(m.group(1)) <= 0:
+        raise ValueError(f"Geçersiz periyot: {text}")
+    return float(m.group(1)) * _UNITS[m.group(2)]
+
+
+def _today(now=None):
+    return datetime.fromtimestamp(time.time() if now is None else now, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _next_day(now):
+    day = datetime.fromtimestamp(now, timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (day + timedelta(days=1)).timestamp()
+
+
+class JobQueue:
+    def __init__(self, path=SCHEDULER_PATH):
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS schedules ("
+            "name TEXT PRIMARY KEY, spec TEXT, cadence REAL, enabled INTEGER, next_run REAL, "
+            "last_run REAL, last_status TEXT)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, schedule TEXT, spec TEXT, status TEXT, enqueued REAL, "
+            "not_before REAL, started REAL, finished REAL, worker TEXT, method TEXT, rows INTEGER, error TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, not_before)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS usage (day TEXT, provider TEXT, calls INTEGER, PRIMARY KEY (day, provider))"
+        )
+        self._db.commit()
+
+    def add_schedule(self, name, spec, cadence, start=None):
+        """Tanımı ekler ya da günceller; ilk çalıştırma `start` (None: hemen)."""
+        if not _NAME.match(name):
+            raise ValueError(f"Geçersiz ad: {name} (harf, rakam, . _ -)")
+        spec = normalize_spec(dict(spec))
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO schedules VALUES (?, ?, ?, 1, ?, NULL, NULL) "
+                "ON CONFLICT (name) DO UPDATE SET spec = excluded.spec, cadence = excluded.cadence, "
+                "next_run = excluded.next_run",
+                (name, json.dumps(spec, ensure_ascii=False), cadence, time.time() if start is None else start),
+            )
+            self._db.commit()
+
+    def remove_schedule(self, name):
+        with self._lock:
+            removed = self._db.execute("DELETE FROM schedules WHERE name = ?", (name,)).rowcount
+            self._db.execute("DELETE FROM jobs WHERE schedule = ? AND status = 'queued'", (name,))
+            self._db.commit()
+        return bool(removed)
+
+    def set_enabled(self, name, enabled):
+        with self._lock:
+            changed = self._db.execute("UPDATE schedules SET enabled = ? WHERE name = ?", (int(enabled), name)).rowcount
+            self._db.commit()
+        return bool(changed)
+
+    def enqueue_due(self, now=None):
+        """Vadesi gelen tanımlar için iş ekler; eklenen iş sayısını döner."""
+        now = time.time() if now is None else now
+        added = 0
+        with self._lock:
+            due = self._db.execute(
+                "SELECT name, spec, cadence, next_run FROM schedules WHERE enabled = 1 AND next_run <= ?", (now,)
+            ).fetchall()
+            for s in due:
+                # Kaçırılan periyotlar atlanır; bir sonraki vade şimdiden sonraki ilk periyottur
+                periods = int((now - s["next_run"]) // s["cadence"]) + 1
+                self._db.execute("UPDATE schedules SET next_run = ? WHERE name = ?",
+                                 (s["next_run"] + periods * s["cadence"], s["name"]))
+                busy = self._db.execute("SELECT 1 FROM jobs WHERE schedule = ? AND status IN ('queued', 'running')",
+                                        (s["name"],)).fetchone()
+                if busy:
+                    continue
+                self._db.execute(
+                    "INSERT INTO jobs (schedule, spec, status, enqueued, not_before) VALUES (?, ?, 'queued', ?, ?)",
+                    (s["name"], s["spec"], now, now),
+                )
+                added += 1
+            self._db.commit()
+        return added
+
+    def claim(self, worker, now=None):
+        """Sıradaki işi `running` yapıp döner; yoksa None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._db.execute(
+                "UPDATE jobs SET status = 'running', started = ?, worker = ?, error = NULL WHERE id = ("
+                "SELECT id FROM jobs WHERE status = 'queued' AND not_before <= ? ORDER BY not_before, id LIMIT 1) "
+                "RETURNING id, schedule, spec",
+                (now, worker, now),
+            ).fetchone()
+            self._db.commit()
+        if row is None:
+            return None
+        return {"id": row["id"], "schedule": row["schedule"], "spec": json.loads(row["spec"])}
+
+    def defer(self, job_id, until, reason):
+        with self._lock:
+            self._db.execute("UPDATE jobs SET status = 'queued', not_before = ?, error = ? WHERE id = ?",
+                             (until, reason, job_id))
+            self._db.commit()
+
+    def finish(self, job_id, status, method=None, rows=0, error=None):
+        now = time.time()
+        with self._lock:
+            self._db.execute("UPDATE jobs SET status = ?, finished = ?, method = ?, rows = ?, error = ? WHERE id = ?",
+                             (status, now, method, rows, error, job_id))
+            self._db.execute(
+                "UPDATE schedules SET last_run = ?, last_status = ? WHERE name = (SELECT schedule FROM jobs WHERE id = ?)",
+                (now, status, job_id),
+            )
+            self._db.commit()
+
+    def recover(self):
+        """Önceki süreçten `running` kalmış işleri kuyruğa geri alır; sayısını döner."""
+        with self._lock:
+            n = self._db.execute("UPDATE jobs SET status = 'queued', worker = NULL WHERE status = 'running'").rowcount
+            self._db.commit()
+        return n
+
+    def add_usage(self, provider, calls, day=None):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO usage VALUES (?, ?, ?) ON CONFLICT (day, provider) DO UPDATE SET calls = calls + excluded.calls",
+                (day or _today(), provider, calls),
+            )
+            self._db.commit()
+
+    def usage(self, day=None):
+        with self._lock:
+            rows = self._db.execute("SELECT provider, calls FROM usage WHERE day = ?", (day or _today(),)).fetchall()
+        return {r["provider"]: r["calls"] for r in rows}
+
+    def schedules(self):
+        """Tanımlar: ad, matris, periyot, etkin mi, sonraki/son çalıştırma ve son durum."""
+        with self._lock:
+            rows = self._db.execute("SELECT * FROM schedules ORDER BY name").fetchall()
+        return [{**dict(r), "spec": json.loads(r["spec"])} for r in rows]
+
+    def jobs(self, limit=50, schedule=None):
+        """En yeni işler (matris hariç)."""
+        sql = ("SELECT id, schedule, status, enqueued, not_before, started, finished, worker, method, rows, error "
+               "FROM jobs")
+        params = ()
+        if schedule is not None:
+            sql += " WHERE schedule = ?"
+            params = (schedule,)
+        with self._lock:
+            rows = self._db.execute(sql + " ORDER BY id DESC LIMIT ?", (*params, limit)).fetchall()
+        return [dict(r) for r in rows]
+
+
+def job_cost(spec, method):
+    """İşin sağlayıcı başına en kötü durum ücretli çağrı sayısı."""
+    cells = expand_cells(spec)
+    brands = sum(len(b) for _, _, b in cells)
+    cost = {"scraperapi": 0, "perplexity": 0}
+    if method in ("Hybrid", "ScraperAPI"):
+        cost["scraperapi"] += brands * (spec["max_pages"] or MAX_PAGES)
+    if method in ("Hybrid", "Perplexity"):
+        cost["perplexity"] += brands
+    if spec["enrich"]:
+        cost["scraperapi"] += len(cells) * ENRICH_MAX_URLS
+    return cost
+
+
+def pick_method(spec, remaining):
+    """Kalan kotaya sığan yöntem: tanımdaki, Hybrid sığmazsa tek sağlayıcı; hiçbiri yoksa None."""
+    candidates = [spec["method"]] + (["ScraperAPI", "Perplexity"] if spec["method"] == "Hybrid" else [])
+    for method in candidates:
+        if all(need <= remaining.get(p, float("inf")) for p, need in job_cost(spec, method).items()):
+            return method
+    return None
+
+
+class Quotas:
+    """Günlük sağlayıcı kotaları; kullanım süreç sayaçlarından kuyruğun `usage` tablosuna aktarılır."""
+
+    def __init__(self, queue, limits=None):
+        self.queue = queue
+        self.limits = dict(SCHEDULER_QUOTAS if limits is None else limits)
+        self._lock = threading.Lock()
+        self._seen = {p: self._counted(p) for p in self.limits}
+        self._reserved = {p: 0 for p in self.limits}
+
+    @staticmethod
+    def _counted(provider):
+        return sum(REGISTRY.total("provider_requests_total", provider=p) for p in QUOTA_PROVIDERS.get(provider, ()))
+
+    def flush(self):
+        with self._lock:
+            for p in self.limits:
+                now = self._counted(p)
+                if now > self._seen[p]:
+                    self.queue.add_usage(p, now - self._seen[p])
+                    self._seen[p] = now
+
+    def reserve(self, spec):
+        """Kotaya sığan yöntemi seçip maliyetini ayırır; sığmıyorsa None."""
+        self.flush()
+        with self._lock:
+            used = self.queue.usage()
+            remaining = {p: limit - used.get(p, 0) - self._reserved[p] for p, limit in self.limits.items()}
+            method = pick_method(spec, remaining)
+            if method is not None:
+                for p, need in job_cost(spec, method).items():
+                    if p in self._reserved:
+                        self._reserved[p] += need
+            return method
+
+    def release(self, spec, method):
+        self.flush()
+        with self._lock:
+            for p, need in job_cost(spec, method).items():
+                if p in self._reserved:
+                    self._reserved[p] -= need
+
+
+class Scheduler:
+    def __init__(self, queue, workers=SCHEDULER_WORKERS, poll=SCHEDULER_POLL, quotas=None, store=None,
+                 runs_dir=SCHEDULER_RUNS_DIR):
+        self.queue = queue
+        self.workers = workers
+        self.poll = poll
+        self.quotas = Quotas(queue, quotas)
+        self.store = default_price_store() if store is None else store
+        self.runs_dir = runs_dir
+        # Tüm işler aynı sağlayıcı hız limitlerini paylaşır
+        self.limiters = build_limiters()
+
+    def run_job(self, job, worker="main"):
+        spec = job["spec"]
+        method = self.quotas.reserve(spec)
+        if method is None:
+            until = _next_day(time.time())
+            self.queue.defer(job["id"], until, "kota")
+            log.warning("%s #%d: günlük kota yetmiyor, %s'e ertelendi", job["schedule"], job["id"],
+                        datetime.fromtimestamp(until, timezone.utc).isoformat(timespec="minutes"))
+            return
+        try:
+            rates = fetch_rates()
+            if not rates:
+                raise RuntimeError("Kur verisi alınamadı")
+            out_path = os.path.join(self.runs_dir, job["schedule"], f"{job['id']}.jsonl")
+            runner = BatchRunner({**spec, "method": method}, out_path, workers=MAX_CONCURRENCY, rates=rates,
+                                 store=self.store, incremental=spec.get("incremental", False),
+                                 export_format=spec.get("export"), limiters=self.limiters)
+            rows = runner.run(resume=True)
+        except Exception as e:
+            log.exception("%s #%d başarısız", job["schedule"], job["id"])
+            self.queue.finish(job["id"], "failed", method, error=str(e)[:200])
+        else:
+            self.queue.finish(job["id"], "done", method, rows)
+            log.info("%s #%d: %d satır (%s, %s)", job["schedule"], job["id"], rows, method, worker)
+        finally:
+            self.quotas.release(spec, method)
+
+    def _worker(self, name, stop):
+        while not stop.is_set():
+            job = self.queue.claim(name)
+            if job is None:
+                stop.wait(min(self.poll, 5))
+                continue
+            self.run_job(job, name)
+
+    def run(self, stop=None):
+        """Durdurulana kadar vadesi gelen işleri ekler ve çalıştırır."""
+        stop = stop or threading.Event()
+        recovered = self.queue.recover()
+        if recovered:
+            log.info("%d yarım iş kuyruğa geri alındı", recovered)
+        threads = [threading.Thread(target=self._worker, args=(f"worker-{i}", stop), name=f"scheduler-{i}", daemon=True)
+                   for i in range(self.workers)]
+        for t in threads:
+            t.start()
+        while not stop.is_set():
+            added = self.queue.enqueue_due()
+            if added:
+                log.info("%d iş kuyruğa eklendi", added)
+            self.quotas.flush()
+            stop.wait(self.poll)
+        for t in threads:
+            t.join()
+        self.quotas.flush()
+
+    def run_once(self):
+        """Vadesi gelenleri ekler ve kuyrukta bekleyen işleri bitirip döner (cron ile kullanım)."""
+        self.queue.recover()
+        self.queue.enqueue_due()
+        while (job := self.queue.claim("once")) is not None:
+            self.run_job(job)
+        self.quotas.flush()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_job_queue(create=True):
+    """Süreç başına paylaşılan kuyruk; SCHEDULER=0 ile kapalıysa None.
+
+    `create=False` ile veritabanı henüz yoksa (zamanlayıcı hiç kullanılmamışsa)
+    dosya oluşturulmaz, None döner; salt okuyan arayüz için.
+    """
+    global _default
+    if os.environ.get("SCHEDULER", "1") == "0":
+        return None
+    with _default_lock:
+        if _default is None:
+            if not create and not os.path.exists(SCHEDULER_PATH):
+                return None
+            _default = JobQueue()
+        return _default
+
+
+def _fmt_ts(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d %H:%M") if ts else "-"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Zamanlanmış fiyat taramaları")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    add = sub.add_parser("add", help="tekrarlayan tarama tanımı ekle/güncelle")
+    add.add_argument("name")
+    add.add_argument("--country", action="append", required=True)
+    add.add_argument("--query", action="append", required=True)
+    add.add_argument("--brand", action="append", help="yoksa ülkedeki tüm markalar")
+    add.add_argument("--every", type=parse_cadence, required=True, help="periyot: 90, 30m, 6h, 1d")
+    add.add_argument("--method", choices=METHODS, default="Hybrid")
+    add.add_argument("--max-pages", type=int)
+    add.add_argument("--enrich", action="store_true")
+    add.add_argument("--incremental", action="store_true")
+    add.add_argument("--export", choices=list(FORMATS))
+    for cmd in ("remove", "pause", "resume"):
+        sub.add_parser(cmd).add_argument("name")
+    sub.add_parser("list", help="tanımlar ve son durumları")
+    jobs = sub.add_parser("jobs", help="son işler")
+    jobs.add_argument("--limit", type=int, default=20)
+    run = sub.add_parser("run", help="daemon'u başlat")
+    run.add_argument("--workers", type=int, default=SCHEDULER_WORKERS)
+    run.add_argument("--once", action="store_true", help="vadesi gelenleri çalıştır ve çık")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    queue = JobQueue()
+    if args.cmd == "add":
+        spec = {"countries": args.country, "queries": args.query, "brands": args.brand, "method": args.method,
+                "max_pages": args.max_pages, "enrich": args.enrich, "incremental": args.incremental,
+                "export": args.export}
+        try:
+            queue.add_schedule(args.name, spec, args.every)
+        except ValueError as e:
+            ap.error(str(e))
+    elif args.cmd == "remove":
+        return 0 if queue.remove_schedule(args.name) else 1
+    elif args.cmd in ("pause", "resume"):
+        return 0 if queue.set_enabled(args.name, args.cmd == "resume") else 1
+    elif args.cmd == "list":
+        for s in queue.schedules():
+            print(f"{s['name']:20s} {'açık' if s['enabled'] else 'durdu':5s} her {s['cadence'] / 3600:.1f} sa  "
+                  f"sonraki {_fmt_ts(s['next_run'])}  son {_fmt_ts(s['last_run'])} {s['last_status'] or ''}")
+    elif args.cmd == "jobs":
+        for j in queue.jobs(args.limit):
+            print(f"#{j['id']:<5d} {j['schedule']:20s} {j['status']:8s} {_fmt_ts(j['started'])} "
+                  f"{j['method'] or '':10s} {j['rows'] or 0:6d} {j['error'] or ''}")
+    else:
+        scheduler = Scheduler(queue, workers=args.workers)
+        if args.once:
+            scheduler.run_once()
+            return 0
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        try:
+            scheduler.run(stop)
+        except KeyboardInterrupt:
+            stop.set()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
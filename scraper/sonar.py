@@ -0,0 +1,197 @@
+"""Perplexity yanıtlarından artımlı ürün çıkarma: SSE akışı, şema doğrulama, kurtarma.
+
+Sonar yanıtı akış (`"stream": true`) olarak okunur; `ProductStream` gelen metni
+tarar ve bir dizinin elemanı olan her JSON nesnesini kapandığı anda ayrıştırıp
+`PRODUCT_SCHEMA`'ya göre doğrular. Böylece ilk ürünler yanıt bitmeden elde
+edilir; bozuk tek bir eleman yalnızca kendisini düşürür. Yanıt `max_tokens`
+sınırında kesilirse yarım kalan son nesnenin güvenilir alanları kurtarılır.
+Metinden hiç geçerli ürün çıkmazsa tek parça JSON yedeğine düşülür: ürün veren
+ilk tam JSON nesnesi kullanılır.
+"""
+import json
+import re
+
+from .transport import Cancelled
+
+# Alan → (kabul edilen tipler, zorunlu mu)
+PRODUCT_SCHEMA = {
+    "name": ((str,), True),
+    "price": ((str, int, float), True),
+    "url": ((str,), False),
+}
+_DIGIT = re.compile(r"\d")
+
+
+def validate_product(item):
+    """Şemaya uyan ürünü yalnızca şema alanlarıyla döner; uymuyorsa None.
+
+    Ad boş olamaz, fiyat en az bir rakam içermelidir; tipi yanlış isteğe bağlı
+    alanlar boş bırakılır.
+    """
+    if not isinstance(item, dict):
+        return None
+    product = {}
+    for field, (types, required) in PRODUCT_SCHEMA.items():
+        value = item.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+        ok = isinstance(value, types) and not isinstance(value, bool) and value != ""
+        if not ok:
+            if required:
+                return None
+            value = ""
+        product[field] = value
+    if not _DIGIT.search(str(product["price"])):
+        return None
+    return product
+
+
+class ProductStream:
+    """Parça parça gelen metinden ürün nesnelerini tamamlandıkça çıkarır.
+
+    `feed(parça)` o ana kadar kapanan geçerli ürünleri, `close()` kesilmiş son
+    nesneden kurtarılanları (ve gerekirse tek parça JSON yedeğini) döner.
+    Bir dizinin elemanı olan en dıştaki nesneler ürün adayıdır; böylece
+    `{"products": [...]}`, çıplak liste ve markdown kod bloğu aynı şekilde işlenir.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.valid = 0
+        self.invalid = 0
+        self.salvaged = 0
+        self._pos = 0
+        self._stack = []
+        self._in_str = False
+        self._escape = False
+        self._start = None
+        self._depth = 0
+        self._commas = []
+
+    def _emit(self, blob, out):
+        try:
+            item = json.loads(blob)
+        except ValueError:
+            self.invalid += 1
+            return False
+        return self._emit_item(item, out)
+
+    def _emit_item(self, item, out):
+        product = validate_product(item)
+        if product is None and isinstance(item, dict) and isinstance(item.get("products"), list):
+            # Metindeki kapanmamış bir "[" tüm {"products": [...]} nesnesini aday yapar; içine inilir
+            return any([self._emit_item(p, out) for p in item["products"]])
+        if product is None:
+            self.invalid += 1
+            return False
+        self.valid += 1
+        out.append(product)
+        return True
+
+    def feed(self, chunk):
+        self.text += chunk
+        out = []
+        text, stack = self.text, self._stack
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_str:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_str = False
+            elif c == '"':
+                # Kapsayıcı dışındaki tırnaklar düz yazıdır
+                self._in_str = bool(stack)
+            elif c in "{[":
+                if c == "{" and self._start is None and stack and stack[-1] == "[":
+                    self._start, self._depth, self._commas = i, len(stack) + 1, []
+                stack.append(c)
+            elif c in "}]":
+                if not stack:
+                    continue
+                stack.pop()
+                if self._start is not None and len(stack) < self._depth:
+                    self._emit(text[self._start:i + 1], out)
+                    self._start = None
+            elif c == "," and self._start is not None and len(stack) == self._depth:
+                self._commas.append(i)
+        self._pos = len(text)
+        return out
+
+    def close(self):
+        out = []
+        if self._start is not None:
+            # Kesilmiş son nesne: kapanmış bir metin değeriyle bitiyorsa olduğu gibi,
+            # değilse son tam alana kadar kapatılarak denenir (yarım sayı/URL alınmaz)
+            partial = self.text[self._start:].rstrip()
+            closers = "".join("}" if c == "{" else "]" for c in reversed(self._stack[self._depth - 1:]))
+            candidates = [partial + closers] if not self._in_str and partial.endswith('"') else []
+            if self._commas:
+                candidates.append(self.text[self._start:self._commas[-1]] + "}")
+            for blob in candidates:
+                try:
+                    product = validate_product(json.loads(blob))
+                except ValueError:
+                    continue
+                if product is not None:
+                    self.salvaged += 1
+                    out.append(product)
+                    break
+            self._start = None
+        if not self.valid and not out:
+            out.extend(self._whole())
+        return out
+
+    def _whole(self):
+        # Her "{" konumundan tam bir JSON değeri denenir; ürün veren ilk değer kullanılır
+        decoder = json.JSONDecoder()
+        start = self.text.find("{")
+        while start != -1:
+            try:
+                data, _ = decoder.raw_decode(self.text, start)
+            except ValueError:
+                data = None
+            if isinstance(data, dict):
+                items = data.get("products")
+                out = []
+                for item in items if isinstance(items, list) else [data]:
+                    self._emit_item(item, out)
+                if out:
+                    return out
+            start = self.text.find("{", start + 1)
+        return []
+
+
+def parse_products(text):
+    """Tam metinden (önbellek/kayıt) ürün listesi."""
+    stream = ProductStream()
+    return stream.feed(text) + stream.close()
+
+
+def iter_completion(response, cancel=None):
+    """Chat completion yanıtından (metin parçası, bitiş nedeni) çiftleri üretir.
+
+    `text/event-stream` yanıtında her SSE `data:` olayının `delta.content`'i
+    geldikçe verilir; akışsız JSON yanıtta (kayıt oynatma, eski sunucu) tüm
+    içerik tek parça döner. `cancel` set edilince bağlantı kapatılır ve
+    `Cancelled` yükseltilir.
+    """
+    with response:
+        if "event-stream" not in response.headers.get("Content-Type", ""):
+            choice = response.json()["choices"][0]
+            yield choice["message"]["content"], choice.get("finish_reason")
+            return
+        for line in response.iter_lines():
+            if cancel is not None and cancel.is_set():
+                raise Cancelled("iptal edildi")
+            if not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                return
+            choice = (json.loads(data).get("choices") or [{}])[0]
+            delta = (choice.get("delta") or {}).get("content") or ""
+            if delta or choice.get("finish_reason"):
+                yield delta, choice.get("finish_reason")
@@ -0,0 +1,161 @@
+"""Hafif enstrümantasyon: span'ler, tarama başına iz (trace) ve Prometheus sayaçları.
+
+`span("parse", brand=...)` bloğunun süresi her zaman süreç genelindeki
+`REGISTRY`'ye, etkin bir `Trace` varsa ona da yazılır. Etkin iz bir
+`contextvars` değişkeninde tutulur; `fan_out` ve Hybrid yarışı işleri çağıranın
+bağlamında çalıştırdığından iş parçacıklarına kendiliğinden taşınır.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar("scan_trace", default=None)
+
+
+class Trace:
+    """Bir taramanın span kayıtları: (ad, marka, başlangıç, bitiş, ek alanlar)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, name, brand, start, end, attrs):
+        with self._lock:
+            self.spans.append((name, brand, start, end, attrs))
+
+    def records(self):
+        """Waterfall için taramanın başından itibaren saniye cinsinden span listesi."""
+        with self._lock:
+            spans = list(self.spans)
+        return [
+            {"stage": name, "brand": brand or "—", "start": start - self.started, "end": end - self.started,
+             "seconds": end - start, **attrs}
+            for name, brand, start, end, attrs in sorted(spans, key=lambda s: s[2])
+        ]
+
+    def summary(self):
+        """Aşama başına çağrı sayısı, toplam ve en uzun süre (sn)."""
+        out = {}
+        with self._lock:
+            spans = list(self.spans)
+        for name, _, start, end, _ in spans:
+            s = out.setdefault(name, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+            s["count"] += 1
+            s["total_s"] += end - start
+            s["max_s"] = max(s["max_s"], end - start)
+        return out
+
+    def wall(self):
+        with self._lock:
+            return max((end for _, _, _, end, _ in self.spans), default=self.started) - self.started
+
+
+def _label(value):
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value).replace('"', "").replace("\\", "")
+
+
+class Registry:
+    """Süreç ömrü boyunca biriken sayaçlar ve süre toplamları (Prometheus metin biçimi)."""
+
+    def __init__(self, prefix="lcw"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timings = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def total(self, name, **labels):
+        """`labels`'ı içeren tüm `name` sayaçlarının toplamı."""
+        match = set(labels.items())
+        with self._lock:
+            return sum(v for (n, key), v in self._counters.items() if n == name and match <= set(key))
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            total, count = self._timings.get(key, (0.0, 0))
+            self._timings[key] = (total + seconds, count + 1)
+
+    def prometheus(self):
+        def fmt(labels):
+            if not labels:
+                return ""
+            return "{" + ",".join(f'{k}="{_label(v)}"' for k, v in labels) + "}"
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            timings = sorted(self._timings.items())
+        lines, typed = [], set()
+        for (name, labels), value in counters:
+            metric = f"{self.prefix}_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{fmt(labels)} {value}")
+        for (name, labels), (total, count) in timings:
+            metric = f"{self.prefix}_{name}_seconds"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} summary")
+                typed.add(metric)
+            lines.append(f"{metric}_sum{fmt(labels)} {total:.6f}")
+            lines.append(f"{metric}_count{fmt(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """node_exporter textfile collector için atomik yazım."""
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+
+REGISTRY = Registry()
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def activate(trace):
+    """`trace`'i bu bağlamda (ve buradan başlatılan fan_out işlerinde) etkin iz yapar."""
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name, brand=None, **attrs):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        REGISTRY.observe("stage", end - start, stage=name)
+        trace = _current.get()
+        if trace is not None:
+            trace.add(name, brand, start, end, attrs)
+
+
+def log_trace(logger, trace, **fields):
+    """İz özetini tek satırlık JSON olarak loglar (yapılandırılmış log)."""
+    record = {"event": "scan", **fields, "wall_s": round(trace.wall(), 4),
+              "stages": {k: {"count": v["count"], "total_s": round(v["total_s"], 4), "max_s": round(v["max_s"], 4)}
+                         for k, v in trace.summary().items()}}
+    logger.info(json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,169 @@
+"""Kalıcı çeviri önbelleği: bellek içi LRU + SQLite, toplu GoogleTranslator çağrıları."""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from deep_translator import GoogleTranslator
+
+CACHE_PATH = os.environ.get("TRANSLATION_CACHE", os.path.join(".cache", "translations.sqlite3"))
+
+# GoogleTranslator tek istekte 5000 karakter kabul ediyor; ayraçlara pay bırak
+BATCH_CHARS = 4500
+SEPARATOR = "\n"
+
+
+class TranslationCache:
+    """(metin, kaynak, hedef) anahtarlı çeviri katmanı.
+
+    Önce bellekteki LRU'ya, sonra diskteki SQLite tablosuna bakar; bulunamayan
+    metinler tek bir (gerekirse parçalı) GoogleTranslator isteğiyle çevrilir.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_items=5000, translator_factory=GoogleTranslator):
+        self.max_items = max_items
+        self.translator_factory = translator_factory
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.calls = 0
+        self.call_seconds = 0.0
+        self.translated = 0
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "text TEXT, source TEXT, target TEXT, result TEXT, "
+                "PRIMARY KEY (text, source, target))"
+            )
+            self._db.commit()
+
+    # --- önbellek ---
+    def _get(self, key):
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            self.hits += 1
+            return self._mem[key]
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT result FROM translations WHERE text=? AND source=? AND target=?", key
+            ).fetchone()
+            if row:
+                self.disk_hits += 1
+                self._remember(key, row[0])
+                return row[0]
+        return None
+
+    def _remember(self, key, value):
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_items:
+            self._mem.popitem(last=False)
+
+    def _store(self, items):
+        for key, value in items:
+            self._remember(key, value)
+        if self._db is not None and items:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                [(*key, value) for key, value in items],
+            )
+            self._db.commit()
+
+    # --- ağ ---
+    def _call(self, text, source, target):
+        t0 = time.perf_counter()
+        try:
+            return self.translator_factory(source=source, target=target).translate(text)
+        finally:
+            # Sayaçlar eşzamanlı iş parçacıklarından güncellenir
+            with self._lock:
+                self.calls += 1
+                self.call_seconds += time.perf_counter() - t0
+
+    def _translate_chunk(self, texts, source, target):
+        """Metinleri ayraçla birleştirip tek istekte çevirir; satır sayısı tutmazsa tek tek çevirir."""
+        if len(texts) == 1:
+            return [self._call(texts[0], source, target) or texts[0]]
+        joined = self._call(SEPARATOR.join(texts), source, target) or ""
+        parts = joined.split(SEPARATOR)
+        if len(parts) == len(texts):
+            return [p.strip() or t for p, t in zip(parts, texts)]
+        return [self._call(t, source, target) or t for t in texts]
+
+    # --- genel API ---
+    def translate_batch(self, texts, target, source="auto", fallback=True):
+        """Metin listesini sırasını koruyarak çevirir.
+
+        Çevrilemeyen metinler için `fallback` True ise orijinal metin, değilse None döner.
+        """
+        results = {}
+        pending = []
+        with self._lock:
+            for text in dict.fromkeys(t for t in texts if t):
+                key = (text, source, target)
+                cached = self._get(key)
+                if cached is None:
+                    self.misses += 1
+                    pending.append(text)
+                else:
+                    results[text] = cached
+
+        chunk, size, fresh = [], 0, []
+        for text in pending + [None]:
+            if text is None or (chunk and size + len(text) + 1 > BATCH_CHARS):
+                if chunk:
+                    try:
+                        translated = self._translate_chunk(chunk, source, target)
+                        fresh.extend(((t, source, target), r) for t, r in zip(chunk, translated))
+                        with self._lock:
+                            self.translated += len(chunk)
+                    except Exception:
+                        # Ağ hatası: önbelleğe yazma
+                        results.update({t: t if fallback else None for t in chunk})
+                chunk, size = [], 0
+                if text is None:
+                    break
+            chunk.append(text)
+            size += len(text) + 1
+
+        with self._lock:
+            self._store(fresh)
+        results.update({key[0]: value for key, value in fresh})
+        return [results.get(t, t) if t else t for t in texts]
+
+    def translate(self, text, target, source="auto", fallback=True):
+        if not text:
+            return text
+        return self.translate_batch([text], target, source, fallback)[0]
+
+    def stats(self):
+        """Hit/miss sayaçları ve önbelleğin kazandırdığı tahmini süre."""
+        with self._lock:
+            avg = self.call_seconds / self.translated if self.translated else 0.0
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "calls": self.calls,
+                "call_seconds": round(self.call_seconds, 3),
+                "saved_seconds": round((self.hits + self.disk_hits) * avg, 3),
+            }
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """Süreç başına tek paylaşılan önbellek."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = TranslationCache()
+        return _default
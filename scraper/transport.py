@@ -0,0 +1,157 @@
+"""Tüm sağlayıcı istemcilerinin paylaştığı HTTP katmanı.
+
+Tek `requests.Session` üzerinden keep-alive bağlantı havuzu, host başına eşzamanlı
+istek sınırı, 429/5xx ve bağlantı hatalarında üstel geri çekilme (Retry-After'a
+uyarak) ve çağrı başına toplam süre bütçesi sağlar. Her deneme için gecikme,
+durum kodu ve bayt sayısı kaydedilir; `stats()` host bazında özetler.
+"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import (HTTP_BACKOFF, HTTP_HOST_LIMIT, HTTP_HOST_LIMITS, HTTP_MAX_RETRIES, HTTP_POOL_SIZE,
+                     HTTP_TIMEOUT_BUDGET)
+from .telemetry import REGISTRY
+
+log = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class BudgetExceeded(requests.Timeout):
+    """Çağrının toplam süre bütçesi denemeler arasında tükendi."""
+
+
+class Cancelled(requests.RequestException):
+    """Çağrı, `cancel` olayı set edildiği için yeni deneme yapmadan bırakıldı."""
+
+
+class Transport:
+    def __init__(self, pool_size=HTTP_POOL_SIZE, host_limits=None, host_limit=HTTP_HOST_LIMIT,
+                 max_retries=HTTP_MAX_RETRIES, backoff=HTTP_BACKOFF, budget=HTTP_TIMEOUT_BUDGET, history=5000):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.host_limits = dict(HTTP_HOST_LIMITS if host_limits is None else host_limits)
+        self.host_limit = host_limit
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.budget = budget
+        self.metrics = deque(maxlen=history)
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host):
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(self.host_limits.get(host, self.host_limit))
+            return slot
+
+    def _record(self, host, method, status, started, size, attempt, error=None):
+        ms = (time.perf_counter() - started) * 1000
+        self.metrics.append({"host": host, "method": method, "status": status, "ms": ms,
+                             "bytes": size, "attempt": attempt, "error": error})
+        REGISTRY.inc("http_requests_total", host=host, status=status or error)
+        REGISTRY.inc("http_response_bytes_total", size, host=host)
+        REGISTRY.observe("http_request", ms / 1000, host=host)
+        log.debug("%s %s -> %s %.0f ms %d B (deneme %d)", method, host, status or error, ms, size, attempt)
+
+    def _wait(self, attempt, deadline, retry_after=None, cancel=None):
+        """Sonraki denemeye kadar bekler; bütçe yetmiyorsa False döner."""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = self.backoff * 2 ** (attempt - 1) * (0.5 + random.random())
+        if time.monotonic() + delay >= deadline:
+            return False
+        if cancel is None:
+            time.sleep(delay)
+        elif cancel.wait(delay):
+            raise Cancelled("iptal edildi")
+        return True
+
+    def request(self, method, url, timeout=30, budget=None, cancel=None, **kwargs):
+        """`requests.request` gibi; yeniden denemeler dahil toplam süre `budget` saniyeyi aşmaz.
+
+        Denemeler tükenince son yanıt (429/5xx olsa bile) döner ya da son bağlantı
+        hatası yükseltilir. `cancel` (threading.Event) set edilince yeni deneme ya
+        da bekleme yapılmaz, `Cancelled` yükseltilir; süren istek yarıda kesilmez.
+        `stream=True` ile gövde okunmadan döner; bütçe gövdenin okunmasını kapsamaz.
+        """
+        host = urlsplit(url).netloc
+        deadline = time.monotonic() + (self.budget if budget is None else budget)
+        attempt = 0
+        while True:
+            attempt += 1
+            if cancel is not None and cancel.is_set():
+                raise Cancelled("iptal edildi")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise BudgetExceeded(f"{host}: süre bütçesi aşıldı ({attempt - 1} deneme)")
+            started = time.perf_counter()
+            error = None
+            with self._slot(host):
+                try:
+                    resp = self.session.request(method, url, timeout=min(timeout, remaining), **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    self._record(host, method, None, started, 0, attempt, type(e).__name__)
+                    error = e
+            # Bekleme slot bırakıldıktan sonra yapılır; aynı host'a giden diğer istekler engellenmez
+            if error is not None:
+                if attempt > self.max_retries or not self._wait(attempt, deadline, cancel=cancel):
+                    raise error
+                continue
+            # Akış (stream=True) yanıtında gövde okunmaz; boyut başlıktan alınır
+            size = int(resp.headers.get("Content-Length") or 0) if kwargs.get("stream") else len(resp.content)
+            self._record(host, method, resp.status_code, started, size, attempt)
+            if (resp.status_code in RETRY_STATUSES and attempt <= self.max_retries
+                    and self._wait(attempt, deadline, resp.headers.get("Retry-After"), cancel)):
+                resp.close()
+                continue
+            return resp
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """Host bazında istek/hata/yeniden deneme sayısı, p50/p95 gecikme (ms) ve toplam bayt."""
+        by_host = {}
+        for m in list(self.metrics):
+            by_host.setdefault(m["host"], []).append(m)
+        out = {}
+        for host, items in by_host.items():
+            ms = np.array([m["ms"] for m in items])
+            out[host] = {
+                "requests": len(items),
+                "errors": sum(1 for m in items if m["error"] or (m["status"] or 0) >= 400),
+                "retries": sum(1 for m in items if m["attempt"] > 1),
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "bytes": sum(m["bytes"] for m in items),
+            }
+        return out
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_transport():
+    """Süreç başına paylaşılan taşıma katmanı."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Transport()
+        return _default
@@ -0,0 +1,117 @@
+"""Birim fiyat normalizasyonu: ürün adından ölçü, paket adedi ve hacim; TL/adet, TL/m², TL/L.
+
+"30×50 havlu" ile "3'lü 50×90 havlu set" doğrudan karşılaştırılamaz. Adlar
+(bg/bs/sr/en/tr yazımlarıyla) küçük harfe indirilip önceden derlenmiş regex'lerle
+tüm parti için tek geçişte taranır:
+
+- ölçü: "50x90", "50 х 90 см", "500×900 mm", "1,5x2 m" → m²; adda birden fazla
+  ölçü varsa (set) alanlar toplanır ve her ölçü bir parça sayılır
+- paket: "3 бр", "3 kom", "2 pcs", "комплект от 3", "set od 3", "3'lü", "3-pack"
+- hacim: "500 ml", "1,5 л", "75 cl" → litre
+
+Zenginleştirmeden gelen "Paket" ve "Ölçü" yalnızca adda paket adedi ya da
+ölçü bulunamayan satırlar için yedek olarak kullanılır.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+UNIT_COLUMNS = ["Adet", "m²", "TL/Adet", "TL/m²", "TL/L"]
+
+_NUM = r"(\d+(?:[.,]\d+)?)"
+_X = r"\s*[x×х*]\s*"
+_DIMS = re.compile(_NUM + _X + _NUM + r"(?:" + _X + r"\d+(?:[.,]\d+)?)?\s*(?P<unit>cm|см|mm|мм|m|м)?(?![a-zа-я])")
+_PACK = re.compile(
+    r"(?:(?P<n1>\d{1,3})\s*-?\s*(?:бр|броя|брой|pcs|pc|pieces|pack|pk|kom|komada|komad|kos|шт|adet|parça|db)\b"
+    r"|(?:комплект|к-т|сет|set|komplet|paket|pakovanje|pack)\s*(?:от|од|od|of|:)?\s*(?P<n2>\d{1,3})\b"
+    r"|(?P<n3>\d{1,3})\s*['’]?\s*l[iıuü]\b)"
+)
+_VOLUME = re.compile(_NUM + r"\s*(?P<unit>ml|мл|cl|l|л|lt|литра|литър|litra)\b")
+# Ucuz ön filtreler: tam regex'ler yalnızca aday satırlarda çalışır
+_HAS_DIMS = re.compile(r"\d" + _X + r"\d")
+_HAS_PACK = re.compile(r"бр|pcs|pc\b|pieces|pack|pk\b|kom|kos\b|шт|adet|parça|db\b|комплект|к-т|сет|set|paket|pakovanje"
+                       r"|\dl[iıuü]\b|\d\s*['’]")
+_HAS_VOLUME = re.compile(r"\d\s*(?:ml|мл|cl|l|л|lt)\b|литр|литър|litr")
+
+_TO_CM = {"mm": 0.1, "мм": 0.1, "m": 100.0, "м": 100.0}
+_TO_L = {"ml": 0.001, "мл": 0.001, "cl": 0.01}
+
+
+def _number(s):
+    return pd.to_numeric(s.str.replace(",", ".", regex=False), errors="coerce").to_numpy(dtype=float)
+
+
+def parse_units(names):
+    """Adlardan {"pieces", "dims", "area_m2", "volume_l"} DataFrame'i (bulunamayan NaN).
+
+    `pieces` açık paket adedi, `dims` adda geçen ölçü sayısı, `area_m2` bu
+    ölçülerin toplam alanıdır (paket adediyle çarpılmamış).
+    """
+    # object dtype: regex'ler Python `re` ile çalışır. pandas 3'ün "str" tipi RE2 kullanır;
+    # orada `\b` yalnızca ASCII harfleri tanır ve Kiril/Türkçe birimler kaçar
+    s = pd.Series(names, dtype="object").fillna("").map(str).str.lower().astype(object).reset_index(drop=True)
+    n = len(s)
+    out = pd.DataFrame({"pieces": np.nan, "dims": 0, "area_m2": np.nan, "volume_l": np.nan}, index=range(n))
+    if not n:
+        return out
+
+    dims = s[s.str.contains(_HAS_DIMS)].str.extractall(_DIMS)
+    if len(dims):
+        scale = dims["unit"].map(_TO_CM).fillna(1.0).to_numpy()
+        area = _number(dims[0]) * scale * _number(dims[1]) * scale / 10_000
+        per_row = pd.Series(area, index=dims.index.get_level_values(0)).groupby(level=0)
+        out.loc[per_row.sum().index, "area_m2"] = per_row.sum()
+        out.loc[per_row.size().index, "dims"] = per_row.size()
+
+    candidates = s[s.str.contains(_HAS_PACK)]
+    if len(candidates):
+        pack = candidates.str.extract(_PACK)
+        pieces = pd.to_numeric(pack["n1"].fillna(pack["n2"]).fillna(pack["n3"]), errors="coerce")
+        out.loc[pieces.index, "pieces"] = pieces.where(pieces.between(1, 100))
+
+    candidates = s[s.str.contains(_HAS_VOLUME)]
+    if len(candidates):
+        vol = candidates.str.extract(_VOLUME)
+        out.loc[vol.index, "volume_l"] = _number(vol[0]) * vol["unit"].map(_TO_L).fillna(1.0).to_numpy()
+    return out
+
+
+def unit_prices(names, tl, packs=None, sizes=None):
+    """UNIT_COLUMNS sütunlu DataFrame: paket adedi, toplam alan ve TL birim fiyatları."""
+    u = parse_units(names)
+    tl = np.asarray(tl, dtype=float)
+    pieces = u["pieces"]
+    if packs is not None:
+        pieces = pieces.fillna(pd.Series(pd.to_numeric(pd.Series(packs, dtype="object"), errors="coerce").to_numpy()))
+    # Adda birden fazla ölçü varsa (farklı boyutlu set) her ölçü bir parçadır
+    pieces = pieces.fillna(u["dims"].where(u["dims"] > 1)).fillna(1.0).to_numpy()
+
+    area = u["area_m2"].to_numpy()
+    if sizes is not None:
+        fallback = parse_units(sizes)["area_m2"].to_numpy()
+        area = np.where(np.isnan(area), fallback, area)
+    single = u["dims"].to_numpy() <= 1
+    total_area = np.where(single, area * pieces, area)
+    total_volume = u["volume_l"].to_numpy() * pieces
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.DataFrame({
+            "Adet": pieces.astype(int),
+            "m²": np.round(total_area, 4),
+            "TL/Adet": tl / pieces,
+            "TL/m²": np.where(total_area > 0, tl / total_area, np.nan),
+            "TL/L": np.where(total_volume > 0, tl / total_volume, np.nan),
+        })
+
+
+def add_unit_columns(rows):
+    """Sonuç satırlarına (dict listesi) UNIT_COLUMNS'u ekler; eksik değerler None olur."""
+    if not rows:
+        return rows
+    table = unit_prices([r.get("Ürün Yerel", "") for r in rows], [r["TL"] for r in rows],
+                        packs=[r.get("Paket") for r in rows], sizes=[r.get("Ölçü") or "" for r in rows])
+    records = table.astype(object).where(table.notna(), None).to_dict("records")
+    for row, units in zip(rows, records):
+        row.update(units)
+    return rows
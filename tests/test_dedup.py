@@ -0,0 +1,46 @@
+from scraper.dedup import canonical_url, dedupe_rows
+from scraper.incremental import merge_rows
+
+
+def row(brand, name, source, url="", tl=100.0):
+    return {"Marka": brand, "Ürün Yerel": name, "Ürün Türkçe": name, "TL": tl, "Link": url, "Kaynak": source}
+
+
+def test_canonical_url_drops_tracking_and_www():
+    assert canonical_url("https://WWW.pepco.bg/p/1/?utm_source=x&color=red") == "https://pepco.bg/p/1?color=red"
+
+
+def test_cross_source_duplicate_collapses_on_merge():
+    fresh = dedupe_rows([row("Pepco", "Кърпа за баня 50x90 см синя", "PERPLEXITY", "https://ex.com/a")])
+    reused = dedupe_rows([row("Pepco", "Кърпа за баня 50x90 см, синя", "SCRAPERAPI", "https://pepco.bg/p/7"),
+                          row("Pepco", "Постелка за баня 40x60", "SCRAPERAPI", "https://pepco.bg/p/8")])
+    merged = merge_rows(fresh, reused, ["Pepco"])
+    assert len(merged) == 2
+    towel = next(r for r in merged if r["Birleşen"] == 2)
+    assert towel["Kaynak"] == "SCRAPERAPI"
+    assert set(towel["Kaynaklar"].split(", ")) == {"PERPLEXITY", "SCRAPERAPI"}
+
+
+def test_cross_run_duplicate_collapses_by_url():
+    earlier = dedupe_rows([row("Pepco", "Towel 50x90", "SCRAPERAPI", "https://pepco.bg/p/1?utm_source=a", tl=90.0)])
+    now = dedupe_rows([row("Pepco", "Towel 50x90", "SCRAPERAPI", "https://www.pepco.bg/p/1/", tl=95.0)])
+    merged = merge_rows(now, earlier, ["Pepco"])
+    assert len(merged) == 1
+    assert merged[0]["TL"] == 95.0  # taze satır kalır
+    assert merged[0]["Birleşen"] == 2 and merged[0]["Kaynaklar"] == "SCRAPERAPI"
+
+
+def test_merge_is_idempotent_and_keeps_brand_order():
+    rows = [row("Sinsay", "Mat 40x60", "SCRAPERAPI", "https://s.com/1"),
+            row("Pepco", "Towel 50x90", "PERPLEXITY", "https://ex.com/1"),
+            row("Pepco", "Towel 50x90", "SCRAPERAPI", "https://p.com/1")]
+    once = merge_rows(dedupe_rows(rows), [], ["Pepco", "Sinsay"])
+    twice = merge_rows(once, [], ["Pepco", "Sinsay"])
+    assert [r["Marka"] for r in twice] == ["Pepco", "Sinsay"]
+    assert [r["Birleşen"] for r in twice] == [2, 1]
+
+
+def test_same_source_variants_stay_apart():
+    rows = [row("Pepco", "Towel 50x90 blue", "SCRAPERAPI", "https://p.com/1"),
+            row("Pepco", "Towel 50x90 bluee", "SCRAPERAPI", "https://p.com/2")]
+    assert len(merge_rows(rows, [], ["Pepco"])) == 2
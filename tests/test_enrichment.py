@@ -0,0 +1,48 @@
+from benchmarks.fake_server import render_detail
+from scraper.enrichment import parse_detail
+from scraper.units import unit_prices
+
+
+def page(body):
+    return f"<html><body><main>{body}</main></body></html>"
+
+
+def test_fake_detail_page():
+    detail = parse_detail("Pepco", render_detail("Pepco", 1), "BGN")
+    assert detail["size"] == "50x90"
+    assert detail["pack"] == 2
+    assert detail["old_price"] == 13.99
+
+
+def test_pack_ignores_recommendation_cards():
+    html = page('<div class="product-detail"><h1>Кърпа 50x90</h1><p>Памук</p></div>'
+                '<section class="carousel"><div>Чаши 6 бр</div><div>Салфетки 3 бр</div></section>')
+    assert parse_detail("Pepco", html, "BGN")["pack"] is None
+
+
+def test_pack_from_title_block_without_product_class():
+    html = page('<div><h1>Кърпа</h1><p>Комплект 3 бр</p></div><aside><div>Чаши 6 бр</div></aside>')
+    assert parse_detail("Jysk", html, "BGN")["pack"] == 3
+
+
+def test_pack_ignores_script_text():
+    html = page('<div class="product-info"><h1>Кърпа</h1><script>var t = "12 pcs";</script></div>')
+    assert parse_detail("Pepco", html, "BGN")["pack"] is None
+
+
+def test_size_is_anchored():
+    assert parse_detail("Jysk", page("<p>SKU4500x12 · арт. 12x3AB</p>"), "BGN")["size"] is None
+    assert parse_detail("Jysk", page("<p>Размер: 50 х 90 см.</p>"), "BGN")["size"] == "50x90 см"
+    assert parse_detail("Jysk", page("<p>(40x60)</p>"), "BGN")["size"] == "40x60"
+
+
+def test_name_pack_wins_over_page_pack():
+    table = unit_prices(["Кърпи 3 бр", "Кърпа"], [30.0, 30.0], packs=[6, 2])
+    assert table["Adet"].tolist() == [3, 2]
+
+
+def test_xml_declaration_and_empty_page():
+    html = '<?xml version="1.0" encoding="utf-8"?>' + page('<div class="product-detail"><h1>Кърпа</h1><p>3 бр</p></div>')
+    assert parse_detail("Pepco", html, "BGN")["pack"] == 3
+    for empty in ("", "  \n", b""):
+        assert parse_detail("Pepco", empty, "BGN") == dict.fromkeys(("size", "material", "pack", "old_price"))
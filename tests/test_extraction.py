@@ -0,0 +1,60 @@
+import pytest
+
+from benchmarks.bench_extraction import legacy_extract, synthetic_page
+from benchmarks.fake_server import render_listing
+from scraper.config import SITE_SELECTORS
+from scraper.extraction import BrandExtractor
+
+BASE = "https://example.com"
+
+
+def _card(brand, inner_name, price="9,99 лв"):
+    sel = SITE_SELECTORS[brand]
+    card_tag, _, card_cls = sel["product"][0].partition(".")
+    name_tag, _, name_cls = sel["name"][0].partition(".")
+    price_tag, _, price_cls = sel["price"][0].partition(".")
+    card_tag, name_tag, price_tag = card_tag or "div", name_tag or "div", price_tag or "div"
+    return (f'<html><body><{card_tag} class="{card_cls}"><a href="/p/1">'
+            f'<{name_tag} class="{name_cls}">{inner_name}</{name_tag}></a>'
+            f'<{price_tag} class="{price_cls}">{price}</{price_tag}></{card_tag}></body></html>')
+
+
+def _fresh(brand):
+    return BrandExtractor(brand, SITE_SELECTORS[brand])
+
+
+@pytest.mark.parametrize("brand", sorted(SITE_SELECTORS))
+def test_listing_parity_with_bs4(brand):
+    for html in (render_listing(brand, 20), synthetic_page(brand, 30)):
+        assert _fresh(brand).extract(html, BASE) == legacy_extract(brand, html, BASE)
+
+
+@pytest.mark.parametrize("inner", [
+    'Towel<b>x</b><script>var a=1</script>',
+    'Towel <style>.a{color:red}</style> 50x90',
+    'Towel<!-- promo --><template><i>hidden</i></template> set',
+    '漢<ruby>字<rt>ji</rt><rp>(</rp></ruby>',
+    '  Towel\n  <span> 3 бр </span>',
+])
+def test_hidden_text_parity_with_bs4(inner):
+    brand = "Pepco"
+    html = _card(brand, inner)
+    got = _fresh(brand).extract(html, BASE)
+    assert got == legacy_extract(brand, html, BASE)
+    assert "var a" not in got[0]["name"] and "color" not in got[0]["name"]
+
+
+@pytest.mark.parametrize("decl", ['<?xml version="1.0" encoding="utf-8"?>\n',
+                                  '  <?xml version="1.0" encoding="windows-1251"?>'])
+def test_xml_declaration_parity_with_bs4(decl):
+    brand = "Pepco"
+    html = decl + _card(brand, "Кърпа 50x90")
+    got = _fresh(brand).extract(html, BASE)
+    assert got == legacy_extract(brand, html, BASE)
+    assert got[0]["name"] == "Кърпа 50x90"
+    assert _fresh(brand).extract(html.encode("utf-8") if "utf-8" in decl else html, BASE)[0]["price"] == "9,99 лв"
+
+
+@pytest.mark.parametrize("html", ["", "   \n\t", "<!-- boş -->", b""])
+def test_empty_document(html):
+    assert _fresh("Pepco").extract(html, BASE) == []
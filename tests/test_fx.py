@@ -0,0 +1,24 @@
+import time
+
+import pytest
+
+from scraper import fx
+from scraper.fx import FxStore
+
+
+@pytest.mark.parametrize("tz", ["Etc/GMT+12", "Pacific/Kiritimati"])
+def test_as_of_defaults_to_utc_day(tmp_path, monkeypatch, tz):
+    store = FxStore(str(tmp_path / "fx.sqlite3"))
+    now = time.time()
+    store.save({"EUR": 45.0}, now)
+    store.save({"EUR": 46.0}, now + 86400)
+    # Yerel gün UTC gününden önde ya da geride olsa da bugünün (UTC) seti döner
+    monkeypatch.setenv("TZ", tz)
+    time.tzset()
+    try:
+        rates = store.as_of()
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
+    assert rates.day == fx._day(now)
+    assert rates["EUR"] == 45.0
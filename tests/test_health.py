@@ -0,0 +1,35 @@
+import sqlite3
+
+from scraper import health as health_mod
+from scraper.health import HealthTracker
+
+
+def test_cache_hits_are_not_recorded():
+    tracker = HealthTracker(path=None)
+    cached = tracker.track("Bulgaristan", "Pepco", "scraperapi", lambda cancel=None: {"products": [{}], "cached": True})
+    fresh = tracker.track("Bulgaristan", "Pepco", "scraperapi", lambda cancel=None: {"products": [{}], "cached": False})
+    for _ in range(3):
+        cached()
+    assert tracker.snapshot() == []
+    fresh()
+    assert tracker.snapshot()[0]["calls"] == 1
+
+
+def test_old_outcomes_are_pruned(tmp_path, monkeypatch):
+    path = str(tmp_path / "health.sqlite3")
+    tracker = HealthTracker(path=path, retention=3600)
+    tracker.record("Bulgaristan", "Pepco", "scraperapi", True, 1.0, 5)
+    db = sqlite3.connect(path)
+    db.execute("UPDATE outcomes SET ts = ts - 7200")
+    db.commit()
+
+    assert HealthTracker(path=path, retention=3600).snapshot() == []
+    assert db.execute("SELECT COUNT(*) FROM outcomes").fetchone()[0] == 0
+
+    monkeypatch.setattr(health_mod, "_PRUNE_EVERY", 2)
+    tracker = HealthTracker(path=path, retention=3600)
+    tracker.record("Bulgaristan", "Pepco", "scraperapi", True, 1.0, 5)
+    db.execute("UPDATE outcomes SET ts = ts - 7200")
+    db.commit()
+    tracker.record("Bulgaristan", "Pepco", "scraperapi", True, 1.0, 5)
+    assert db.execute("SELECT COUNT(*) FROM outcomes").fetchone()[0] == 1
@@ -0,0 +1,18 @@
+from scraper.incremental import plan, record_scan
+from scraper.price_store import PriceStore
+
+PRODUCTS = [{"name": "Кърпа", "price": "9,99 лв", "url": "https://ex.com/1"}]
+
+
+def test_cache_hits_do_not_refresh_cells(tmp_path):
+    store = PriceStore(str(tmp_path / "prices.sqlite3"))
+    record_scan(store, "Bulgaristan", "towel", [("Pepco", ({"products": PRODUCTS, "cached": False}, "SCRAPERAPI"), None)],
+                ts=1000.0)
+    record_scan(store, "Bulgaristan", "towel", [("Pepco", ({"products": PRODUCTS, "cached": True}, "SCRAPERAPI"), None),
+                                                ("Sinsay", ({"products": PRODUCTS, "cached": True}, "SCRAPERAPI"), None)],
+                ts=5000.0)
+    states = store.cell_states("Bulgaristan", "towel", ["Pepco", "Sinsay"])
+    assert states["Pepco"][0] == 1000.0 and states["Pepco"][2] == 1
+    assert "Sinsay" not in states
+    stale, reuse = plan(store, "Bulgaristan", "towel", ["Pepco", "Sinsay"], max_age=3000, now=5000.0)
+    assert stale == ["Pepco", "Sinsay"] and reuse == {}
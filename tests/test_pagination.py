@@ -0,0 +1,38 @@
+import threading
+import time
+
+from scraper import pagination
+from scraper.config import URL_DB
+from scraper.pagination import crawl, page_urls
+
+SITE = URL_DB["Bulgaristan"]["Pepco"]
+
+
+def test_requested_depth_cannot_exceed_brand_depth(monkeypatch):
+    monkeypatch.setitem(pagination.PAGINATION, "Pepco", {"param": "&page={page}", "first": 1, "depth": 2})
+    assert len(page_urls("Pepco", SITE, "x", max_pages=8)) == 2
+    assert len(page_urls("Pepco", SITE, "x", max_pages=1)) == 1
+    assert len(page_urls("Pepco", SITE, "x")) == 2
+
+
+def test_requested_depth_without_brand_depth():
+    assert len(page_urls("Pepco", SITE, "x", max_pages=4)) == 4
+    assert len(page_urls("Pepco", SITE, "x")) == pagination.MAX_PAGES
+
+
+def test_outer_cancel_reaches_in_flight_pages():
+    urls = ["u0", "u1", "u2"]
+    cancel = threading.Event()
+    seen = {}
+
+    def fetch(url, page_cancel):
+        if url == urls[0]:
+            return [{"url": url}]
+        cancel.set()
+        started = time.monotonic()
+        seen[url] = page_cancel.wait(5)
+        assert time.monotonic() - started < 1
+        return [{"url": url}]
+
+    crawl(urls, fetch, window=2, cancel=cancel)
+    assert seen and all(seen.values())
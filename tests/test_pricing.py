@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from benchmarks.bench_pricing import SYMBOLS, generate
+from scraper.pricing import clean_price, clean_prices
+
+# Elle doğrulanmış örnekler: (ham metin, para birimi, beklenen)
+CORPUS = [
+    ("15.99", "USD", 15.99),
+    ("$1,299.00", "USD", 1299.0),
+    ("$1,299", "USD", 1299.0),
+    ("1.299,50", "USD", 1299.5),
+    ("1,299.50", "BGN", 1299.5),
+    ("19.999", "BGN", 19.999),
+    ("12,99 лв", "BGN", 12.99),
+    ("от 4,99 лв.", "BGN", 4.99),
+    ("Преди 19,99 лв. Сега 12,99 лв.", "BGN", 12.99),
+    ("was 19.99 now 12.99", "BGN", 12.99),
+    ("10,99 - 19,99 KM", "BAM", 10.99),
+    ("1.299 din", "RSD", 1299.0),
+    ("1.299,00 RSD", "RSD", 1299.0),
+    ("1.299.000 din", "RSD", 1299000.0),
+    ("1 499 дин.", "RSD", 1499.0),
+    ("1 499,90 лв", "BGN", 1499.9),
+    ("€ 7,5", "EUR", 7.5),
+    ("", "BGN", 0.0),
+    (None, "BGN", 0.0),
+    ("n/a", "BGN", 0.0),
+]
+
+
+@pytest.mark.parametrize("text, currency, want", CORPUS)
+def test_corpus(text, currency, want):
+    assert clean_price(text, currency) == pytest.approx(want)
+
+
+@pytest.mark.parametrize("currency", list(SYMBOLS))
+def test_generated_formats(currency):
+    cases = [c for c in generate(5000) if c[1] == currency]
+    got = clean_prices([c[0] for c in cases], currency)
+    bad = [(c[0], c[2], g) for c, g in zip(cases, got) if not np.isclose(g, c[2])]
+    assert not bad, bad[:10]
+
+
+def test_batch_matches_single_and_repeats():
+    texts = ["12,99 лв", None, "12,99 лв", "10 - 20"]
+    assert clean_prices(texts, "BGN").tolist() == [12.99, 0.0, 12.99, 10.0]
+    assert clean_prices(texts, "BGN", range_mode="high")[3] == 20.0
+    assert clean_prices(texts, "BGN", range_mode="mid")[3] == 15.0
+    assert len(clean_prices([], "BGN")) == 0
@@ -0,0 +1,42 @@
+from scraper import relevance
+from scraper.relevance import filter_relevant, score_batch
+
+
+class FakeCache:
+    def __init__(self, translations):
+        self.translations = translations
+
+    def translate_batch(self, names, target, fallback=True):
+        return [self.translations.get(n) for n in names]
+
+
+def test_local_stems_match_inflections():
+    names = ["Хавлиена кърпа 50x90", "Кърпата за баня", "Комплект кърпи", "Peškir za ruke", "Ručnik za lice"]
+    assert filter_relevant(names, "Towel", "bg").all()
+
+
+def test_stem_does_not_match_longer_words():
+    names = ["Карпаччо чинийка", "Casual чаша", "Възглавница 40x40", "Часовник стенен"]
+    assert not filter_relevant(names, "Towel", "bg").any()
+    assert filter_relevant(names, "Vase", "bg").tolist() == [False, False, False, False]
+    assert filter_relevant(names, "Glass", "bg").tolist() == [False, True, False, False]
+
+
+def test_stem_is_anchored_at_word_start():
+    assert score_batch(["Скарпа", "Bezrukavnik"], "Hand Towel", "sr").tolist() == [0.0, 0.0]
+
+
+def test_threshold_on_covered_query():
+    names = ["Кърпа за лице", "Кърпа за баня", "Чаша"]
+    assert filter_relevant(names, "Face Towel", "bg", threshold=1.0).tolist() == [True, False, False]
+    assert filter_relevant(names, "Face Towel", "bg").tolist() == [True, True, False]
+
+
+def test_threshold_on_translation_fallback(monkeypatch):
+    cache = FakeCache({"A": "ceramic teapot", "B": "teapot", "C": "ceramic bowl"})
+    monkeypatch.setattr(relevance, "default_cache", lambda: cache)
+    names = ["A", "B", "C", "D"]
+    # "teapot" sözlükte yok; D çevrilemedi ve elenmez
+    assert filter_relevant(names, "Ceramic Teapot", "bg").tolist() == [True, True, True, True]
+    assert filter_relevant(names, "Ceramic Teapot", "bg", threshold=0.6).tolist() == [True, True, False, True]
+    assert filter_relevant(names, "Ceramic Teapot", "bg", threshold=1.0).tolist() == [True, False, False, True]
@@ -0,0 +1,44 @@
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scraper.export import write_arrow, write_parquet
+from scraper.results import ResultTable
+
+
+def row(brand, price, curr):
+    return {"Marka": brand, "Ürün Yerel": "Кърпа", "Ürün Türkçe": "Havlu", f"Fiyat ({curr})": price, "USD": 1.0,
+            "TL": 40.0, "Link": "https://ex.com/1", "Kaynak": "SCRAPERAPI"}
+
+
+def mixed():
+    return ResultTable.concat([
+        ResultTable.from_rows([row("Pepco", 9.99, "BGN")], "Bulgaristan", "towel", "BGN", 0.0),
+        ResultTable.from_rows([row("IKEA", 999.0, "RSD")], "Sırbistan", "towel", "RSD", 0.0),
+        ResultTable.from_rows([row("Jysk", 19.0, "BAM")], "Hırvatistan", "towel", "BAM", 0.0),
+    ])
+
+
+def test_unknown_categories_are_kept():
+    frame = mixed().frame()
+    assert frame["brand"].tolist() == ["Pepco", "IKEA", "Jysk"]
+    assert frame["country"].tolist() == ["Bulgaristan", "Sırbistan", "Hırvatistan"]
+    assert frame["brand"].dtype == "category"
+
+
+def test_display_labels_each_chunk_with_its_currency():
+    shown = mixed().display()
+    assert shown["Fiyat (BGN)"].tolist()[0] == 9.99
+    assert shown["Fiyat (RSD)"].tolist()[1] == 999.0
+    assert shown["Fiyat (BAM)"].tolist()[2] == 19.0
+    assert ResultTable().display("BGN").columns[7] == "Fiyat (BGN)"
+
+
+def test_export_with_unknown_categories():
+    for write, read in ((write_arrow, lambda b: pa.ipc.open_file(b).read_all()), (write_parquet, pq.read_table)):
+        sink = io.BytesIO()
+        write(mixed(), sink)
+        table = read(io.BytesIO(sink.getvalue())).to_pandas()
+        assert table["brand"].astype(str).tolist() == ["Pepco", "IKEA", "Jysk"]
+        assert table["country"].astype(str).tolist() == ["Bulgaristan", "Sırbistan", "Hırvatistan"]
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from benchmarks.fake_server import sonar_content
+from scraper.sonar import ProductStream, parse_products
+
+BODY = json.dumps({"products": [{"name": "Кърпа", "price": "9,99 лв", "url": "https://ex.com/1"},
+                                {"name": "Чаша", "price": "3 лв"}]}, ensure_ascii=False)
+
+
+def test_fake_server_content():
+    assert len(parse_products(sonar_content("Pepco", 12))) == 12
+
+
+@pytest.mark.parametrize("prose", ["see [1] below: ", "see [1 and [2 for details:\n", "[Sources: ", "Results [1][2]:\n"])
+def test_stray_bracket_before_json(prose):
+    names = [p["name"] for p in parse_products(prose + BODY)]
+    assert names == ["Кърпа", "Чаша"]
+
+
+def test_stray_bracket_streamed_in_chunks():
+    text = "see [1 for sources " + BODY
+    stream = ProductStream()
+    got = []
+    for i in range(0, len(text), 7):
+        got += stream.feed(text[i:i + 7])
+    got += stream.close()
+    assert [p["name"] for p in got] == ["Кърпа", "Чаша"]
+    assert stream.invalid == 0
+
+
+def test_single_object_fallback_after_invalid_candidate():
+    text = 'Notes: [{"note": "x"}] Answer: {"name": "Кърпа", "price": "9,99 лв"}'
+    assert [p["name"] for p in parse_products(text)] == ["Кърпа"]
@@ -0,0 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from scraper.translation import TranslationCache
+
+
+class EchoTranslator:
+    def __init__(self, source, target):
+        pass
+
+    def translate(self, text):
+        return text.upper()
+
+
+def test_counters_under_concurrent_batches():
+    cache = TranslationCache(path=None, translator_factory=EchoTranslator)
+    batches = [[f"w{i}-{j}" for j in range(5)] for i in range(400)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda batch: cache.translate_batch(batch, "en"), batches))
+    assert results[7] == [f"W7-{j}" for j in range(5)]
+    assert cache.calls == 400 and cache.translated == 2000 and cache.misses == 2000
+    assert cache.translate_batch(batches[0], "en") == results[0]
+    stats = cache.stats()
+    assert stats["hits"] == 5 and stats["calls"] == 400
@@ -0,0 +1,52 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from scraper.transport import Transport
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+    content = b"ok"
+
+    def close(self):
+        pass
+
+
+class FlakySession:
+    """"/flaky" ilk denemede bağlantı hatası verir; diğer yollar hemen yanıt döner."""
+
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls.append(url)
+        if url.endswith("/flaky") and self.calls.count(url) == 1:
+            raise requests.ConnectionError("reset")
+        return FakeResponse()
+
+
+def test_backoff_does_not_hold_host_slot():
+    transport = Transport(host_limit=1, max_retries=1, backoff=1.0, budget=10)
+    transport.session = FlakySession()
+    first = threading.Thread(target=transport.get, args=("http://h.test/flaky",))
+    first.start()
+    while "http://h.test/flaky" not in transport.session.calls:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    started = time.monotonic()
+    assert transport.get("http://h.test/other").status_code == 200
+    # İlk istek en az 0.5 sn beklerken ikincisi slotu hemen alır
+    assert time.monotonic() - started < 0.3
+    first.join()
+    assert transport.session.calls.count("http://h.test/flaky") == 2
+
+
+def test_connection_error_raised_after_retries():
+    transport = Transport(host_limit=1, max_retries=0, backoff=0.01, budget=5)
+    transport.session = FlakySession()
+    with pytest.raises(requests.ConnectionError):
+        transport.get("http://h.test/flaky")
@@ -0,0 +1,39 @@
+import math
+
+import pytest
+
+from scraper.units import parse_units
+
+
+@pytest.mark.parametrize("name, litres", [
+    ("Шампоан 500 мл", 0.5),
+    ("Олио 1,5 л", 1.5),
+    ("Ulje 1 л", 1.0),
+    ("Сапун 250 мл течен", 0.25),
+    ("Šampon 500 ml", 0.5),
+    ("Deterdžent 2 l", 2.0),
+])
+def test_volume_cyrillic_and_latin(name, litres):
+    assert parse_units([name])["volume_l"][0] == pytest.approx(litres)
+
+
+@pytest.mark.parametrize("name, pieces", [
+    ("3lü havlu", 3),
+    ("3'lü havlu seti", 3),
+    ("Mutfak bezi 5 adet", 5),
+    ("Кърпа 3 бр", 3),
+    ("Салфетки 2 шт", 2),
+    ("komplet od 4", 4),
+])
+def test_pack_cyrillic_and_turkish(name, pieces):
+    assert parse_units([name])["pieces"][0] == pieces
+
+
+def test_no_unit_inside_longer_word():
+    u = parse_units(["Лампа 3 бра", "Kutu 3lük"])
+    assert math.isnan(u["pieces"][0])
+    assert math.isnan(u["pieces"][1])
+
+
+def test_cyrillic_dims():
+    assert parse_units(["Кърпа 50х90 см"])["area_m2"][0] == pytest.approx(0.45)